@@ -1,34 +1,293 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, WebSocket
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, WebSocket
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
-import aiofiles
+import asyncio
+import logging
+import threading
+import time
 import soundfile as sf
 import numpy as np
-from datetime import datetime
-from ..database import get_db
+from typing import BinaryIO, Dict, Optional, Set, Tuple, Union
+from ..database import SessionLocal, get_async_db
 from ..models import User, Meeting
 from ..api.auth import get_current_user
 from ..config import settings
-from ..services.audio_service import AudioService
+from ..services.audio_service import AudioService, webm_init_segment
 from ..services.wav_backup_service import WavBackupService
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 audio_service = AudioService()
 wav_backup_service = WavBackupService()
 
+# WebSocket buffer'ı bu boyuta ulaşınca veya bu süre dolunca diske yazılır
+WS_FLUSH_BYTES = 64 * 1024
+WS_FLUSH_INTERVAL_SECONDS = 0.2
+
+# Upload chunk'ları bellekte biriktirilir; bu boyuta ulaşınca veya en eski veri bu süreyi geçince
+# tek bir chunk dosyası olarak diske yazılır. Buffer süreç belleğinde olduğundan yalnızca tek worker
+# süreçle kullanılmalıdır (settings.upload_coalesce_chunks=False her chunk'ı hemen yazar)
+PENDING_FLUSH_BYTES = 1024 * 1024
+PENDING_FLUSH_INTERVAL_SECONDS = 5.0
+
+# Chunk kopyalama için kullanılan sabit buffer boyutu
+COPY_BUFFER_SIZE = 64 * 1024
+
+# Dosyadan dosyaya os.sendfile desteği (ilk başarısızlıkta kapatılır)
+_sendfile_supported = hasattr(os, "sendfile")
+
+
+# Aktif toplantılar için açık tutulan append fd'leri: meeting_id -> (ana dosya fd, backup fd)
+_meeting_fds: Dict[int, Tuple[int, Optional[int]]] = {}
+
+# O_APPEND kullanılmaz: Linux sendfile(2) O_APPEND ile açılmış hedefi EINVAL ile reddeder.
+# fd açılırken dosya sonuna konumlanır; tek yazan bu fd olduğundan konum her yazımla ilerler.
+_APPEND_FLAGS = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+
+# Henüz diske yazılmamış upload verisi: meeting_id -> (buffer, ilk verinin geldiği zaman)
+_pending: Dict[int, Tuple[bytearray, float]] = {}
+# Buffer'a ekleme (event loop) ile toplantı kapanışındaki alma (worker thread) birbirini ezmesin
+_pending_lock = threading.Lock()
+
+# Kaydı kapatılmış toplantılar; bunlara gelen geç chunk'lar buffer'a alınmadan hemen yazılır
+_closed_meetings: Set[int] = set()
+
+# Toplantı başına dosya yazım kilidi: chunk yazımı ile fd kapatma aynı anda çalışmaz,
+# fd'ler yalnızca bu kilit altında alınır (kapatılmış/yeniden kullanılmış fd numarasına yazılmaz)
+_meeting_io_locks: Dict[int, threading.Lock] = {}
+
+
+# Toplantı başına sıralı chunk numarası (dosya adları çakışmasız ve sıralanabilir)
+_chunk_counter: Dict[int, int] = {}
+
+
+# Toplantı akışının WebM başlığı (ilk chunk'tan); başlıksız sonraki chunk'lar sessizlik kontrolünde
+# tek başına çözülebilsin diye önlerine eklenir
+_webm_init_segments: Dict[int, bytes] = {}
+
+# Süreç yeniden başladıysa başlık ana dosyanın başından okunur (bu boyut başlığı fazlasıyla kapsar)
+WEBM_INIT_SEGMENT_SCAN_BYTES = 256 * 1024
+
+
+# Bu süreç içinde dizini oluşturulmuş toplantılar (her chunk'ta makedirs/stat çağrısı yapılmaz)
+_dirs_created: Set[int] = set()
+
+
+def _ensure_meeting_dir(meeting_id: int) -> str:
+    """Toplantı dizinini döndür, bu süreçte ilk kez kullanılıyorsa oluştur"""
+    meeting_dir = os.path.join(settings.upload_dir, f"meeting_{meeting_id}")
+    if meeting_id not in _dirs_created:
+        os.makedirs(meeting_dir, exist_ok=True)
+        _dirs_created.add(meeting_id)
+    return meeting_dir
+
+
+def _next_chunk_path(meeting_id: int, meeting_dir: str) -> str:
+    """Toplantının bir sonraki chunk dosya yolunu döndür"""
+    n = _chunk_counter.get(meeting_id)
+    if n is None:
+        # Süreç yeniden başladıysa mevcut chunk'ların üzerine yazmamak için kaldığı yerden devam et
+        n = sum(1 for name in os.listdir(meeting_dir) if name.startswith("chunk_"))
+    _chunk_counter[meeting_id] = n + 1
+    return os.path.join(meeting_dir, f"chunk_{n:08d}.webm")
+
+
+def _open_append_fd(path: str) -> int:
+    """Dosyayı sonuna konumlanmış olarak aç ve fd döndür"""
+    fd = os.open(path, _APPEND_FLAGS, 0o644)
+    os.lseek(fd, 0, os.SEEK_END)
+    return fd
+
+
+def _get_meeting_fds(meeting_id: int, main_path: str, backup_path: Optional[str]) -> Tuple[int, Optional[int]]:
+    """Toplantının append fd'lerini cache'den al, yoksa aç"""
+    fds = _meeting_fds.get(meeting_id)
+    if fds is not None and (fds[1] is not None or not backup_path):
+        return fds
+    
+    # İlk chunk veya backup dosyası sonradan oluşturulduysa eksik fd'leri aç
+    fd_main = fds[0] if fds is not None else _open_append_fd(main_path)
+    fd_backup = None
+    if backup_path:
+        try:
+            fd_backup = _open_append_fd(backup_path)
+        except OSError as e:
+            logger.warning("Audio backup file open failed (non-critical): %s", e)
+    
+    _meeting_fds[meeting_id] = (fd_main, fd_backup)
+    return fd_main, fd_backup
+
+
+def _meeting_io_lock(meeting_id: int) -> threading.Lock:
+    with _pending_lock:
+        return _meeting_io_locks.setdefault(meeting_id, threading.Lock())
+
+
+def _close_fds_locked(meeting_id: int):
+    """Açık append fd'lerini kapat ve sayaç durumunu temizle (toplantının yazım kilidi tutulurken çağrılır)"""
+    fds = _meeting_fds.pop(meeting_id, None)
+    _chunk_counter.pop(meeting_id, None)
+    if fds is None:
+        return
+    for fd in fds:
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def _flush_pending_sync(
+    meeting_id: int,
+    main_path: Optional[str],
+    backup_path: Optional[str],
+    close_fds: bool = False
+) -> Optional[str]:
+    """Bekleyen buffer'ı chunk dosyası olarak yaz, ana dosyaya ve backup'a ekle; kayıt kapandıysa fd'leri kapat
+    
+    Senkron çalışır (async handler'lardan asyncio.to_thread ile çağrılır). Buffer yazım kilidi altında
+    alındığından aynı toplantının yazımları geliş sırasıyla yapılır ve kapanış devam eden yazımı bekler.
+    Yazılan chunk dosyasının yolunu döndürür.
+    """
+    with _meeting_io_lock(meeting_id):
+        with _pending_lock:
+            entry = _pending.pop(meeting_id, None)
+            close_fds = close_fds or meeting_id in _closed_meetings
+        data = entry[0] if entry else None
+        
+        chunk_path = None
+        if data:
+            chunk_path = _next_chunk_path(meeting_id, _ensure_meeting_dir(meeting_id))
+            if main_path:
+                fd_main, fd_backup = _get_meeting_fds(meeting_id, main_path, backup_path)
+                _persist_chunk_sync(data, chunk_path, fd_main, fd_backup)
+            else:
+                # Ana dosya yolu yoksa en azından chunk dosyası yazılır
+                _write_file_sync(chunk_path, data)
+        if close_fds:
+            _close_fds_locked(meeting_id)
+        return chunk_path
+
+
+def close_meeting_fds(meeting_id: int, main_path: Optional[str], backup_path: Optional[str]):
+    """Bekleyen veriyi diske yaz, açık append fd'lerini kapat ve sayaç durumunu temizle
+    
+    Toplantı bitince/iptal edilince çağrılır; devam eden chunk yazımlarının bitmesini bekler. Sonradan
+    gelen chunk'lar buffer'a alınmaz, doğrudan yazılır. Dosya işlemleri bloklayıcıdır; async
+    handler'lardan asyncio.to_thread ile çağrılmalıdır.
+    """
+    with _pending_lock:
+        _closed_meetings.add(meeting_id)
+    _flush_pending_sync(meeting_id, main_path, backup_path, close_fds=True)
+    _webm_init_segments.pop(meeting_id, None)
+
+
+def _write_all(fd: int, data: bytes):
+    """Tüm veriyi fd'ye yaz (kısmi yazımlara karşı)"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _append_file_to_fd(src_file: BinaryIO, dst_fd: int):
+    """Açık dosyanın içeriğini fd'ye ekle (mümkünse os.sendfile ile kernel içinde kopyala)"""
+    src_fd = src_file.fileno()
+    size = os.fstat(src_fd).st_size
+    offset = 0
+    
+    global _sendfile_supported
+    if _sendfile_supported:
+        try:
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except OSError:
+            # Platform dosyadan dosyaya sendfile desteklemiyor (ör. macOS yalnızca soket hedefi kabul eder);
+            # sonraki chunk'larda exception ile dallanmamak için bir daha denenmez, kalan kısım okunup yazılır
+            _sendfile_supported = False
+    
+    src_file.seek(offset)
+    while True:
+        block = src_file.read(COPY_BUFFER_SIZE)
+        if not block:
+            break
+        _write_all(dst_fd, block)
+
+
+def _persist_chunk_sync(data: bytearray, chunk_path: str, fd_main: int, fd_backup: Optional[int]):
+    """Biriken chunk'ları tek dosya olarak yaz, ana dosyaya ve backup dosyasına ekle (senkron, thread içinde çalışır)"""
+    with open(chunk_path, 'wb+') as chunk_file:
+        chunk_file.write(data)
+        chunk_file.flush()
+        
+        # Chunk'ları birleştir (basit append - WebM formatı için uygun olabilir)
+        # Gerçek uygulamada FFmpeg kullanılabilir
+        _append_file_to_fd(chunk_file, fd_main)
+        
+        if fd_backup is None:
+            return
+        
+        # Chunk'ı backup dosyasına ekle (direkt kopyalama - format dönüşümü yok)
+        try:
+            _append_file_to_fd(chunk_file, fd_backup)
+            logger.debug("Audio chunk appended to backup")
+        except OSError as backup_error:
+            logger.warning("Audio backup chunk append failed (non-critical): %s", backup_error)
+            # Backup hatası kritik değil, devam et
+
+
+def _write_file_sync(path: str, content: Union[bytes, bytearray]):
+    """Dosyayı senkron olarak yaz (thread içinde çalışır)"""
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def _load_init_segment(meeting_id: int, audio_path: Optional[str]) -> Optional[bytes]:
+    """Toplantının WebM başlığını cache'ten al, yoksa ana dosyanın başından oku"""
+    init_segment = _webm_init_segments.get(meeting_id)
+    if init_segment is None and audio_path and os.path.exists(audio_path):
+        with open(audio_path, 'rb') as f:
+            init_segment = webm_init_segment(f.read(WEBM_INIT_SEGMENT_SCAN_BYTES))
+        if init_segment is not None:
+            _webm_init_segments[meeting_id] = init_segment
+    return init_segment
+
+
+def _silence_and_commit(meeting_id: int, chunk: bytes):
+    """Yüklenen chunk'ın ses enerjisi kontrolünü yanıt gönderildikten sonra kendi session'ı ile yap"""
+    db = SessionLocal()
+    try:
+        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        if meeting is None:
+            return
+        init_segment = _load_init_segment(meeting_id, meeting.audio_file_path)
+        audio_service.check_silence_chunk(chunk, init_segment, meeting)
+        db.commit()
+    finally:
+        db.close()
+
 
 @router.post("/upload/{meeting_id}")
 async def upload_audio_chunk(
     meeting_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Ses chunk'ı yükle"""
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
+    meeting = await db.scalar(
+        select(Meeting).where(
+            Meeting.id == meeting_id,
+            Meeting.user_id == current_user.id
+        )
+    )
     
     if not meeting:
         raise HTTPException(
@@ -44,33 +303,11 @@ async def upload_audio_chunk(
         )
     
     # Dosya kaydet
-    meeting_dir = os.path.join(settings.upload_dir, f"meeting_{meeting_id}")
-    os.makedirs(meeting_dir, exist_ok=True)
-    
-    chunk_path = os.path.join(meeting_dir, f"chunk_{datetime.now().timestamp()}.webm")
-    
-    async with aiofiles.open(chunk_path, 'wb') as out_file:
-        content = await file.read()
-        await out_file.write(content)
+    meeting_dir = _ensure_meeting_dir(meeting_id)
     
     # Ana dosya yolu belirle
     if not meeting.audio_file_path:
         meeting.audio_file_path = os.path.join(meeting_dir, "full_audio.webm")
-        db.commit()
-    
-    # Chunk'ları birleştir (basit append - WebM formatı için uygun olabilir)
-    # Gerçek uygulamada FFmpeg kullanılabilir
-    try:
-        async with aiofiles.open(meeting.audio_file_path, 'ab') as main_file:
-            async with aiofiles.open(chunk_path, 'rb') as chunk_file:
-                chunk_data = await chunk_file.read()
-                await main_file.write(chunk_data)
-    except Exception as e:
-        # İlk chunk ise dosyayı oluştur
-        async with aiofiles.open(meeting.audio_file_path, 'wb') as main_file:
-            async with aiofiles.open(chunk_path, 'rb') as chunk_file:
-                chunk_data = await chunk_file.read()
-                await main_file.write(chunk_data)
     
     # AUDIO BACKUP: Save audio chunks as backup (WebM format - supported by Pyannote/Whisper)
     try:
@@ -79,32 +316,67 @@ async def upload_audio_chunk(
             # WebM formatında kaydet (Pyannote ve Whisper destekliyor)
             backup_path = wav_backup_service.create_backup_file(meeting_id, format="webm")
             meeting.wav_backup_path = backup_path
-            db.commit()
-            print(f"✅ Audio backup file created: {backup_path}")
-        
-        # Chunk'ı backup dosyasına ekle (direkt kopyalama - format dönüşümü yok)
-        try:
-            # WebM chunk'ını direkt backup dosyasına ekle
-            async with aiofiles.open(meeting.wav_backup_path, 'ab') as backup_file:
-                async with aiofiles.open(chunk_path, 'rb') as chunk_file:
-                    chunk_data = await chunk_file.read()
-                    await backup_file.write(chunk_data)
-            
-            print(f"✅ Audio chunk appended to backup: {meeting.wav_backup_path}")
-                
-        except Exception as backup_error:
-            print(f"⚠️ Audio backup chunk append failed (non-critical): {backup_error}")
-            # Backup hatası kritik değil, devam et
-            
+            logger.info("Audio backup file created: %s", backup_path)
     except Exception as e:
-        print(f"⚠️ Audio backup failed (non-critical): {e}")
+        logger.warning("Audio backup failed (non-critical): %s", e)
         # Backup hatası kritik değil, ana işleme devam et
     
-    # Sessizlik kontrolü yap
-    audio_service.check_silence(chunk_path, meeting)
-    db.commit()
+    content = await file.read()
+    
+    # Akışın ilk chunk'ı WebM başlığını taşır; sonraki chunk'ların sessizlik kontrolü için saklanır
+    if meeting_id not in _webm_init_segments:
+        init_segment = webm_init_segment(content)
+        if init_segment is not None:
+            _webm_init_segments[meeting_id] = init_segment
+    
+    # Okuma sırasında /end veya /cancel çalışmış olabilir; durum okuma sonrası tekrar alınır
+    # (kolon sorgusu identity map'teki eski değeri değil veritabanındakini döndürür)
+    current_status = await db.scalar(select(Meeting.status).where(Meeting.id == meeting_id))
     
-    return {"message": "Chunk yüklendi", "file_path": chunk_path, "wav_backup": meeting.wav_backup_path}
+    # Chunk'ı toplantının bekleyen buffer'ına ekle; kayıt bittiyse (geç gelen chunk, otomatik bitiş
+    # veya kapanış) buffer'a almadan bekleyen veriyle birlikte hemen yaz ve fd'leri kapat
+    now = time.monotonic()
+    with _pending_lock:
+        recording_done = (
+            meeting_id in _closed_meetings
+            or current_status not in ["recording", "paused"]
+        )
+        if recording_done:
+            _closed_meetings.add(meeting_id)
+        entry = _pending.get(meeting_id)
+        if entry is None:
+            entry = _pending[meeting_id] = (bytearray(), now)
+        buffer, buffered_since = entry
+        buffer += content
+        should_flush = recording_done or (
+            buffer and (
+                not settings.upload_coalesce_chunks
+                or len(buffer) >= PENDING_FLUSH_BYTES
+                or now - buffered_since >= PENDING_FLUSH_INTERVAL_SECONDS
+            )
+        )
+    
+    # Chunk dosyası, ana dosya ve backup yazımı tek thread dispatch ile yapılır
+    chunk_path = None
+    if should_flush:
+        chunk_path = await asyncio.to_thread(
+            _flush_pending_sync, meeting_id, meeting.audio_file_path, meeting.wav_backup_path, recording_done
+        )
+    
+    # Dosya yolları ilk chunk'ta değişir; diğer chunk'larda commit gerekmez
+    if db.dirty:
+        await db.commit()
+    
+    # Sessizlik kontrolü istemci yanıtını bekletmesin
+    background_tasks.add_task(_silence_and_commit, meeting_id, content)
+    
+    # Chunk bellekte bekliyorsa chunk_path None'dır; ses her durumda file_path'e eklenir
+    return {
+        "message": "Chunk yüklendi",
+        "file_path": meeting.audio_file_path,
+        "chunk_path": chunk_path,
+        "wav_backup": meeting.wav_backup_path
+    }
 
 
 
@@ -117,27 +389,49 @@ async def websocket_audio(websocket: WebSocket, meeting_id: int):
     
     try:
         # WebSocket bağlantısı kabul et
-        meeting_dir = os.path.join(settings.upload_dir, f"meeting_{meeting_id}")
-        os.makedirs(meeting_dir, exist_ok=True)
+        meeting_dir = _ensure_meeting_dir(meeting_id)
+        
+        # Bağlantı boyunca tekrar kullanılan buffer (her flush'ta yeni liste/join yok)
+        audio_buffer = bytearray()
+        loop = asyncio.get_running_loop()
+        buffered_since = 0.0
         
-        audio_buffer = []
+        async def flush_buffer():
+            chunk_path = _next_chunk_path(meeting_id, meeting_dir)
+            # Yazım bitene kadar beklendiği için buffer kopyalanmadan verilebilir
+            await asyncio.to_thread(_write_file_sync, chunk_path, audio_buffer)
+            audio_buffer.clear()
         
         while True:
+            # Buffer doluysa en geç WS_FLUSH_INTERVAL_SECONDS sonra yazılması için bekleme süresini sınırla
+            timeout = None
+            if audio_buffer:
+                timeout = max(0.0, WS_FLUSH_INTERVAL_SECONDS - (loop.time() - buffered_since))
+            
             # Ses data al
-            data = await websocket.receive()
+            try:
+                data = await asyncio.wait_for(websocket.receive(), timeout=timeout)
+            except asyncio.TimeoutError:
+                data = {}
             
             if "bytes" in data:
-                audio_buffer.append(data["bytes"])
+                if not audio_buffer:
+                    buffered_since = loop.time()
+                audio_buffer.extend(data["bytes"])
             elif "text" in data:
                 if data["text"] == "end":
                     break
             
-            # Belirli boyutta buffer dolduğunda kaydet
-            if len(audio_buffer) > 10:  # Örnek: 10 chunk biriktir
-                chunk_path = os.path.join(meeting_dir, f"chunk_{datetime.now().timestamp()}.webm")
-                async with aiofiles.open(chunk_path, 'wb') as f:
-                    await f.write(b''.join(audio_buffer))
-                audio_buffer = []
+            # Buffer boyut eşiğini geçtiğinde veya süre dolduğunda kaydet
+            if audio_buffer and (
+                len(audio_buffer) >= WS_FLUSH_BYTES
+                or loop.time() - buffered_since >= WS_FLUSH_INTERVAL_SECONDS
+            ):
+                await flush_buffer()
+        
+        # Kalan veriyi kaydet
+        if audio_buffer:
+            await flush_buffer()
         
         await websocket.close()
     except Exception as e:
@@ -1,46 +1,107 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from datetime import timedelta
-from ..database import get_db
+from cachetools import TTLCache
+import asyncio
+import logging
+import secrets
+import threading
+import time
+from ..database import get_async_db
 from ..models import User
 from ..schemas import UserCreate, UserLogin, UserResponse, Token
 from ..utils.security import verify_password, get_password_hash, create_access_token, decode_access_token
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Sabit hata yanıtları her istekte yeniden oluşturulmaz; paylaşılan örnek tekrar
+# fırlatılırken eski traceback'in birikmemesi için with_traceback(None) kullanılır
+CREDENTIALS_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Kimlik doğrulama başarısız",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+LOGIN_FAILED_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Email veya şifre hatalı",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+INACTIVE_USER_EXCEPTION = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Kullanıcı hesabı aktif değil"
+)
+
+# Bilinmeyen kullanıcı girişlerinde de bcrypt çalıştırmak için kullanılan sahte hash
+_DUMMY_PASSWORD_HASH = get_password_hash(secrets.token_urlsafe(32))
+
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+# Token -> (kullanıcı, token bitiş zamanı) cache'i; her istekte DB sorgusunu önler
+_user_cache = TTLCache(maxsize=10000, ttl=30)
+# Geçersiz token'lar için daha kısa süreli negatif cache
+_invalid_token_cache = TTLCache(maxsize=10000, ttl=5)
+_user_cache_lock = threading.Lock()
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
     """Mevcut kullanıcıyı token'dan al"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Kimlik doğrulama başarısız",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    with _user_cache_lock:
+        cached = _user_cache.get(token)
+        is_invalid = token in _invalid_token_cache
+    
+    if cached is not None:
+        user, expires_at = cached
+        if time.time() < expires_at:
+            return user
+    
+    if is_invalid:
+        raise CREDENTIALS_EXCEPTION.with_traceback(None)
     
     payload = decode_access_token(token)
     if payload is None:
-        raise credentials_exception
+        _mark_token_invalid(token)
+        raise CREDENTIALS_EXCEPTION.with_traceback(None)
     
     email: str = payload.get("sub")
     if email is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+        _mark_token_invalid(token)
+        raise CREDENTIALS_EXCEPTION.with_traceback(None)
+    
+    # email unique index'li; sadece UserResponse'un ihtiyaç duyduğu kolonları yükle
+    user = await db.scalar(
+        select(User)
+        .options(load_only(User.id, User.email, User.full_name, User.created_at, User.is_active))
+        .where(User.email == email)
+    )
     if user is None:
-        raise credentials_exception
+        _mark_token_invalid(token)
+        raise CREDENTIALS_EXCEPTION.with_traceback(None)
+    
+    # Cache'teki nesne request session'ının commit'lerinden etkilenmesin
+    db.expunge(user)
+    with _user_cache_lock:
+        _user_cache[token] = (user, payload.get("exp", 0))
     
     return user
 
 
+def _mark_token_invalid(token: str):
+    with _user_cache_lock:
+        _invalid_token_cache[token] = True
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Kullanıcı kaydı"""
     # Email kontrolü
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -48,10 +109,9 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Yeni kullanıcı oluştur
-    hashed_password = get_password_hash(user_data.password)
-    print(f"🔐 Yeni kullanıcı oluşturuluyor: {user_data.email}")
-    print(f"🔑 Hash uzunluğu: {len(hashed_password)}")
-    print(f"🔑 Hash başlangıcı: {hashed_password[:20]}...")
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
+    logger.debug("🔐 Yeni kullanıcı oluşturuluyor: %s", user_data.email)
+    logger.debug("🔑 Hash uzunluğu: %d", len(hashed_password))
     
     new_user = User(
         email=user_data.email,
@@ -60,51 +120,39 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    # Test: Şifre doğrulama testi
-    test_verify = verify_password(user_data.password, new_user.hashed_password)
-    print(f"✅ Şifre doğrulama testi (register sonrası): {test_verify}")
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """Kullanıcı girişi"""
-    print(f"🔐 Giriş denemesi: {form_data.username}")
-    user = db.query(User).filter(User.email == form_data.username).first()
-    
-    if not user:
-        print(f"❌ Kullanıcı bulunamadı: {form_data.username}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Email veya şifre hatalı",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    logger.debug("🔐 Giriş denemesi: %s", form_data.username)
+    user = await db.scalar(
+        select(User)
+        .options(load_only(User.id, User.email, User.hashed_password, User.is_active))
+        .where(User.email == form_data.username)
+    )
     
-    print(f"✅ Kullanıcı bulundu: {user.email}")
-    print(f"🔑 DB'den gelen hash uzunluğu: {len(user.hashed_password) if user.hashed_password else 'None'}")
-    print(f"🔑 DB'den gelen hash başlangıcı: {user.hashed_password[:20] if user.hashed_password else 'None'}...")
+    if user:
+        logger.debug("✅ Kullanıcı bulundu: %s", user.email)
+    else:
+        logger.debug("❌ Kullanıcı bulunamadı: %s", form_data.username)
     
-    # Şifre doğrulama
-    password_valid = verify_password(form_data.password, user.hashed_password)
-    print(f"🔐 Şifre doğrulama sonucu: {password_valid}")
+    # Şifre doğrulama (bcrypt CPU-yoğun, event loop'u bloklamasın)
+    # Kullanıcı yoksa da sahte hash ile doğrulama yapılır; süre farkı email varlığını ele vermez
+    hash_to_check = user.hashed_password if user else _DUMMY_PASSWORD_HASH
+    password_valid = await asyncio.to_thread(verify_password, form_data.password, hash_to_check)
+    logger.debug("🔐 Şifre doğrulama sonucu: %s", password_valid)
     
-    if not password_valid:
-        print(f"❌ Şifre doğrulama başarısız: {form_data.username}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Email veya şifre hatalı",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if not user or not password_valid:
+        logger.debug("❌ Şifre doğrulama başarısız: %s", form_data.username)
+        raise LOGIN_FAILED_EXCEPTION.with_traceback(None)
     
     if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Kullanıcı hesabı aktif değil"
-        )
+        raise INACTIVE_USER_EXCEPTION.with_traceback(None)
     
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
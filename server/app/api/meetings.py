@@ -1,36 +1,244 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Body, Query
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, raiseload
 from datetime import datetime
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
 from typing import List, Optional
 from pydantic import BaseModel
-from ..database import get_db, SessionLocal
-from ..models import User, Meeting
-from ..schemas import MeetingCreate, MeetingResponse, MeetingUpdate
+from ..database import get_async_db, SessionLocal
+from ..models import User, Meeting, Transcript, Summary, SummaryCache
+from ..schemas import MeetingCreate, MeetingResponse, MeetingUpdate, MeetingListItem
 from ..api.auth import get_current_user
+from ..api.audio import close_meeting_fds
+from ..api.transcripts import TRANSCRIPT_RESPONSE_COLUMNS
 from ..services.meeting_service import MeetingService
 from ..services.audio_service import AudioService
+from ..services.summary_chunker import SummaryChunker
+from ..services.registry import (
+    get_assemblyai_service,
+    get_audio_preprocessing_service,
+    get_elevenlabs_service,
+    get_openai_service,
+    get_pyannote_service,
+    get_speaker_diarization_service,
+    get_speechrecognition_service,
+    get_transcript_cache_service,
+    get_whisper_service,
+)
+from ..utils import transcript_hub
+from ..utils.worker_loop import run_in_worker_loop
+from ..utils.job_queues import submit_gpu_job, submit_io_job, submit_stream_job
 
+logger = logging.getLogger(__name__)
+# Streaming callback'leri segment başına log üretir; seviyesi ayrıca ayarlanabilsin diye ayrı logger
+stream_logger = logging.getLogger(f"{__name__}.streaming")
 router = APIRouter()
+transcript_cache = get_transcript_cache_service()
+
+# Streaming transkriptleri bu kadar segment biriktiğinde veya bu süre geçtiğinde toplu yazılır
+STREAM_FLUSH_SEGMENTS = 8
+STREAM_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Harici API ile transkript eden modeller (yerel GPU modeli yüklemez)
+API_TRANSCRIPTION_MODELS = ("speechrecognition", "elevenlabs", "assemblyai")
+
+
+def _submit_transcription_job(fn, whisper_model: str, use_pyannote: bool):
+    """Yerel model kullanan işleri GPU kuyruğuna, API tabanlı işleri IO kuyruğuna gönder"""
+    if use_pyannote or whisper_model not in API_TRANSCRIPTION_MODELS:
+        submit_gpu_job(fn)
+    else:
+        submit_io_job(fn)
+
+
+def _save_transcripts(db_session: Session, meeting_id: int, transcripts: List[dict]):
+    """Transkript segmentlerini tek toplu INSERT ile ekle (commit çağırana bırakılır)"""
+    rows = [
+        {
+            "meeting_id": meeting_id,
+            "segment_number": i + 1,
+            "text": segment["text"],
+            "start_time": segment["start"],
+            "end_time": segment["end"],
+            "speaker_id": segment.get("speaker_id"),
+            "speaker_label": segment.get("speaker_label"),
+        }
+        for i, segment in enumerate(transcripts)
+    ]
+    if rows:
+        db_session.bulk_insert_mappings(Transcript, rows)
+
+
+def _run_speaker_diarization(diarization_service, audio_path: str) -> List[dict]:
+    """Konuşmacı ayrımını çalıştır; hata transkript akışını durdurmaz"""
+    try:
+        logger.info("Speaker diarization başlatılıyor")
+        speaker_segments = diarization_service.diarize(audio_path)
+        if speaker_segments:
+            logger.info("%d speaker segmenti bulundu", len(speaker_segments))
+        else:
+            logger.warning("Speaker diarization sonuç vermedi (devam ediliyor)")
+        return speaker_segments
+    except Exception as e:
+        logger.warning("Speaker diarization hatası: %s (devam ediliyor)", e)
+        return []
+
+
+async def _transcribe_with_parallel_diarization(
+    whisper_service,
+    diarization_service,
+    audio_path: str,
+    model_name: str,
+    language: str
+) -> List[dict]:
+    """Whisper transkripti ile konuşmacı ayrımını eşzamanlı çalıştır, bitince segmentleri eşleştir"""
+    transcripts, speaker_segments = await asyncio.gather(
+        whisper_service.transcribe_audio(audio_path, model_name, language),
+        asyncio.to_thread(_run_speaker_diarization, diarization_service, audio_path)
+    )
+    if speaker_segments:
+        whisper_service.assign_speakers(transcripts, speaker_segments)
+    return transcripts
+
+
+def _complete_meeting_with_transcripts(db_session: Session, meeting_id: int, transcripts: List[dict]):
+    """Transkriptleri kaydet ve toplantıyı tek transaction'da tamamla"""
+    _save_transcripts(db_session, meeting_id, transcripts)
+    _set_meeting_status(db_session, meeting_id, "completed")
+    db_session.commit()
+    logger.info("Transkriptler veritabanına kaydedildi (meeting %s)", meeting_id)
+
+
+def _summarize_text(text: str, language: str) -> dict:
+    """Metni OpenAI ile özetle (IO kuyruğunda çalışır)"""
+    return run_in_worker_loop(get_openai_service().summarize_transcript(text, language))
+
+
+def _save_live_summary(db_session: Session, meeting_id: int, language: str, partial_futures: List[Future]):
+    """Streaming sırasında üretilen parça özetlerini birleştirip toplantı özeti olarak kaydet"""
+    partials = []
+    for future in partial_futures:
+        try:
+            partials.append(future.result())
+        except Exception as e:
+            logger.error("Parça özeti alınamadı (meeting %s): %s", meeting_id, e)
+    if not partials:
+        return
+    
+    # Özet hatası toplantının kendisini hata durumuna düşürmez (manuel özet yine oluşturulabilir)
+    try:
+        # Tek parça zaten tüm toplantıyı kapsar; birden fazlaysa yalnızca kısa parça özetleri birleştirilir
+        if len(partials) == 1:
+            final = partials[0]
+        else:
+            final = _summarize_text("\n\n".join(p["summary"] for p in partials), language)
+        
+        if db_session.query(Summary.id).filter(Summary.meeting_id == meeting_id).first() is None:
+            db_session.add(Summary(
+                meeting_id=meeting_id,
+                summary_text=final["summary"],
+                key_points=final["key_points"]
+            ))
+            db_session.commit()
+            logger.info("Canlı özet kaydedildi (meeting %s, %d parça)", meeting_id, len(partials))
+    except Exception as e:
+        logger.error("Canlı özet kaydedilemedi (meeting %s): %s", meeting_id, e)
+        db_session.rollback()
+
+
+async def _transition_meeting(db: AsyncSession, meeting_id: int, user_id: int, status_condition, invalid_detail: str, **values) -> Meeting:
+    """Durum geçişini tek atomik UPDATE ... OUTPUT ile yap (SELECT + kontrol + UPDATE yerine)
+    
+    status_condition sağlanmazsa satır güncellenmez; bu durumda toplantı yoksa 404, durum uygun değilse 400 döner.
+    """
+    meeting = (await db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting_id, Meeting.user_id == user_id, status_condition)
+        .values(**values)
+        .returning(Meeting)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    
+    if meeting is None:
+        await db.rollback()
+        current_status = await db.scalar(
+            select(Meeting.status).where(
+                Meeting.id == meeting_id,
+                Meeting.user_id == user_id
+            )
+        )
+        if current_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Toplantı bulunamadı"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=invalid_detail.format(status=current_status)
+        )
+    
+    # Dönen satır yanıt için yeterli; commit sonrası expire edilip tekrar SELECT atılmasın
+    db.expunge(meeting)
+    await db.commit()
+    return meeting
+
+
+def _set_meeting_status(db_session: Session, meeting_id: int, new_status: str):
+    """Toplantı durumunu satırı yüklemeden doğrudan UPDATE ile değiştir"""
+    db_session.query(Meeting).filter(Meeting.id == meeting_id).update(
+        {"status": new_status}, synchronize_session=False
+    )
+
+
+async def _ensure_no_active_meeting(db: AsyncSession, user_id: int):
+    """Kullanıcının kayıt/duraklatılmış toplantısı varsa 400 döndür (EXISTS ilk eşleşmede durur, satır yüklenmez)"""
+    has_active_meeting = await db.scalar(
+        select(
+            select(Meeting.id).where(
+                Meeting.user_id == user_id,
+                Meeting.status.in_(["recording", "paused"])
+            ).exists()
+        )
+    )
+    
+    if has_active_meeting:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Zaten aktif bir toplantınız var"
+        )
+
+
+async def _add_active_meeting(db: AsyncSession, meeting: Meeting):
+    """Kayıt durumundaki yeni toplantıyı ekle ve commit et"""
+    db.add(meeting)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Eşzamanlı istekler kontrolü birlikte geçtiyse ix_meetings_one_active_per_user ikincisini reddeder
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Zaten aktif bir toplantınız var"
+        )
+    await db.refresh(meeting)
 
 
 @router.post("/start", response_model=MeetingResponse, status_code=status.HTTP_201_CREATED)
 async def start_meeting(
     meeting_data: MeetingCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toplantı başlat"""
-    # Aktif toplantı kontrolü
-    active_meeting = db.query(Meeting).filter(
-        Meeting.user_id == current_user.id,
-        Meeting.status.in_(["recording", "paused"])
-    ).first()
-    
-    if active_meeting:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Zaten aktif bir toplantınız var"
-        )
+    await _ensure_no_active_meeting(db, current_user.id)
     
     # Yeni toplantı oluştur
     new_meeting = Meeting(
@@ -39,16 +247,13 @@ async def start_meeting(
         whisper_model=meeting_data.whisper_model,
         language=meeting_data.language,
         status="recording",
-        start_time=datetime.utcnow(),
-        use_pyannote=str(meeting_data.use_pyannote).lower() if meeting_data.use_pyannote is not None else None,
+        use_pyannote=meeting_data.use_pyannote,
         diarization_profile=meeting_data.diarization_profile,
         min_speakers=meeting_data.min_speakers,
         max_speakers=meeting_data.max_speakers
     )
     
-    db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
+    await _add_active_meeting(db, new_meeting)
     
     return new_meeting
 
@@ -57,65 +262,33 @@ async def start_meeting(
 async def pause_meeting(
     meeting_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toplantıyı duraklat"""
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
-    
-    if not meeting:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Toplantı bulunamadı"
-        )
-    
-    if meeting.status != "recording":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Sadece kayıt durumundaki toplantılar duraklatılabilir"
-        )
-    
-    meeting.status = "paused"
-    meeting.pause_time = datetime.utcnow()
-    db.commit()
-    db.refresh(meeting)
-    
-    return meeting
+    return await _transition_meeting(
+        db, meeting_id, current_user.id,
+        Meeting.status == "recording",
+        "Sadece kayıt durumundaki toplantılar duraklatılabilir",
+        status="paused",
+        pause_time=func.sysutcdatetime()
+    )
 
 
 @router.post("/{meeting_id}/resume", response_model=MeetingResponse)
 async def resume_meeting(
     meeting_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toplantıyı devam ettir"""
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
-    
-    if not meeting:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Toplantı bulunamadı"
-        )
-    
-    if meeting.status != "paused":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Sadece duraklatılmış toplantılar devam ettirilebilir"
-        )
-    
-    meeting.status = "recording"
-    meeting.pause_time = None
-    meeting.silence_duration = 0
-    db.commit()
-    db.refresh(meeting)
-    
-    return meeting
+    return await _transition_meeting(
+        db, meeting_id, current_user.id,
+        Meeting.status == "paused",
+        "Sadece duraklatılmış toplantılar devam ettirilebilir",
+        status="recording",
+        pause_time=None,
+        silence_duration=0
+    )
 
 
 @router.post("/{meeting_id}/end", response_model=MeetingResponse)
@@ -123,79 +296,74 @@ async def end_meeting(
     meeting_id: int,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toplantıyı bitir"""
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
-    
-    if not meeting:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Toplantı bulunamadı"
-        )
-    
-    if meeting.status == "completed":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Toplantı zaten tamamlanmış"
-        )
+    meeting = await _transition_meeting(
+        db, meeting_id, current_user.id,
+        Meeting.status != "completed",
+        "Toplantı zaten tamamlanmış",
+        status="processing",
+        end_time=func.sysutcdatetime()
+    )
     
-    meeting.status = "processing"
-    meeting.end_time = datetime.utcnow()
-    db.commit()
+    # Kayıt bitti; bekleyen chunk verisini yaz ve append fd'lerini kapat (dosya işlemleri thread'de)
+    await asyncio.to_thread(close_meeting_fds, meeting.id, meeting.audio_file_path, meeting.wav_backup_path)
     
     # Background task ile transkript ve özet oluştur
-    from ..services.whisper_service import WhisperService
-    from ..services.openai_service import OpenAIService
-    import asyncio
-    
     def process_meeting():
-        if meeting.audio_file_path:
-            # Audio preprocessing servisi
-            from ..services.audio_preprocessing_service import AudioPreprocessingService
-            from ..services.whisper_service import WhisperService
-            from ..services.speaker_diarization_service import SpeakerDiarizationService
-            
-            preprocessing_service = AudioPreprocessingService()
-            whisper_service = WhisperService()
-            diarization_service = SpeakerDiarizationService()
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        if not meeting.audio_file_path:
+            return
+        
+        # Paylaşılan servisler (modeller toplantılar arasında bellekte kalır)
+        preprocessing_service = get_audio_preprocessing_service()
+        whisper_service = get_whisper_service()
+        diarization_service = get_speaker_diarization_service()
+        
+        # Başarı ve hata yolu aynı session'ı kullanır
+        with SessionLocal() as db_session:
             try:
-                print(f"🔊 Audio preprocessing başlatılıyor: {meeting.audio_file_path}")
+                # Aynı ses ve parametrelerle daha önce işlendiyse sonucu cache'ten al
+                cache_key = transcript_cache.make_key(
+                    meeting.audio_file_path,
+                    meeting.whisper_model,
+                    language=meeting.language,
+                    use_pyannote=meeting.use_pyannote,
+                    profile=meeting.diarization_profile,
+                    min_speakers=meeting.min_speakers,
+                    max_speakers=meeting.max_speakers
+                )
+                cached_transcripts = transcript_cache.get(cache_key)
+                if cached_transcripts is not None:
+                    logger.info("Transkript cache'ten alındı (%d segment)", len(cached_transcripts))
+                    _complete_meeting_with_transcripts(db_session, meeting.id, cached_transcripts)
+                    return
+                
+                logger.info("Audio preprocessing başlatılıyor: %s", meeting.audio_file_path)
                 
                 # 1. Audio preprocessing (gürültü engelleme, normalizasyon)
                 # SpeechRecognition, ElevenLabs ve AssemblyAI için preprocessing'i atlayabiliriz (API'ler kendi işlemlerini yapıyor)
                 if meeting.whisper_model == "speechrecognition":
-                    print("⚠️  SpeechRecognition için preprocessing atlanıyor (Google API kendi işlemlerini yapıyor)")
+                    logger.debug("SpeechRecognition için preprocessing atlanıyor (Google API kendi işlemlerini yapıyor)")
                     processed_audio_path = meeting.audio_file_path
                 elif meeting.whisper_model == "elevenlabs":
-                    print("⚠️  ElevenLabs için preprocessing atlanıyor (ElevenLabs API kendi işlemlerini yapıyor)")
+                    logger.debug("ElevenLabs için preprocessing atlanıyor (ElevenLabs API kendi işlemlerini yapıyor)")
                     processed_audio_path = meeting.audio_file_path
                 elif meeting.whisper_model == "assemblyai":
-                    print("⚠️  AssemblyAI için preprocessing atlanıyor (AssemblyAI API kendi işlemlerini yapıyor)")
+                    logger.debug("AssemblyAI için preprocessing atlanıyor (AssemblyAI API kendi işlemlerini yapıyor)")
                     processed_audio_path = meeting.audio_file_path
                 else:
                     processed_audio_path = preprocessing_service.preprocess_audio(meeting.audio_file_path)
-                    print(f"✅ Audio preprocessing tamamlandı: {processed_audio_path}")
+                    logger.info("Audio preprocessing tamamlandı: %s", processed_audio_path)
                 
                 # 2. Speaker diarization (konuşmacı ayırt etme) - Pyannote seçeneği
                 speaker_segments = []
-                use_pyannote_diarization = (
-                    meeting.use_pyannote == "true" or 
-                    meeting.whisper_model == "pyannote"
-                )
                 
                 # Pyannote diarization kullanılıyorsa
-                if use_pyannote_diarization or meeting.whisper_model == "pyannote":
-                    print("🎤 Pyannote Diarization başlatılıyor...")
+                if meeting.use_pyannote or meeting.whisper_model == "pyannote":
+                    logger.info("Pyannote diarization başlatılıyor")
                     try:
-                        from ..services.pyannote_diarization_service import PyannoteDiarizationService
-                        pyannote_service = PyannoteDiarizationService()
+                        pyannote_service = get_pyannote_service()
                         
                         # Pyannote ile transkript ve diarization
                         transcripts = pyannote_service.process_with_speakers(
@@ -205,61 +373,31 @@ async def end_meeting(
                             profile=meeting.diarization_profile or "auto"
                         )
                         
-                        print(f"✅ {len(transcripts)} transkript segmenti oluşturuldu (Pyannote)")
+                        logger.info("%d transkript segmenti oluşturuldu (Pyannote)", len(transcripts))
                         
                         # Veritabanına kaydet
-                        db_session = SessionLocal()
-                        try:
-                            from ..models import Transcript
-                            for i, segment in enumerate(transcripts):
-                                transcript = Transcript(
-                                    meeting_id=meeting.id,
-                                    segment_number=i + 1,
-                                    text=segment["text"],
-                                    start_time=segment["start"],
-                                    end_time=segment["end"],
-                                    speaker_id=segment.get("speaker_id"),
-                                    speaker_label=segment.get("speaker_label")
-                                )
-                                db_session.add(transcript)
-                            
-                            updated_meeting = db_session.query(Meeting).filter(Meeting.id == meeting.id).first()
-                            if updated_meeting:
-                                updated_meeting.status = "completed"
-                            db_session.commit()
-                            print("✅ Transkriptler veritabanına kaydedildi")
-                        finally:
-                            db_session.close()
+                        transcript_cache.set(cache_key, transcripts)
+                        _complete_meeting_with_transcripts(db_session, meeting.id, transcripts)
                         
                         return  # Pyannote işlemi tamamlandı, çık
                         
                     except Exception as e:
-                        print(f"❌ Pyannote diarization hatası: {e}")
-                        import traceback
-                        traceback.print_exc()
+                        logger.exception("Pyannote diarization hatası: %s", e)
                         raise
-                else:
+                elif meeting.whisper_model in API_TRANSCRIPTION_MODELS:
                     # Normal speaker diarization (eski yöntem)
-                    try:
-                        print("🎤 Speaker diarization başlatılıyor...")
-                        speaker_segments = diarization_service.diarize(processed_audio_path)
-                        if speaker_segments:
-                            print(f"✅ {len(speaker_segments)} speaker segmenti bulundu")
-                        else:
-                            print("⚠️  Speaker diarization sonuç vermedi (devam ediliyor)")
-                    except Exception as e:
-                        print(f"⚠️  Speaker diarization hatası: {e} (devam ediliyor)")
+                    speaker_segments = _run_speaker_diarization(diarization_service, processed_audio_path)
+                # Whisper modellerinde diarization transkriptle eşzamanlı çalışır (aşağıda)
                 
                 # 3. Transkript oluştur (model tipine göre)
-                print(f"📝 Transkript oluşturuluyor (Model: {meeting.whisper_model})...")
+                logger.info("Transkript oluşturuluyor (model: %s)", meeting.whisper_model)
                 
                 # Model tipine göre doğru servisi kullan
                 if meeting.whisper_model == "elevenlabs":
                     # ElevenLabs servisi kullan - Kişi ayrımı destekli
-                    from ..services.elevenlabs_service import ElevenLabsService
-                    elevenlabs_service = ElevenLabsService()
+                    elevenlabs_service = get_elevenlabs_service()
                     # ElevenLabs için speaker diarization her zaman aktif
-                    transcripts = loop.run_until_complete(
+                    transcripts = run_in_worker_loop(
                         elevenlabs_service.transcribe_audio(
                             processed_audio_path,
                             model_name="elevenlabs",
@@ -270,10 +408,9 @@ async def end_meeting(
                     )
                 elif meeting.whisper_model == "assemblyai":
                     # AssemblyAI servisi kullan - Kişi ayrımı destekli
-                    from ..services.assemblyai_service import AssemblyAIService
-                    assemblyai_service = AssemblyAIService()
+                    assemblyai_service = get_assemblyai_service()
                     # AssemblyAI için speaker diarization aktif
-                    transcripts = loop.run_until_complete(
+                    transcripts = run_in_worker_loop(
                         assemblyai_service.transcribe_audio(
                             processed_audio_path,
                             model_name="assemblyai",
@@ -283,9 +420,8 @@ async def end_meeting(
                         )
                     )
                 elif meeting.whisper_model == "speechrecognition":
-                    from ..services.speechrecognition_service import SpeechRecognitionService
-                    sr_service = SpeechRecognitionService()
-                    transcripts = loop.run_until_complete(
+                    sr_service = get_speechrecognition_service()
+                    transcripts = run_in_worker_loop(
                         sr_service.transcribe_audio(
                             processed_audio_path,
                             model_name="google",
@@ -295,43 +431,21 @@ async def end_meeting(
                         )
                     )
                 else:
-                    # Whisper modeli kullan
-                    transcripts = loop.run_until_complete(
-                        whisper_service.transcribe_audio(
+                    # Whisper modeli kullan; konuşmacı ayrımı transkriptle paralel yürür, sonra eşleştirilir
+                    transcripts = run_in_worker_loop(
+                        _transcribe_with_parallel_diarization(
+                            whisper_service,
+                            diarization_service,
                             processed_audio_path,
                             meeting.whisper_model,
-                            meeting.language,
-                            enable_speaker_diarization=len(speaker_segments) > 0,
-                            speaker_segments=speaker_segments
+                            meeting.language
                         )
                     )
-                print(f"✅ {len(transcripts)} transkript segmenti oluşturuldu")
                 
-                # 4. Veritabanına kaydet
-                db_session = SessionLocal()
-                try:
-                    from ..models import Transcript
-                    for i, segment in enumerate(transcripts):
-                        print(f"💾 Transkript kaydediliyor - Segment {i+1}: '{segment['text'][:100]}...' ({len(segment['text'])} karakter)")
-                        transcript = Transcript(
-                            meeting_id=meeting.id,
-                            segment_number=i + 1,
-                            text=segment["text"],
-                            start_time=segment["start"],
-                            end_time=segment["end"],
-                            speaker_id=segment.get("speaker_id"),
-                            speaker_label=segment.get("speaker_label")
-                        )
-                        db_session.add(transcript)
-                    
-                    # Toplantıyı tamamla
-                    updated_meeting = db_session.query(Meeting).filter(Meeting.id == meeting.id).first()
-                    if updated_meeting:
-                        updated_meeting.status = "completed"
-                    db_session.commit()
-                    print("✅ Transkriptler veritabanına kaydedildi")
-                finally:
-                    db_session.close()
+                # 4. Veritabanına kaydet ve toplantıyı tamamla (aynı transaction'da)
+                logger.info("%d transkript segmenti kaydediliyor", len(transcripts))
+                transcript_cache.set(cache_key, transcripts)
+                _complete_meeting_with_transcripts(db_session, meeting.id, transcripts)
                 
                 # Temizlik: İşlenmiş audio dosyasını sil (opsiyonel)
                 # if processed_audio_path != meeting.audio_file_path:
@@ -341,37 +455,53 @@ async def end_meeting(
                 #         pass
                     
             except Exception as e:
-                print(f"❌ Toplantı işleme hatası: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Toplantı işleme hatası (meeting %s): %s", meeting.id, e)
                 
-                # Hata durumunda meeting'i hata durumuna al
-                db_session = SessionLocal()
-                try:
-                    error_meeting = db_session.query(Meeting).filter(Meeting.id == meeting.id).first()
-                    if error_meeting:
-                        error_meeting.status = "error"
-                    db_session.commit()
-                finally:
-                    db_session.close()
-            finally:
-                loop.close()
+                # Yarım kalan insert'leri geri al, meeting'i hata durumuna al
+                db_session.rollback()
+                _set_meeting_status(db_session, meeting.id, "error")
+                db_session.commit()
     
-    background_tasks.add_task(process_meeting)
-    db.refresh(meeting)
+    # Yanıt gönderildikten sonra işi uygun kuyruğa aktar
+    background_tasks.add_task(
+        _submit_transcription_job,
+        process_meeting,
+        meeting.whisper_model,
+        bool(meeting.use_pyannote)
+    )
     
     return meeting
 
 
-@router.get("/", response_model=List[MeetingResponse])
+@router.get("/", response_model=List[MeetingListItem])
 async def get_meetings(
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[datetime] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Kullanıcının toplantılarını listele"""
-    meetings = db.query(Meeting).filter(
-        Meeting.user_id == current_user.id
-    ).order_by(Meeting.created_at.desc()).all()
+    """Kullanıcının toplantılarını listele
+    
+    limit verilmezse tüm liste döner (sayfalama yapmayan istemciler için); limit ile birlikte
+    cursor önceki sayfanın son created_at değeridir.
+    """
+    query = select(Meeting).options(
+        load_only(
+            Meeting.id, Meeting.title, Meeting.status, Meeting.start_time, Meeting.end_time,
+            Meeting.created_at, Meeting.whisper_model, Meeting.language
+        ),
+        # Yanıt şeması ilişki içermez; gizli lazy load (N+1) olursa sessizce sorgu atmak yerine hata ver
+        raiseload("*")
+    ).where(Meeting.user_id == current_user.id)
+    
+    if cursor is not None:
+        query = query.where(Meeting.created_at < cursor)
+    
+    query = query.order_by(Meeting.created_at.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    
+    meetings = (await db.scalars(query)).all()
     
     return meetings
 
@@ -380,13 +510,15 @@ async def get_meetings(
 async def get_meeting(
     meeting_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toplantı detayı"""
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
+    meeting = await db.scalar(
+        select(Meeting).options(raiseload("*")).where(
+            Meeting.id == meeting_id,
+            Meeting.user_id == current_user.id
+        )
+    )
     
     if not meeting:
         raise HTTPException(
@@ -402,17 +534,15 @@ async def generate_summary(
     meeting_id: int,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toplantı için özet oluştur (manuel)"""
-    from ..models import Transcript, Summary
-    from ..services.openai_service import OpenAIService
-    import asyncio
-    
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
+    meeting = await db.scalar(
+        select(Meeting).where(
+            Meeting.id == meeting_id,
+            Meeting.user_id == current_user.id
+        )
+    )
     
     if not meeting:
         raise HTTPException(
@@ -428,19 +558,21 @@ async def generate_summary(
         )
     
     # Zaten özet var mı kontrol et
-    existing_summary = db.query(Summary).filter(Summary.meeting_id == meeting_id).first()
+    existing_summary = await db.scalar(select(Summary.id).where(Summary.meeting_id == meeting_id))
     if existing_summary:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Bu toplantı için zaten özet oluşturulmuş"
         )
     
-    # Transkriptleri al
-    transcripts = db.query(Transcript).filter(
-        Transcript.meeting_id == meeting_id
-    ).order_by(Transcript.segment_number).all()
+    # Transkript metinlerini al (özet için sadece text kolonu gerekli, ORM nesnesi oluşturulmaz)
+    transcript_texts = (await db.scalars(
+        select(Transcript.text)
+        .where(Transcript.meeting_id == meeting_id)
+        .order_by(Transcript.segment_number)
+    )).all()
     
-    if not transcripts:
+    if not transcript_texts:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Toplantı için transkript bulunamadı"
@@ -448,33 +580,41 @@ async def generate_summary(
     
     def create_summary():
         """Background task ile özet oluştur"""
-        db_session = SessionLocal()
-        try:
-            full_text = " ".join([t.text for t in transcripts])
-            openai_service = OpenAIService()
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        with SessionLocal() as db_session:
             try:
-                summary_result = loop.run_until_complete(
-                    openai_service.summarize_transcript(full_text, meeting.language)
-                )
-                
+                full_text = "\n".join(transcript_texts)
+                digest = hashlib.sha256(f"{meeting.language}\n{full_text}".encode("utf-8")).hexdigest()
+            
+                # Aynı transkript daha önce özetlendiyse OpenAI'ye tekrar gidilmez
+                cached = db_session.query(SummaryCache).filter(SummaryCache.digest == digest).first()
+                if cached:
+                    summary_text, key_points = cached.summary_text, cached.key_points
+                else:
+                    openai_service = get_openai_service()
+                    summary_result = run_in_worker_loop(
+                        openai_service.summarize_transcript(full_text, meeting.language)
+                    )
+                    summary_text, key_points = summary_result["summary"], summary_result["key_points"]
+            
                 summary = Summary(
                     meeting_id=meeting_id,
-                    summary_text=summary_result["summary"],
-                    key_points=summary_result["key_points"]
+                    summary_text=summary_text,
+                    key_points=key_points
                 )
                 db_session.add(summary)
                 db_session.commit()
-            finally:
-                loop.close()
-        except Exception as e:
-            print(f"Özet oluşturma hatası: {str(e)}")
-        finally:
-            db_session.close()
+            
+                if not cached:
+                    try:
+                        db_session.add(SummaryCache(digest=digest, summary_text=summary_text, key_points=key_points))
+                        db_session.commit()
+                    except IntegrityError:
+                        # Aynı özet eşzamanlı olarak cache'e yazılmış
+                        db_session.rollback()
+            except Exception as e:
+                logger.exception("Özet oluşturma hatası: %s", e)
     
-    background_tasks.add_task(create_summary)
+    background_tasks.add_task(submit_io_job, create_summary)
     
     return {"message": "Özet oluşturuluyor, lütfen bekleyin..."}
 
@@ -483,32 +623,19 @@ async def generate_summary(
 async def cancel_meeting(
     meeting_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """İşlenmekte olan toplantıyı iptal et"""
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
-    
-    if not meeting:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Toplantı bulunamadı"
-        )
-    
     # Sadece işlenmekte olan toplantılar iptal edilebilir
-    if meeting.status not in ["processing", "recording", "paused"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Bu durumda olan toplantılar iptal edilemez: {meeting.status}"
-        )
+    meeting = await _transition_meeting(
+        db, meeting_id, current_user.id,
+        Meeting.status.in_(["processing", "recording", "paused"]),
+        "Bu durumda olan toplantılar iptal edilemez: {status}",
+        status="cancelled",
+        end_time=func.sysutcdatetime()
+    )
     
-    # Toplantıyı iptal et
-    meeting.status = "cancelled"
-    meeting.end_time = datetime.utcnow()
-    db.commit()
-    db.refresh(meeting)
+    await asyncio.to_thread(close_meeting_fds, meeting.id, meeting.audio_file_path, meeting.wav_backup_path)
     
     return {
         "message": "Toplantı iptal edildi",
@@ -534,11 +661,9 @@ async def process_audio_file(
     file_data: ProcessFileRequest,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Dosya yolu ile ses dosyasını işle (Pyannote destekli)"""
-    import os
-    
     audio_file_path = file_data.audio_file_path
     whisper_model = file_data.whisper_model
     language = file_data.language
@@ -547,8 +672,10 @@ async def process_audio_file(
     min_speakers = file_data.min_speakers
     max_speakers = file_data.max_speakers
     
-    # Dosya varlığını kontrol et
-    if not os.path.exists(audio_file_path):
+    # Dosya varlığını kontrol et (boyut/mtime cache anahtarı için de kullanılır)
+    try:
+        file_stat = os.stat(audio_file_path)
+    except OSError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Ses dosyası bulunamadı: {audio_file_path}"
@@ -561,139 +688,127 @@ async def process_audio_file(
         whisper_model="pyannote" if use_pyannote else whisper_model,
         language=language,
         status="processing",
-        start_time=datetime.utcnow(),
-        end_time=datetime.utcnow(),
+        end_time=func.sysutcdatetime(),
         audio_file_path=audio_file_path,
-        use_pyannote=str(use_pyannote).lower() if use_pyannote else None,
+        use_pyannote=use_pyannote,
         diarization_profile=diarization_profile,
         min_speakers=min_speakers,
         max_speakers=max_speakers
     )
     
     db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
+    await db.commit()
+    await db.refresh(new_meeting)
     
     # Background task ile işle
     def process_file():
-        import asyncio
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        db_session = SessionLocal()
-        
-        try:
-            # Model tipine göre işleme yap
-            model_type = whisper_model if not use_pyannote else "pyannote"
-            print(f"🎯 Dosya işleme başlatılıyor - Model: {model_type}, Dosya: {audio_file_path}")
+        with SessionLocal() as db_session:
+            try:
+                # Model tipine göre işleme yap
+                model_type = whisper_model if not use_pyannote else "pyannote"
+                logger.info("Dosya işleme başlatılıyor - model: %s, dosya: %s", model_type, audio_file_path)
             
-            # Pyannote modeli
-            if use_pyannote or model_type == "pyannote":
-                print(f"🎤 Pyannote ile dosya işleniyor: {audio_file_path}")
-                from ..services.pyannote_diarization_service import PyannoteDiarizationService
-                pyannote_service = PyannoteDiarizationService()
-                
-                transcripts = pyannote_service.process_with_speakers(
+                # Aynı dosya aynı parametrelerle tekrar işlenirse model çalıştırılmaz
+                cache_key = transcript_cache.make_key(
                     audio_file_path,
+                    model_type,
+                    file_stat=file_stat,
+                    language=language,
+                    profile=diarization_profile,
                     min_speakers=min_speakers,
-                    max_speakers=max_speakers,
-                    profile=diarization_profile
+                    max_speakers=max_speakers
                 )
+                transcripts = transcript_cache.get(cache_key)
+                from_cache = transcripts is not None
+                if from_cache:
+                    logger.info("Transkript cache'ten alındı (%d segment)", len(transcripts))
+            
+                # Pyannote modeli
+                elif use_pyannote or model_type == "pyannote":
+                    logger.debug("Pyannote ile dosya işleniyor: %s", audio_file_path)
+                    pyannote_service = get_pyannote_service()
                 
-            # ElevenLabs modeli
-            elif model_type == "elevenlabs":
-                print(f"🎙️ ElevenLabs ile dosya işleniyor: {audio_file_path}")
-                from ..services.elevenlabs_service import ElevenLabsService
-                elevenlabs_service = ElevenLabsService()
-                
-                transcripts = loop.run_until_complete(
-                    elevenlabs_service.transcribe_audio(
+                    transcripts = pyannote_service.process_with_speakers(
                         audio_file_path,
-                        model_name="elevenlabs",
-                        language=language,
-                        enable_speaker_diarization=True
+                        min_speakers=min_speakers,
+                        max_speakers=max_speakers,
+                        profile=diarization_profile
                     )
-                )
                 
-            # AssemblyAI modeli
-            elif model_type == "assemblyai":
-                print(f"🌐 AssemblyAI ile dosya işleniyor: {audio_file_path}")
-                from ..services.assemblyai_service import AssemblyAIService
-                assemblyai_service = AssemblyAIService()
+                # ElevenLabs modeli
+                elif model_type == "elevenlabs":
+                    logger.debug("ElevenLabs ile dosya işleniyor: %s", audio_file_path)
+                    elevenlabs_service = get_elevenlabs_service()
                 
-                transcripts = loop.run_until_complete(
-                    assemblyai_service.transcribe_audio(
-                        audio_file_path,
-                        model_name="assemblyai",
-                        language=language,
-                        enable_speaker_diarization=True
+                    transcripts = run_in_worker_loop(
+                        elevenlabs_service.transcribe_audio(
+                            audio_file_path,
+                            model_name="elevenlabs",
+                            language=language,
+                            enable_speaker_diarization=True
+                        )
                     )
-                )
                 
-            # SpeechRecognition modeli
-            elif model_type == "speechrecognition":
-                print(f"🗣️ SpeechRecognition ile dosya işleniyor: {audio_file_path}")
-                from ..services.speechrecognition_service import SpeechRecognitionService
-                sr_service = SpeechRecognitionService()
+                # AssemblyAI modeli
+                elif model_type == "assemblyai":
+                    logger.debug("AssemblyAI ile dosya işleniyor: %s", audio_file_path)
+                    assemblyai_service = get_assemblyai_service()
                 
-                transcripts = loop.run_until_complete(
-                    sr_service.transcribe_audio(
-                        audio_file_path,
-                        model_name="google",
-                        language=language,
-                        enable_speaker_diarization=False
+                    transcripts = run_in_worker_loop(
+                        assemblyai_service.transcribe_audio(
+                            audio_file_path,
+                            model_name="assemblyai",
+                            language=language,
+                            enable_speaker_diarization=True
+                        )
                     )
-                )
                 
-            # Whisper modelleri (tiny, base, small, medium, large)
-            else:
-                print(f"🎧 Whisper ({model_type}) ile dosya işleniyor: {audio_file_path}")
-                from ..services.whisper_service import WhisperService
-                whisper_service = WhisperService()
+                # SpeechRecognition modeli
+                elif model_type == "speechrecognition":
+                    logger.debug("SpeechRecognition ile dosya işleniyor: %s", audio_file_path)
+                    sr_service = get_speechrecognition_service()
                 
-                transcripts = loop.run_until_complete(
-                    whisper_service.transcribe_audio(
-                        audio_file_path,
-                        model_type,
-                        language
+                    transcripts = run_in_worker_loop(
+                        sr_service.transcribe_audio(
+                            audio_file_path,
+                            model_name="google",
+                            language=language,
+                            enable_speaker_diarization=False
+                        )
+                    )
+                
+                # Whisper modelleri (tiny, base, small, medium, large)
+                else:
+                    logger.debug("Whisper (%s) ile dosya işleniyor: %s", model_type, audio_file_path)
+                    whisper_service = get_whisper_service()
+                
+                    transcripts = run_in_worker_loop(
+                        whisper_service.transcribe_audio(
+                            audio_file_path,
+                            model_type,
+                            language
+                        )
                     )
-                )
             
-            # Veritabanına kaydet
-            from ..models import Transcript
-            print(f"💾 {len(transcripts)} transkript segmenti veritabanına kaydediliyor...")
+                if not from_cache:
+                    transcript_cache.set(cache_key, transcripts)
             
-            for i, segment in enumerate(transcripts):
-                transcript = Transcript(
-                    meeting_id=new_meeting.id,
-                    segment_number=i + 1,
-                    text=segment["text"],
-                    start_time=segment["start"],
-                    end_time=segment["end"],
-                    speaker_id=segment.get("speaker_id"),
-                    speaker_label=segment.get("speaker_label")
-                )
-                db_session.add(transcript)
+                # Veritabanına kaydet
+                logger.info("%d transkript segmenti veritabanına kaydediliyor", len(transcripts))
+                _save_transcripts(db_session, new_meeting.id, transcripts)
             
-            updated_meeting = db_session.query(Meeting).filter(Meeting.id == new_meeting.id).first()
-            if updated_meeting:
-                updated_meeting.status = "completed"
-            db_session.commit()
-            print(f"✅ Dosya işlendi ve kaydedildi - Model: {model_type}")
+                _set_meeting_status(db_session, new_meeting.id, "completed")
+                db_session.commit()
+                logger.info("Dosya işlendi ve kaydedildi - model: %s", model_type)
                 
-        except Exception as e:
-            print(f"❌ Dosya işleme hatası: {e}")
-            import traceback
-            traceback.print_exc()
-            updated_meeting = db_session.query(Meeting).filter(Meeting.id == new_meeting.id).first()
-            if updated_meeting:
-                updated_meeting.status = "error"
-            db_session.commit()
-        finally:
-            db_session.close()
-            loop.close()
+            except Exception as e:
+                logger.exception("Dosya işleme hatası: %s", e)
+                # Yarım kalan transkript insert'leri geri alınır
+                db_session.rollback()
+                _set_meeting_status(db_session, new_meeting.id, "error")
+                db_session.commit()
     
-    background_tasks.add_task(process_file)
+    background_tasks.add_task(_submit_transcription_job, process_file, whisper_model, use_pyannote)
     
     return {
         "message": "Dosya işleniyor...",
@@ -706,6 +821,7 @@ class StreamAudioRequest(BaseModel):
     duration_seconds: Optional[int] = None  # Maksimum süre (saniye), None ise manuel durdurma
     save_wav: bool = True  # WAV dosyası kaydet
     language: str = "tr"
+    live_summary: bool = False  # Transkript parçalarını streaming sırasında özetle, bitince toplantı özetini kaydet
 
 
 @router.post("/stream-audio")
@@ -713,7 +829,7 @@ async def stream_audio(
     stream_data: StreamAudioRequest,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     AssemblyAI Streaming Audio - Gerçek zamanlı ses transkripsiyon
@@ -721,14 +837,14 @@ async def stream_audio(
     NOT: Bu endpoint streaming başlatır ve hemen döner.
     Transkriptler gerçek zamanlı olarak veritabanına kaydedilir.
     """
-    import os
-    
     # Meeting kontrolü veya yeni meeting oluştur
     if stream_data.meeting_id:
-        meeting = db.query(Meeting).filter(
-            Meeting.id == stream_data.meeting_id,
-            Meeting.user_id == current_user.id
-        ).first()
+        meeting = await db.scalar(
+            select(Meeting).where(
+                Meeting.id == stream_data.meeting_id,
+                Meeting.user_id == current_user.id
+            )
+        )
         
         if not meeting:
             raise HTTPException(
@@ -742,125 +858,180 @@ async def stream_audio(
                 detail="Sadece kayıt durumundaki toplantılara streaming eklenebilir"
             )
     else:
+        # Kullanıcı başına tek aktif toplantı (unique filtered index); çakışma 500 yerine 400 döner
+        await _ensure_no_active_meeting(db, current_user.id)
+        
         # Yeni meeting oluştur
         meeting = Meeting(
             user_id=current_user.id,
             title=f"Streaming Audio - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
             whisper_model="assemblyai",
             language=stream_data.language,
-            status="recording",
-            start_time=datetime.utcnow()
+            status="recording"
         )
-        db.add(meeting)
-        db.commit()
-        db.refresh(meeting)
+        await _add_active_meeting(db, meeting)
+    
+    # WAV dizini streaming başlamadan oluşturulur (streaming thread'i dosya sistemi işiyle beklemez)
+    wav_path = None
+    if stream_data.save_wav:
+        meeting_dir = os.path.join("uploads", str(current_user.id), str(meeting.id))
+        await asyncio.to_thread(os.makedirs, meeting_dir, exist_ok=True)
+        wav_path = os.path.join(meeting_dir, "streaming_audio.wav")
     
     # Background task ile streaming başlat
     def start_streaming():
+        # pyaudio/websocket bağımlılıkları yalnızca streaming kullanılınca yüklenir
         from ..services.assemblyai_streaming_service import AssemblyAIStreamingService
-        from ..models import Transcript
-        import asyncio
         
-        db_session = SessionLocal()
-        transcripts_buffer = []
+        pending_rows: List[dict] = []
+        pending_lock = threading.Lock()
+        # AssemblyAI callback thread'i ile stream worker thread'i aynı anda flush edebilir; flush'lar
+        # sırayla ve her biri kendi kısa ömürlü session'ında çalışır (Session thread-safe değildir)
+        flush_lock = threading.Lock()
+        last_flush = time.monotonic()
         segment_counter = 0
+        # Canlı özet: dolan her pencere toplantı sürerken IO kuyruğunda özetlenir
+        chunker = SummaryChunker() if stream_data.live_summary else None
+        summary_futures: List[Future] = []
+        
+        def flush_pending(finish_meeting: bool = False):
+            """Bekleyen segmentleri tek toplu INSERT ile yaz; finish_meeting ise toplantıyı aynı commit'te tamamla
+            
+            INSERT kendi SAVEPOINT'inde çalışır: hatalı bir grup yalnızca kendisini geri alır,
+            aynı transaction'daki diğer değişiklikler (ör. meeting durumu) etkilenmez.
+            """
+            nonlocal last_flush
+            with flush_lock, SessionLocal() as db_session:
+                with pending_lock:
+                    rows = list(pending_rows)
+                    pending_rows.clear()
+                    last_flush = time.monotonic()
+                if rows:
+                    try:
+                        with db_session.begin_nested():
+                            db_session.bulk_insert_mappings(Transcript, rows)
+                    except Exception as e:
+                        stream_logger.error("Transkript kaydetme hatası (%d segment): %s", len(rows), e)
+                        rows = []
+                if finish_meeting:
+                    db_session.query(Meeting).filter(Meeting.id == meeting.id).update(
+                        {"status": "completed", "end_time": func.sysutcdatetime()},
+                        synchronize_session=False
+                    )
+                db_session.commit()
+                if rows and transcript_hub.has_subscribers(meeting.id):
+                    # Canlı izleyen istemcilere yalnızca yeni segmentler, GET /transcripts ile aynı
+                    # kolonlarla (veritabanının atadığı id ve created_at dahil) gönderilir
+                    try:
+                        inserted = db_session.execute(
+                            select(*TRANSCRIPT_RESPONSE_COLUMNS)
+                            .where(
+                                Transcript.meeting_id == meeting.id,
+                                Transcript.segment_number.in_([row["segment_number"] for row in rows])
+                            )
+                            .order_by(Transcript.segment_number)
+                        ).mappings().all()
+                        transcript_hub.publish(meeting.id, [dict(row) for row in inserted])
+                    except Exception as e:
+                        stream_logger.error("Canlı transkript yayını hatası (meeting %s): %s", meeting.id, e)
         
         try:
-            print(f"🎙️ AssemblyAI Streaming başlatılıyor - Meeting ID: {meeting.id}")
-            service = AssemblyAIStreamingService()
+            stream_logger.info("AssemblyAI streaming başlatılıyor - meeting %s", meeting.id)
+            # WAV istenirse aşağıda meeting dizinine bir kez yazılır (kapanışta ikinci kopya yok)
+            service = AssemblyAIStreamingService(auto_save_wav=False)
             
-            # Transcript callback'i
+            # Transcript callback'i: segmentler biriktirilir, N segmentte veya T saniyede bir yazılır
             def on_transcript(text: str, is_formatted: bool):
                 nonlocal segment_counter
                 if is_formatted and text.strip():
-                    segment_counter += 1
-                    print(f"📝 Transkript alındı (Segment {segment_counter}): {text[:100]}...")
-                    
-                    # Veritabanına kaydet
-                    try:
-                        transcript = Transcript(
-                            meeting_id=meeting.id,
-                            segment_number=segment_counter,
-                            text=text,
-                            start_time=0.0,  # Streaming'de zaman damgası yok
-                            end_time=0.0,
-                            speaker_id=None,  # Streaming API'de speaker ID farklı formatta gelebilir
-                            speaker_label=None
+                    with pending_lock:
+                        segment_counter += 1
+                        stream_logger.debug("Transkript alındı (segment %d): %.100s", segment_counter, text)
+                        pending_rows.append({
+                            "meeting_id": meeting.id,
+                            "segment_number": segment_counter,
+                            "text": text,
+                            "start_time": 0.0,  # Streaming'de zaman damgası yok
+                            "end_time": 0.0,
+                            "speaker_id": None,  # Streaming API'de speaker ID farklı formatta gelebilir
+                            "speaker_label": None
+                        })
+                        should_flush = (
+                            len(pending_rows) >= STREAM_FLUSH_SEGMENTS
+                            or time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL_SECONDS
                         )
-                        db_session.add(transcript)
-                        db_session.commit()
-                        print(f"✅ Transkript kaydedildi (Segment {segment_counter})")
-                    except Exception as e:
-                        print(f"❌ Transkript kaydetme hatası: {e}")
-                        db_session.rollback()
+                        summary_chunk = chunker.add(text) if chunker else None
+                    if should_flush:
+                        flush_pending()
+                    if summary_chunk:
+                        summary_futures.append(submit_io_job(_summarize_text, summary_chunk, meeting.language))
             
             # Session callback'leri
             def on_session_begin(session_id: str, expires_at: int):
-                print(f"🟢 Session başladı: {session_id}")
+                stream_logger.info("Streaming session başladı: %s", session_id)
             
             def on_session_end(audio_duration: float, session_duration: float):
-                print(f"🔴 Session bitti: {audio_duration}s audio, {session_duration}s toplam")
+                stream_logger.info("Streaming session bitti: %ss audio, %ss toplam", audio_duration, session_duration)
                 
-                # Meeting'i tamamla
+                # Kalan segmentler ve meeting'in tamamlanması tek commit'te yazılır
                 try:
-                    updated_meeting = db_session.query(Meeting).filter(Meeting.id == meeting.id).first()
-                    if updated_meeting:
-                        updated_meeting.status = "completed"
-                        updated_meeting.end_time = datetime.utcnow()
-                    db_session.commit()
-                    print(f"✅ Meeting tamamlandı (ID: {meeting.id})")
+                    flush_pending(finish_meeting=True)
+                    stream_logger.info("Meeting tamamlandı (meeting %s)", meeting.id)
                 except Exception as e:
-                    print(f"❌ Meeting güncelleme hatası: {e}")
-                    db_session.rollback()
-            
+                    stream_logger.error("Meeting güncelleme hatası: %s", e)
+        
             # Callback'leri ayarla
             service.set_transcript_callback(on_transcript)
             service.set_session_callbacks(on_session_begin, on_session_end)
-            
+        
             # Streaming'i başlat
             service.start_streaming(duration_seconds=stream_data.duration_seconds)
-            
-            # WAV dosyasını kaydet
-            if stream_data.save_wav:
-                # Meeting dizinini oluştur
-                meeting_dir = os.path.join("uploads", str(current_user.id), str(meeting.id))
-                os.makedirs(meeting_dir, exist_ok=True)
-                
-                wav_path = os.path.join(meeting_dir, "streaming_audio.wav")
+        
+            # WAV dosyasını kaydet (dizin endpoint'te oluşturuldu)
+            if wav_path:
                 saved_path = service.save_wav_file(wav_path)
-                
+            
                 if saved_path:
                     # Meeting'e audio path'i ekle
                     try:
-                        updated_meeting = db_session.query(Meeting).filter(Meeting.id == meeting.id).first()
-                        if updated_meeting:
-                            updated_meeting.audio_file_path = saved_path
-                        db_session.commit()
-                        print(f"✅ WAV dosyası kaydedildi: {saved_path}")
+                        with SessionLocal() as db_session:
+                            db_session.query(Meeting).filter(Meeting.id == meeting.id).update(
+                                {"audio_file_path": saved_path},
+                                synchronize_session=False
+                            )
+                            db_session.commit()
+                        stream_logger.info("WAV dosyası kaydedildi: %s", saved_path)
                     except Exception as e:
-                        print(f"❌ Audio path güncelleme hatası: {e}")
-                        db_session.rollback()
-            
-            print(f"✅ Streaming tamamlandı - Meeting ID: {meeting.id}")
+                        stream_logger.error("Audio path güncelleme hatası: %s", e)
             
+            # Son pencereyi özetle ve parça özetlerini toplantı özeti olarak kaydet
+            if chunker:
+                with pending_lock:
+                    summary_chunk = chunker.flush()
+                if summary_chunk:
+                    summary_futures.append(submit_io_job(_summarize_text, summary_chunk, meeting.language))
+                with SessionLocal() as db_session:
+                    _save_live_summary(db_session, meeting.id, meeting.language, summary_futures)
+        
+            stream_logger.info("Streaming tamamlandı - meeting %s", meeting.id)
+        
         except Exception as e:
-            print(f"❌ Streaming hatası: {e}")
-            import traceback
-            traceback.print_exc()
-            
+            stream_logger.exception("Streaming hatası: %s", e)
+        
             # Hata durumunda meeting'i hata durumuna al
             try:
-                error_meeting = db_session.query(Meeting).filter(Meeting.id == meeting.id).first()
-                if error_meeting:
-                    error_meeting.status = "error"
-                db_session.commit()
+                with SessionLocal() as db_session:
+                    _set_meeting_status(db_session, meeting.id, "error")
+                    db_session.commit()
             except:
                 pass
         finally:
-            db_session.close()
+            flush_pending()
+            # İzleyen WebSocket'lere akışın bittiğini bildir
+            transcript_hub.publish(meeting.id, [None])
     
-    # Background task'i başlat
-    background_tasks.add_task(start_streaming)
+    # Streaming oturumunu ayrı kuyrukta başlat (FastAPI threadpool'u süre boyunca meşgul edilmez)
+    background_tasks.add_task(submit_stream_job, start_streaming)
     
     return {
         "message": "Streaming başlatılıyor...",
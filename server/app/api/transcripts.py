@@ -1,71 +1,157 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
 from typing import List
-from ..database import get_db
+from ..database import get_async_db, AsyncSessionLocal
 from ..models import User, Meeting, Transcript, Summary
 from ..schemas import TranscriptResponse
 from ..api.auth import get_current_user
+from ..utils import transcript_hub
 
 router = APIRouter()
 
+# Sahiplik kontrolü: Meeting nesnesi yüklenmez, ifade bir kez kurulur ve derlenmiş hali cache'ten gelir
+# (status non-null olduğundan None dönmesi toplantının bulunamadığı anlamına gelir)
+_MEETING_STATUS_FOR_USER = select(Meeting.status).where(
+    Meeting.id == bindparam("meeting_id"),
+    Meeting.user_id == bindparam("user_id")
+)
+
+# Canlı izlenebilen toplantı durumları (diğerlerinde yeni segment gelmez)
+_LIVE_STATUSES = ("recording", "paused")
+
+# TranscriptResponse alanları (canlı yayında da aynı kolonlar gönderilir)
+TRANSCRIPT_RESPONSE_COLUMNS = (
+    Transcript.id,
+    Transcript.meeting_id,
+    Transcript.segment_number,
+    Transcript.text,
+    Transcript.start_time,
+    Transcript.end_time,
+    Transcript.speaker_id,
+    Transcript.speaker_label,
+    Transcript.created_at,
+)
+
 
 @router.get("/transcripts/{meeting_id}", response_model=List[TranscriptResponse])
 async def get_transcript(
     meeting_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toplantı transkripti"""
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
+    meeting_status = await db.scalar(
+        _MEETING_STATUS_FOR_USER,
+        {"meeting_id": meeting_id, "user_id": current_user.id}
+    )
     
-    if not meeting:
+    if meeting_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Toplantı bulunamadı"
         )
     
-    transcripts = db.query(Transcript).filter(
-        Transcript.meeting_id == meeting_id
-    ).order_by(Transcript.segment_number).all()
+    # Sadece yanıt kolonları seçilir; satır başına ORM nesnesi (identity map) oluşturulmaz
+    result = await db.execute(
+        select(*TRANSCRIPT_RESPONSE_COLUMNS)
+        .where(Transcript.meeting_id == meeting_id)
+        .order_by(Transcript.segment_number)
+    )
     
-    return transcripts
+    return [dict(row) for row in result.mappings()]
 
 
 @router.get("/summaries/{meeting_id}")
 async def get_summary(
     meeting_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toplantı özeti"""
-    meeting = db.query(Meeting).filter(
-        Meeting.id == meeting_id,
-        Meeting.user_id == current_user.id
-    ).first()
+    meeting_status = await db.scalar(
+        _MEETING_STATUS_FOR_USER,
+        {"meeting_id": meeting_id, "user_id": current_user.id}
+    )
     
-    if not meeting:
+    if meeting_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Toplantı bulunamadı"
         )
     
-    summary = db.query(Summary).filter(Summary.meeting_id == meeting_id).first()
+    summary = await db.scalar(select(Summary).where(Summary.meeting_id == meeting_id))
     
     if not summary:
         return {
             "message": "Özet henüz oluşturulmadı",
-            "status": meeting.status
+            "status": meeting_status
         }
     
-    import json
-    key_points = json.loads(summary.key_points) if summary.key_points else []
-    
     return {
         "summary": summary.summary_text,
-        "key_points": key_points,
+        "key_points": summary.key_points or [],
         "created_at": summary.created_at
     }
 
+
+@router.websocket("/ws/transcripts/{meeting_id}")
+async def transcript_updates(websocket: WebSocket, meeting_id: int, token: str = Query(...)):
+    """Canlı toplantının yeni transkript segmentlerini push et (geçmiş için GET /transcripts kullanılır)
+    
+    Segmentler GET /transcripts ile aynı biçimde (TranscriptResponse) gönderilir. Akış bittiğinde
+    veya toplantı canlı değilse {"event": "end"} gönderilip bağlantı kapatılır.
+    """
+    # Durum kontrolü ile abonelik arasında akış biterse bitiş bildirimi kaçmasın diye önce abone olunur
+    queue = transcript_hub.subscribe(meeting_id)
+    receive_task = get_task = None
+    try:
+        async with AsyncSessionLocal() as db:
+            try:
+                current_user = await get_current_user(token, db)
+            except HTTPException:
+                await websocket.close(code=1008)
+                return
+            
+            meeting_status = await db.scalar(
+                _MEETING_STATUS_FOR_USER,
+                {"meeting_id": meeting_id, "user_id": current_user.id}
+            )
+        
+        if meeting_status is None:
+            await websocket.close(code=1008)
+            return
+        
+        await websocket.accept()
+        if meeting_status not in _LIVE_STATUSES:
+            await websocket.send_json({"event": "end"})
+            await websocket.close()
+            return
+        
+        # Kuyruk istemcinin bağlantıyı kapatmasıyla yarıştırılır; aksi halde kopan istemci fark edilmez
+        receive_task = asyncio.ensure_future(websocket.receive())
+        get_task = asyncio.ensure_future(queue.get())
+        while True:
+            done, _ = await asyncio.wait({receive_task, get_task}, return_when=asyncio.FIRST_COMPLETED)
+            
+            if get_task in done:
+                segment = get_task.result()
+                if segment is None:
+                    # Streaming bitti
+                    await websocket.send_json({"event": "end"})
+                    await websocket.close()
+                    break
+                await websocket.send_json(TranscriptResponse.model_validate(segment).model_dump(mode="json"))
+                get_task = asyncio.ensure_future(queue.get())
+            
+            if receive_task in done:
+                if receive_task.result()["type"] == "websocket.disconnect":
+                    break
+                # İstemciden gelen diğer mesajlar yok sayılır
+                receive_task = asyncio.ensure_future(websocket.receive())
+    finally:
+        for task in (receive_task, get_task):
+            if task is not None:
+                task.cancel()
+        transcript_hub.unsubscribe(meeting_id, queue)
@@ -1,3 +1,4 @@
+from functools import cached_property
 from pydantic_settings import BaseSettings
 from typing import List
 import os
@@ -6,6 +7,10 @@ import os
 class Settings(BaseSettings):
     # Database
     database_url: str
+    db_pool_size: int = 20  # Streaming oturumları ve background job'lar istek handler'larıyla aynı havuzu paylaşır
+    db_max_overflow: int = 40
+    db_pool_recycle: int = 1800  # Sunucu tarafında kapatılmış boşta bağlantıların kullanılmaması için (saniye)
+    auto_create_tables: bool = False  # Geliştirme: uygulama import edilirken eksik tabloları oluştur
     
     # JWT
     secret_key: str
@@ -29,6 +34,10 @@ class Settings(BaseSettings):
     # File Storage
     upload_dir: str = "./uploads"
     models_dir: str = "./models"
+    transcript_cache_dir: str = "./cache/transcripts"  # İçerik hash'ine göre saklanan transkript sonuçları
+    # Upload chunk'larını süreç belleğinde biriktirip toplu yaz (en fazla 1 MB / 5 sn; süreç çökerse bu kısım kaybolur).
+    # Buffer ve açık fd'ler süreç başınadır: birden fazla uvicorn worker'ı ile çalışırken False yapın
+    upload_coalesce_chunks: bool = True
     
     # Whisper
     default_whisper_model: str = "large-v3-turbo"
@@ -43,11 +52,15 @@ class Settings(BaseSettings):
     whisper_model_path: str = "./models/whisper-large-v3-turbo"  # Whisper model yolu (relative path)
     enable_pyannote: bool = True  # Pyannote diarization'ı etkinleştir
     default_diarization_profile: str = "auto"  # auto, high_quality, podcast_interview, noisy_meeting, aggressive
+    pyannote_embedding_batch_size: int = 8  # Düşük VRAM'li GPU'larda 32 (varsayılan) bellek taşmasına yol açar
+    pyannote_segmentation_batch_size: int = 8
+    pyannote_fp16: bool = True  # GPU'da speaker embedding hesaplamasını fp16 ile yap
+    pyannote_whisper_batch_size: int = 4  # Pyannote akışında Whisper'a aynı anda verilen 20 sn'lik chunk sayısı
     
     # CORS
     cors_origins: str = "http://localhost:3000,http://localhost:5173"
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.cors_origins.split(",")]
     
@@ -1,19 +1,49 @@
+import orjson
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
+
+def _json_serializer(obj) -> str:
+    return orjson.dumps(obj).decode("utf-8")
+
+
+# JSON kolonları (ör. summaries.key_points) stdlib json yerine orjson ile encode/decode edilir
+_JSON_OPTIONS = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+
 # Create engine
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    **_JSON_OPTIONS
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: async handler'lardaki sorgular event loop'u bloklamaz (pyodbc URL'i aioodbc'ye çevrilir)
+_async_url = make_url(settings.database_url)
+if _async_url.drivername == "mssql+pyodbc":
+    _async_url = _async_url.set(drivername="mssql+aioodbc")
+
+async_engine = create_async_engine(
+    _async_url,
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    **_JSON_OPTIONS
+)
+
+# Commit sonrası nesneler expire edilmez (async'te lazy load yapılamaz)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -26,3 +56,9 @@ def get_db():
     finally:
         db.close()
 
+
+
+# Dependency to get async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,4 +1,8 @@
+import logging
+import logging.handlers
+import queue
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
 from .database import engine, Base
@@ -7,14 +11,29 @@ from .api import auth, meetings, audio, transcripts
 # Import all models to ensure they are registered with SQLAlchemy
 from .models import User, Meeting, Transcript, Summary
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Logging: kayıtlar kuyruğa atılır, stdout'a yazma işini ayrı listener thread'i yapar
+# (background worker'lar ve istek thread'leri log I/O'su için beklemez)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
+)
+_log_listener.start()
+
+# Tablolar start_server.py tarafından bir kez oluşturulur; her worker/reload açılışında
+# katalog sorgusu atılmaması için burada yalnızca açıkça istenirse çalışır
+if settings.auto_create_tables:
+    Base.metadata.create_all(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
     title="Meeting Transcript App",
     description="Whisper ve OpenAI ile toplantı transkript ve özetleme uygulaması",
-    version="1.0.0"
+    version="1.0.0",
+    # Uzun transkript listeleri stdlib json yerine orjson ile serialize edilir
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -33,6 +52,12 @@ app.include_router(audio.router, prefix="/api/audio", tags=["audio"])
 app.include_router(transcripts.router, prefix="/api", tags=["transcripts"])
 
 
+@app.on_event("shutdown")
+def stop_log_listener():
+    # Kuyrukta kalan kayıtları yazıp listener thread'ini durdur
+    _log_listener.stop()
+
+
 @app.get("/")
 async def root():
     return {"message": "Meeting Transcript App API", "version": "1.0.0"}
@@ -1,7 +1,7 @@
 from .user import User
 from .meeting import Meeting
 from .transcript import Transcript
-from .summary import Summary
+from .summary import Summary, SummaryCache
 
-__all__ = ["User", "Meeting", "Transcript", "Summary"]
+__all__ = ["User", "Meeting", "Transcript", "Summary", "SummaryCache"]
 
@@ -1,6 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Index, text, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from ..database import Base
 
 
@@ -10,7 +9,7 @@ class Meeting(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=True)
-    start_time = Column(DateTime, default=datetime.utcnow, nullable=False)
+    start_time = Column(DateTime, server_default=func.sysutcdatetime(), nullable=False)
     end_time = Column(DateTime, nullable=True)
     status = Column(String(50), default="recording", nullable=False)  # recording, processing, completed, paused
     whisper_model = Column(String(50), nullable=False)  # small, medium, large, pyannote, speechrecognition, elevenlabs, assemblyai
@@ -20,14 +19,26 @@ class Meeting(Base):
     pause_time = Column(DateTime, nullable=True)
     silence_duration = Column(Integer, default=0)  # Sessizlik süresi (saniye)
     # Pyannote Diarization settings
-    use_pyannote = Column(String(10), nullable=True)  # "true" or "false" or None
+    use_pyannote = Column(Boolean, nullable=True)
     diarization_profile = Column(String(50), nullable=True)  # auto, high_quality, podcast_interview, noisy_meeting, aggressive
     min_speakers = Column(Integer, nullable=True)
     max_speakers = Column(Integer, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.sysutcdatetime())
     
     # Relationships
     user = relationship("User", back_populates="meetings")
     transcripts = relationship("Transcript", back_populates="meeting", cascade="all, delete-orphan")
     summary = relationship("Summary", back_populates="meeting", uselist=False, cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Kullanıcı başına en fazla bir aktif (recording/paused) toplantı; SQL Server filtered index
+        Index(
+            "ix_meetings_one_active_per_user",
+            "user_id",
+            unique=True,
+            mssql_where=text("status IN ('recording', 'paused')"),
+        ),
+        # Toplantı listesi (user_id filtresi + created_at DESC keyset sayfalama)
+        Index("ix_meetings_user_id_created_at", "user_id", created_at.desc()),
+    )
 
@@ -1,6 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from ..database import Base
 
 
@@ -10,9 +9,20 @@ class Summary(Base):
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False, unique=True)
     summary_text = Column(String, nullable=False)
-    key_points = Column(String, nullable=True)  # JSON formatında
-    created_at = Column(DateTime, default=datetime.utcnow)
+    key_points = Column(JSON, nullable=True)  # Anahtar noktalar listesi
+    created_at = Column(DateTime, server_default=func.sysutcdatetime())
     
     # Relationships
     meeting = relationship("Meeting", back_populates="summary")
 
+
+
+class SummaryCache(Base):
+    """Aynı transkript için OpenAI çağrısını tekrarlamamak adına içerik hash'ine göre saklanan özetler"""
+    __tablename__ = "summary_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    digest = Column(String(64), nullable=False, unique=True, index=True)  # sha256(dil + transkript metni)
+    summary_text = Column(String, nullable=False)
+    key_points = Column(JSON, nullable=True)  # Anahtar noktalar listesi
+    created_at = Column(DateTime, server_default=func.sysutcdatetime())
@@ -1,6 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Index, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from ..database import Base
 
 
@@ -15,8 +14,13 @@ class Transcript(Base):
     end_time = Column(Float, nullable=False)
     speaker_id = Column(String, nullable=True)  # Konuşmacı kimliği (SPEAKER_00, SPEAKER_01 vb.)
     speaker_label = Column(String, nullable=True)  # Konuşmacı etiketi (İsim veya "Konuşmacı 1" vb.)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.sysutcdatetime())
     
     # Relationships
     meeting = relationship("Meeting", back_populates="transcripts")
+    
+    __table_args__ = (
+        # Toplantı transkripti (meeting_id filtresi + segment_number sıralaması) index üzerinden sıralı okunur
+        Index("ix_transcripts_meeting_seg", "meeting_id", "segment_number"),
+    )
 
@@ -1,5 +1,5 @@
 from .user import UserCreate, UserLogin, UserResponse, Token
-from .meeting import MeetingCreate, MeetingResponse, MeetingUpdate
+from .meeting import MeetingCreate, MeetingResponse, MeetingUpdate, MeetingListItem
 from .transcript import TranscriptResponse, TranscriptCreate
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     "MeetingCreate",
     "MeetingResponse",
     "MeetingUpdate",
+    "MeetingListItem",
     "TranscriptResponse",
     "TranscriptCreate",
 ]
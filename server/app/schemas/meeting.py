@@ -32,7 +32,7 @@ class MeetingResponse(BaseModel):
     language: str
     pause_time: Optional[datetime]
     silence_duration: int
-    use_pyannote: Optional[str] = None
+    use_pyannote: Optional[bool] = None
     diarization_profile: Optional[str] = None
     min_speakers: Optional[int] = None
     max_speakers: Optional[int] = None
@@ -41,3 +41,18 @@ class MeetingResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class MeetingListItem(BaseModel):
+    """Toplantı listesi için hafif yanıt (liste ekranının kullandığı alanlar)"""
+    id: int
+    title: Optional[str]
+    start_time: datetime
+    end_time: Optional[datetime]
+    status: str
+    whisper_model: str
+    language: str
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
@@ -14,9 +14,126 @@ KİŞİ AYRIMI (SPEAKER DIARIZATION):
 """
 import os
 import asyncio
-from typing import List, Dict, Optional
+import logging
+import operator
+import random
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, List, Dict, Literal, Optional, Union
+import httpx
+import numpy as np
 import assemblyai as aai
+from cachetools import TTLCache
 from ..config import settings
+from .audio_splitter import merge_chunk_segments, split_audio
+from .registry import get_transcript_cache_service
+
+logger = logging.getLogger(__name__)
+
+# Aynı ses içeriği + parametreler için son sonuçlar bellekte tutulur (disk cache'in önünde)
+_result_cache = TTLCache(maxsize=512, ttl=24 * 60 * 60)
+# Yüklenen dosyaların AssemblyAI upload URL'leri (içerik hash'i -> URL)
+_upload_urls = TTLCache(maxsize=512, ttl=60 * 60)
+_result_cache_lock = threading.Lock()
+
+# AssemblyAI/pyannote konuşmacı önekleri ("SPEAKER_00", "speaker_0")
+_SPEAKER_PREFIX_RE = re.compile(r'^(?:SPEAKER_|speaker_)(.*)$', re.DOTALL)
+
+# Yükleme yapılmadan doğrudan AssemblyAI'a verilebilen kaynaklar
+_REMOTE_PREFIXES = ("http://", "https://")
+
+# Aynı anda en fazla bu kadar SDK çağrısı yapılır (upload + polling thread'i bloklar)
+MAX_CONCURRENT_TRANSCRIPTIONS = 8
+_transcribe_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_TRANSCRIPTIONS, thread_name_prefix="assemblyai"
+)
+# Executor kuyruğunda bekleyen işler de sınırlansın diye çağrılar önce semaphore'dan geçer
+_transcribe_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+
+# Geçici hatalarda tekrar deneme bekleme üst sınırları (saniye); yalnızca ağ hataları ve
+# HTTP 429/5xx tekrar denenir. 4xx (ör. geçersiz API key, bozuk ses) ve transkript "error"
+# durumu kalıcı kabul edilip hemen yükseltilir
+TRANSCRIBE_RETRY_DELAYS = (1.0, 5.0, 15.0)
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Hata tekrar denemeye değer mi (ağ hatası veya HTTP 429/5xx)"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, aai.TranscriptError):
+        # SDK HTTP durum kodunu exception üzerinde taşır; kod yoksa kalıcı kabul edilir
+        status_code = getattr(error, "status_code", None)
+        return status_code is not None and (status_code == 429 or status_code >= 500)
+    return False
+
+# chunk_large_files açıkken bu boyuttan büyük dosyalar yaklaşık CHUNK_SECONDS'lik parçalara
+# bölünüp paralel gönderilir
+CHUNKED_TRANSCRIBE_MIN_BYTES = 50 * 1024 * 1024
+CHUNK_SECONDS = 30 * 60
+
+# Toplu transkriptte gönderilen işlerin durumunu sorgulama aralığı
+BATCH_POLL_INTERVAL_SECONDS = 3.0
+
+# Cache anahtarı -> devam eden transkriptin sonucu; servis çağrıları tek worker loop'ta
+# çalıştığından yalnızca o loop'tan erişilir
+_in_flight: Dict[str, asyncio.Future] = {}
+
+# SDK utterance/word nesnelerinden (text, start, end, speaker) tek çağrıda okunur
+_sdk_fields = operator.attrgetter('text', 'start', 'end', 'speaker')
+
+
+def _dict_fields(item: dict):
+    return (
+        item.get('text', ''),
+        item.get('start', 0),
+        item.get('end', 0),
+        item.get('speaker') or item.get('speaker_label')
+    )
+
+
+def _is_remote_source(audio_path) -> bool:
+    return isinstance(audio_path, str) and audio_path.startswith(_REMOTE_PREFIXES)
+
+
+def _segments_to_columns(segments: List[Dict]) -> Dict[str, Any]:
+    """Segment listesini sütun bazlı dict'e çevir (zaman damgaları float64 dizisi)"""
+    count = len(segments)
+    return {
+        'text': [segment['text'] for segment in segments],
+        'start': np.fromiter((segment['start'] for segment in segments), dtype=np.float64, count=count),
+        'end': np.fromiter((segment['end'] for segment in segments), dtype=np.float64, count=count),
+        'speaker_id': [segment['speaker_id'] for segment in segments],
+        'speaker_label': [segment['speaker_label'] for segment in segments],
+    }
+
+
+def _fields_getter(sample):
+    """Listedeki öğelerin tipine göre (text, start, end, speaker) getter'ı seç
+
+    Bir listedeki öğeler aynı tiptedir; tip kontrolü öğe başına değil bir kez yapılır.
+    """
+    return _dict_fields if isinstance(sample, dict) else _sdk_fields
+
+
+def _assign_speakers_from_segments(segments: List[Dict], speaker_segments: List[Dict]):
+    """Segmenti tamamen kapsayan harici konuşmacı segmentinin konuşmacısını ata (yerinde)"""
+    # Başlangıca göre sıralı listede, segmentten önce başlayan son konuşmacı segmenti aday olur
+    sorted_speaker_segments = sorted(speaker_segments, key=lambda seg: seg["start"])
+    speaker_starts = [seg["start"] for seg in sorted_speaker_segments]
+    for segment in segments:
+        index = bisect_right(speaker_starts, segment["start"]) - 1
+        if index < 0:
+            continue
+        speaker_seg = sorted_speaker_segments[index]
+        if segment["end"] <= speaker_seg["end"]:
+            segment["speaker_id"] = speaker_seg.get("speaker_id")
+            segment["speaker_label"] = speaker_seg.get("speaker_label")
 
 
 class AssemblyAIService:
@@ -31,7 +148,10 @@ class AssemblyAIService:
         
         # AssemblyAI API key'i ayarla
         aai.settings.api_key = self.api_key
-        print(f"✅ AssemblyAI client oluşturuldu")
+        # Transcriber HTTP bağlantı havuzunu tutar; her istekte yeniden oluşturulmaz,
+        # istek ayarları çağrı başına config ile verilir
+        self._transcriber = aai.Transcriber()
+        logger.info("AssemblyAI client oluşturuldu")
     
     async def transcribe_audio(
         self,
@@ -39,30 +159,68 @@ class AssemblyAIService:
         model_name: str = "assemblyai",
         language: str = "tr",
         enable_speaker_diarization: bool = True,
-        speaker_segments: Optional[List[Dict]] = None
-    ) -> List[Dict]:
+        speaker_segments: Optional[List[Dict]] = None,
+        upload_then_transcribe: bool = True,
+        return_format: Literal["list", "columns"] = "list",
+        chunk_large_files: bool = False
+    ) -> Union[List[Dict], Dict[str, Any]]:
         """
         Ses dosyasını AssemblyAI SDK kullanarak transkript et
         
         Args:
-            audio_path: İşlenecek ses dosyası yolu
+            audio_path: İşlenecek ses dosyası yolu veya http(s) URL'i (URL ise yükleme yapılmaz)
             model_name: Model adı (assemblyai)
             language: Dil kodu (tr, en) - AssemblyAI otomatik algılar
             enable_speaker_diarization: Kişi ayrımı aktif mi
             speaker_segments: Önceden hesaplanmış konuşmacı segmentleri (opsiyonel)
+            upload_then_transcribe: Yerel dosyayı önce yükleyip URL'ini sakla; aynı içerik
+                tekrar gönderildiğinde (farklı dil, tekrar deneme) yeniden yüklenmez
+            return_format: "list" segment dict listesi, "columns" sütun bazlı dict döndürür
+                (start/end float64 NumPy dizisi; pandas/pyarrow'a kopyasız aktarılabilir)
+            chunk_large_files: CHUNKED_TRANSCRIBE_MIN_BYTES'tan büyük dosyaları parçalara bölüp
+                paralel gönder. AssemblyAI konuşmacıları parça başına etiketlediğinden
+                speaker_segments verilmezse konuşmacılar parçalar arasında eşleştirilmez
         
         Returns:
-            Transkript segmentleri listesi (speaker bilgisi ile)
+            Transkript segmentleri listesi (speaker bilgisi ile) veya sütun bazlı dict
         """
-        if not os.path.exists(audio_path):
+        segments = await self._transcribe_segments(
+            audio_path, model_name, language, enable_speaker_diarization,
+            speaker_segments, upload_then_transcribe, chunk_large_files
+        )
+        if return_format == "columns":
+            return _segments_to_columns(segments)
+        return segments
+    
+    async def _transcribe_segments(
+        self,
+        audio_path: str,
+        model_name: str,
+        language: str,
+        enable_speaker_diarization: bool,
+        speaker_segments: Optional[List[Dict]],
+        upload_then_transcribe: bool,
+        chunk_large_files: bool
+    ) -> List[Dict]:
+        """Cache, eşzamanlı istek birleştirme ve uzak kaynak kontrolüyle segment listesini üret"""
+        # Uzak kaynak (ör. pre-signed S3 URL'i) doğrudan AssemblyAI'a verilir; içerik hash'i hesaplanamaz
+        if _is_remote_source(audio_path):
+            logger.info("AssemblyAI: Uzak kaynak transkript ediliyor (yükleme yok)")
+            return await self._transcribe_uncached(
+                audio_path, None, None, language, enable_speaker_diarization, speaker_segments, False, False
+            )
+        
+        # Dosya bilgilerini tek stat çağrısıyla al (varlık + boyut + cache anahtarı için mtime)
+        try:
+            file_stat = os.stat(audio_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Ses dosyası bulunamadı: {audio_path}")
         
-        # Dosya bilgilerini kontrol et
-        file_size = os.path.getsize(audio_path)
-        print(f"📊 AssemblyAI: Dosya boyutu: {file_size} bytes ({file_size / 1024:.2f} KB)")
+        file_size = file_stat.st_size
+        logger.info("AssemblyAI: Dosya boyutu: %d bytes (%.2f KB)", file_size, file_size / 1024)
         
         if file_size < 1000:  # 1KB'dan küçükse
-            print("⚠️  AssemblyAI: Dosya çok küçük, muhtemelen boş")
+            logger.warning("AssemblyAI: Dosya çok küçük, muhtemelen boş")
             return [{
                 "text": "",
                 "start": 0.0,
@@ -71,78 +229,285 @@ class AssemblyAIService:
                 "speaker_label": None
             }]
         
-        print(f"🌐 AssemblyAI: Dil: {language} (otomatik algılama)")
+        logger.info("AssemblyAI: Dil: %s (otomatik algılama)", language)
+        
+        # Aynı içerik daha önce transkript edildiyse yükleme ve API çağrısı yapılmaz
+        transcript_cache = get_transcript_cache_service()
+        cache_key = await asyncio.to_thread(
+            transcript_cache.make_key,
+            audio_path,
+            model_name,
+            file_stat=file_stat,
+            language=language,
+            speaker_diarization=enable_speaker_diarization,
+            speaker_segments=speaker_segments,
+            # Parçalı sonuç konuşmacı etiketlerinde farklıdır; mevcut anahtarlar değişmesin diye yalnızca açıkken eklenir
+            **({"chunked": True} if chunk_large_files else {})
+        )
+        with _result_cache_lock:
+            cached_segments = _result_cache.get(cache_key)
+        if cached_segments is None:
+            cached_segments = await asyncio.to_thread(transcript_cache.get, cache_key)
+        if cached_segments is not None:
+            logger.info("AssemblyAI: Transkript cache'ten alındı (%d segment)", len(cached_segments))
+            with _result_cache_lock:
+                _result_cache[cache_key] = cached_segments
+            # Çağıran segmentleri değiştirebilir; cache'teki liste etkilenmesin
+            return [dict(segment) for segment in cached_segments]
         
+        # Aynı içerik zaten işleniyorsa (ör. istemci tekrar denedi) ikinci kez yüklenmez, sonucu beklenir
+        pending = _in_flight.get(cache_key)
+        if pending is not None:
+            logger.info("AssemblyAI: Aynı dosya zaten işleniyor, sonucu bekleniyor: %s", audio_path)
+            segments = await asyncio.shield(pending)
+            return [dict(segment) for segment in segments]
+        
+        pending = asyncio.get_running_loop().create_future()
+        _in_flight[cache_key] = pending
         try:
-            # TranscriptionConfig oluştur
-            print(f"📂 AssemblyAI: Ses dosyası okunuyor: {audio_path}")
-            print(f"📋 AssemblyAI: Speaker Diarization: {enable_speaker_diarization}")
-            
-            config = aai.TranscriptionConfig(
-                speech_model=aai.SpeechModel.best,  # En iyi kalite için 'best' modeli
-                speaker_labels=enable_speaker_diarization,  # Kişi ayrımı
-                language_code=language if language in ["tr", "en"] else None,  # Otomatik algılama için None
-                punctuate=True,  # Noktalama işaretleri ekle
-                format_text=True,  # Metni formatla (büyük harf, vb.)
-                language_detection=True,  # Otomatik dil algılama
-                # Türkçe için özel ayarlar
-                speech_threshold=0.5,  # Konuşma algılama eşiği (0.0-1.0, düşük = daha hassas)
+            segments = await self._transcribe_uncached(
+                audio_path, cache_key, file_stat, language, enable_speaker_diarization,
+                speaker_segments, upload_then_transcribe, chunk_large_files
             )
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            # Bekleyen yoksa "exception was never retrieved" uyarısı çıkmasın
+            pending.exception()
+            raise
+        else:
+            pending.set_result(segments)
+        finally:
+            _in_flight.pop(cache_key, None)
+        
+        return segments
+    
+    async def _transcribe_uncached(
+        self,
+        audio_path: str,
+        cache_key: Optional[str],
+        file_stat: Optional[os.stat_result],
+        language: str,
+        enable_speaker_diarization: bool,
+        speaker_segments: Optional[List[Dict]],
+        upload_then_transcribe: bool,
+        chunk_large_files: bool
+    ) -> List[Dict]:
+        """Dosyayı AssemblyAI'a gönder, sonucu işle ve cache'e yaz (cache_key None ise yazılmaz)"""
+        transcript_cache = get_transcript_cache_service()
+        try:
+            logger.info("AssemblyAI: Ses dosyası okunuyor: %s (speaker diarization: %s)", audio_path, enable_speaker_diarization)
+            
+            # İstenirse büyük dosyalar sessizlik noktalarından bölünüp parçalar paralel transkript edilir
+            segments = None
+            if chunk_large_files and file_stat is not None and file_stat.st_size > CHUNKED_TRANSCRIBE_MIN_BYTES:
+                segments = await self._transcribe_chunked(
+                    audio_path, language, enable_speaker_diarization, speaker_segments
+                )
+            if segments is None:
+                segments = await self._transcribe_single(
+                    audio_path, file_stat, language, enable_speaker_diarization,
+                    speaker_segments, upload_then_transcribe
+                )
             
-            # SDK metodunu async executor'da çalıştır
-            def _transcribe():
-                transcriber = aai.Transcriber(config=config)
-                return transcriber.transcribe(audio_path)
+            if cache_key is not None:
+                with _result_cache_lock:
+                    _result_cache[cache_key] = [dict(segment) for segment in segments]
+                await asyncio.to_thread(transcript_cache.set, cache_key, segments)
             
-            # Senkron SDK metodunu async executor'da çalıştır
+            return segments
+        
+        except Exception as e:
+            error_msg = f"AssemblyAI işleme hatası: {e}"
+            logger.exception(error_msg)
+            raise RuntimeError(error_msg)
+    
+    async def _transcribe_single(
+        self,
+        audio_path: str,
+        file_stat: Optional[os.stat_result],
+        language: str,
+        enable_speaker_diarization: bool,
+        speaker_segments: Optional[List[Dict]],
+        upload_then_transcribe: bool
+    ) -> List[Dict]:
+        """Dosyayı tek AssemblyAI işi olarak transkript et"""
+        transcript_cache = get_transcript_cache_service()
+        config = self._build_config(language, enable_speaker_diarization)
+        
+        # Aynı içerik daha önce yüklendiyse URL'i tekrar kullanılır
+        upload_key = None
+        if upload_then_transcribe:
+            upload_key = await asyncio.to_thread(
+                transcript_cache.make_key, audio_path, "assemblyai-upload", file_stat=file_stat
+            )
+        
+        # SDK metodunu async executor'da çalıştır
+        def _transcribe():
+            transcriber = self._transcriber
+            source = audio_path
+            if upload_key is not None:
+                # Tekrar denemede yükleme başarılı olduysa dosya yeniden yüklenmez
+                with _result_cache_lock:
+                    source = _upload_urls.get(upload_key)
+                if source is None:
+                    source = transcriber.upload_file(audio_path)
+                    with _result_cache_lock:
+                        _upload_urls[upload_key] = source
+            return transcriber.transcribe(source, config=config)
+        
+        # Senkron SDK metodunu paylaşılan, sınırlı executor'da çalıştır;
+        # ağ/HTTP hataları geçici kabul edilip artan aralıklarla tekrar denenir
+        for attempt, retry_delay in enumerate((*TRANSCRIBE_RETRY_DELAYS, None), start=1):
+            try:
+                async with _transcribe_semaphore:
+                    transcript = await asyncio.get_running_loop().run_in_executor(
+                        _transcribe_executor, _transcribe
+                    )
+                break
+            except (httpx.TransportError, aai.TranscriptError) as e:
+                if retry_delay is None or not _is_transient_error(e):
+                    raise
+                # Full jitter: aynı anda başarısız olan istekler aynı anda tekrar denemesin
+                sleep_seconds = random.uniform(0, retry_delay)
+                logger.warning(
+                    "AssemblyAI geçici hata (deneme %d): %s - %.1f sn sonra tekrar denenecek",
+                    attempt, e, sleep_seconds
+                )
+                await asyncio.sleep(sleep_seconds)
+        
+        # Hata kontrolü
+        if transcript.status == "error":
+            error_msg = f"AssemblyAI transcription failed: {transcript.error}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+        
+        logger.info("AssemblyAI: Transkript alındı (status: %s)", transcript.status)
+        
+        logger.debug(
+            "AssemblyAI yanıtı: utterances=%d words=%d",
+            len(getattr(transcript, 'utterances', None) or ()),
+            len(getattr(transcript, 'words', None) or ())
+        )
+        
+        # API yanıtını işle
+        return self._process_api_response(
+            transcript,
+            enable_speaker_diarization,
+            speaker_segments
+        )
+    
+    async def _transcribe_chunked(
+        self,
+        audio_path: str,
+        language: str,
+        enable_speaker_diarization: bool,
+        speaker_segments: Optional[List[Dict]] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Büyük dosyayı sessizlik noktalarından parçalara bölüp parçaları toplu transkript et
+        
+        Parça zaman damgaları orijinal dosyaya göre kaydırılır. AssemblyAI konuşmacı etiketlerini
+        her parçada ayrı verdiğinden konuşmacılar parça numarasıyla ayrıştırılır; tüm dosya için
+        hesaplanmış speaker_segments verildiyse konuşmacılar onlardan atanır.
+        Dosya bölünemezse (FFmpeg yok, tek parça) None döner ve tek iş olarak işlenir.
+        """
+        chunk_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix="assemblyai_chunks_")
+        try:
             try:
-                transcript = await asyncio.to_thread(_transcribe)
-            except AttributeError:
-                # Python < 3.9 için alternatif
-                loop = asyncio.get_event_loop()
-                transcript = await loop.run_in_executor(None, _transcribe)
+                chunks = await asyncio.to_thread(
+                    split_audio, audio_path, chunk_dir, CHUNK_SECONDS
+                )
+            except (OSError, ValueError, subprocess.CalledProcessError) as e:
+                logger.warning("AssemblyAI: Dosya parçalara bölünemedi, tek parça gönderiliyor: %s", e)
+                return None
+            if len(chunks) <= 1:
+                return None
             
-            # Hata kontrolü
-            if transcript.status == "error":
-                error_msg = f"AssemblyAI transcription failed: {transcript.error}"
-                print(f"❌ {error_msg}")
-                raise RuntimeError(error_msg)
+            logger.info("AssemblyAI: Dosya %d parçaya bölündü", len(chunks))
+            results = await self.transcribe_audio_batch(
+                [chunk_path for chunk_path, _ in chunks],
+                language=language,
+                enable_speaker_diarization=enable_speaker_diarization
+            )
+            
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            segments = merge_chunk_segments(results, [offset for _, offset in chunks])
+            
+            # Harici konuşmacı segmentleri tüm dosyanın zaman ekseninde olduğundan parçalar arasında tutarlıdır
+            if enable_speaker_diarization and speaker_segments:
+                # Kapsanmayan segmentlerde parçaya özgü etiket kalmasın; karışık etiket yerine boş bırakılır
+                for segment in segments:
+                    segment['speaker_id'] = None
+                    segment['speaker_label'] = None
+                _assign_speakers_from_segments(segments, speaker_segments)
+            return segments
+        finally:
+            await asyncio.to_thread(shutil.rmtree, chunk_dir, True)
+    
+    async def transcribe_audio_batch(
+        self,
+        audio_paths: List[str],
+        model_name: str = "assemblyai",
+        language: str = "tr",
+        enable_speaker_diarization: bool = True
+    ) -> List[Union[List[Dict], BaseException]]:
+        """
+        Birden fazla ses dosyasını tek seferde transkript et
+        
+        Önce tüm dosyalar yüklenip işe gönderilir, ardından sonuçlar event loop üzerinde
+        sorgulanır; böylece bir dosyanın yüklemesi diğerlerinin sunucu tarafı işlemesiyle
+        örtüşür ve bekleme sırasında executor thread'i tutulmaz.
+        
+        Returns:
+            Dosya sırasıyla segment listeleri; hata alan dosyanın yerinde exception döner
+        """
+        config = self._build_config(language, enable_speaker_diarization)
+        loop = asyncio.get_running_loop()
+        
+        async def _transcribe_one(audio_path: str) -> List[Dict]:
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Ses dosyası bulunamadı: {audio_path}")
             
-            print(f"✅ AssemblyAI: Transkript alındı (Status: {transcript.status})")
+            # Yükleme + iş gönderimi bloklayıcıdır; tekli çağrılarla aynı sınırı paylaşır
+            async with _transcribe_semaphore:
+                transcript = await loop.run_in_executor(
+                    _transcribe_executor, self._transcriber.submit, audio_path, config
+                )
             
-            # Debug: Transcript objesinin yapısını kontrol et
-            print(f"🔍 Debug: Transcript objesi tipi: {type(transcript)}")
-            print(f"🔍 Debug: Transcript attributes: {dir(transcript)}")
-            print(f"🔍 Debug: Has utterances: {hasattr(transcript, 'utterances')}")
-            if hasattr(transcript, 'utterances'):
-                print(f"🔍 Debug: Utterances var mı: {transcript.utterances is not None}")
-                print(f"🔍 Debug: Utterances tipi: {type(transcript.utterances)}")
-                if transcript.utterances:
-                    print(f"🔍 Debug: Utterances sayısı: {len(transcript.utterances)}")
-                    if len(transcript.utterances) > 0:
-                        print(f"🔍 Debug: İlk utterance: {transcript.utterances[0]}")
-                        print(f"🔍 Debug: İlk utterance attributes: {dir(transcript.utterances[0]) if hasattr(transcript.utterances[0], '__dict__') else 'N/A'}")
-            print(f"🔍 Debug: Has words: {hasattr(transcript, 'words')}")
-            if hasattr(transcript, 'words') and transcript.words:
-                print(f"🔍 Debug: Words sayısı: {len(transcript.words)}")
-                if len(transcript.words) > 0:
-                    print(f"🔍 Debug: İlk word: {transcript.words[0]}")
+            while transcript.status not in (aai.TranscriptStatus.completed, aai.TranscriptStatus.error):
+                await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+                transcript = await loop.run_in_executor(
+                    _transcribe_executor, aai.Transcript.get_by_id, transcript.id
+                )
             
-            # API yanıtını işle
-            segments = self._process_api_response(
-                transcript,
-                enable_speaker_diarization,
-                speaker_segments
-            )
+            if transcript.status == aai.TranscriptStatus.error:
+                raise RuntimeError(f"AssemblyAI transcription failed ({audio_path}): {transcript.error}")
             
-            return segments
+            return self._process_api_response(transcript, enable_speaker_diarization)
         
-        except Exception as e:
-            error_msg = f"AssemblyAI işleme hatası: {e}"
-            print(f"❌ {error_msg}")
-            import traceback
-            traceback.print_exc()
-            raise RuntimeError(error_msg)
+        logger.info("AssemblyAI: %d dosya toplu transkript ediliyor", len(audio_paths))
+        return await asyncio.gather(
+            *(_transcribe_one(audio_path) for audio_path in audio_paths),
+            return_exceptions=True
+        )
+    
+    def _build_config(self, language: str, enable_speaker_diarization: bool) -> aai.TranscriptionConfig:
+        """Transkript isteği için TranscriptionConfig oluştur"""
+        return aai.TranscriptionConfig(
+            speech_model=aai.SpeechModel.best,  # En iyi kalite için 'best' modeli
+            speaker_labels=enable_speaker_diarization,  # Kişi ayrımı
+            language_code=language if language in ["tr", "en"] else None,  # Otomatik algılama için None
+            punctuate=True,  # Noktalama işaretleri ekle
+            format_text=True,  # Metni formatla (büyük harf, vb.)
+            language_detection=True,  # Otomatik dil algılama
+            # Türkçe için özel ayarlar
+            speech_threshold=0.5,  # Konuşma algılama eşiği (0.0-1.0, düşük = daha hassas)
+        )
     
     def _process_api_response(
         self,
@@ -162,20 +527,14 @@ class AssemblyAIService:
         
         # Utterances varsa (speaker diarization aktifse) onları kullan
         if enable_speaker_diarization and hasattr(transcript, 'utterances') and transcript.utterances:
-            print(f"🎤 AssemblyAI: {len(transcript.utterances)} utterance bulundu")
-            for utterance in transcript.utterances:
-                # Utterance'dan bilgileri al (dict veya obje olabilir)
-                if isinstance(utterance, dict):
-                    utterance_text = utterance.get('text', '')
-                    utterance_start = utterance.get('start', 0)
-                    utterance_end = utterance.get('end', 0)
-                    utterance_speaker = utterance.get('speaker', None)
-                else:
-                    utterance_text = getattr(utterance, 'text', '')
-                    utterance_start = getattr(utterance, 'start', 0)
-                    utterance_end = getattr(utterance, 'end', 0)
-                    # Speaker bilgisi farklı attribute'larda olabilir
-                    utterance_speaker = getattr(utterance, 'speaker', None) or getattr(utterance, 'speaker_label', None)
+            logger.info("AssemblyAI: %d utterance bulundu", len(transcript.utterances))
+            # Utterance'lar dict veya SDK objesi olabilir
+            utterance_fields = _fields_getter(transcript.utterances[0])
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            # Her utterance tam olarak bir segment üretir; liste baştan boyutlandırılır
+            segments = [None] * len(transcript.utterances)
+            for index, utterance in enumerate(transcript.utterances):
+                utterance_text, utterance_start, utterance_end, utterance_speaker = utterance_fields(utterance)
                 
                 # AssemblyAI utterances için zaman damgaları genelde saniye cinsindendir (milisaniye değil)
                 # Ama 100000'den büyükse milisaniye olabilir
@@ -190,45 +549,30 @@ class AssemblyAIService:
                     end_sec = utterance_end
                 
                 # Speaker ID'yi düzenle - AssemblyAI "A", "B" veya "SPEAKER_00", "SPEAKER_01" formatında olabilir
-                if utterance_speaker is not None:
-                    speaker_str = str(utterance_speaker)
-                    # Eğer "A", "B" gibi harf formatındaysa
-                    if len(speaker_str) == 1 and speaker_str.isalpha():
-                        speaker_id = f"speaker_{ord(speaker_str) - ord('A')}"
-                    # Eğer "SPEAKER_00" formatındaysa
-                    elif speaker_str.startswith('SPEAKER_'):
-                        speaker_num = speaker_str.replace('SPEAKER_', '').strip()
-                        speaker_id = f"speaker_{speaker_num}"
-                    # Eğer zaten "speaker_" ile başlıyorsa
-                    elif speaker_str.startswith('speaker_'):
-                        speaker_id = speaker_str
-                    # Diğer durumlar
-                    else:
-                        speaker_id = f"speaker_{speaker_str}"
-                else:
-                    speaker_id = None
+                speaker_id = self._normalize_speaker_id(utterance_speaker)
                 
-                print(f"🔍 Debug utterance: text='{utterance_text[:50]}...', start={start_sec}, end={end_sec}, speaker={utterance_speaker}, speaker_id={speaker_id}")
+                if debug_enabled:
+                    logger.debug(
+                        "Utterance: text='%.50s...', start=%s, end=%s, speaker=%s, speaker_id=%s",
+                        utterance_text, start_sec, end_sec, utterance_speaker, speaker_id
+                    )
                 
-                segments.append({
+                segments[index] = {
                     'text': utterance_text,
                     'start': start_sec,
                     'end': end_sec,
                     'speaker_id': speaker_id,
                     'speaker_label': self._get_speaker_label(speaker_id) if speaker_id else None
-                })
+                }
         # Utterances yoksa ama words varsa, words'den segment oluştur (speaker bilgisi ile)
         elif hasattr(transcript, 'words') and transcript.words:
-            print(f"📝 AssemblyAI: Words'den segment oluşturuluyor ({len(transcript.words)} kelime)")
+            logger.info("AssemblyAI: Words'den segment oluşturuluyor (%d kelime)", len(transcript.words))
             # Kelimeleri zaman damgasına göre sırala
             words_list = list(transcript.words)
-            
-            def get_word_start(w):
-                if isinstance(w, dict):
-                    return w.get('start', 0)
-                return getattr(w, 'start', 0)
-            
-            words_list.sort(key=get_word_start)
+            if isinstance(words_list[0], dict):
+                words_list.sort(key=lambda w: w.get('start', 0))
+            else:
+                words_list.sort(key=operator.attrgetter('start'))
             
             if not words_list:
                 # Eğer kelime yoksa ama text varsa, tek segment oluştur
@@ -253,76 +597,39 @@ class AssemblyAIService:
             
             # Eğer words'de speaker bilgisi varsa, speaker'a göre grupla
             if enable_speaker_diarization and has_speaker_in_words:
-                print(f"🎤 AssemblyAI: Words'de speaker bilgisi bulundu, gruplandırılıyor...")
-                current_speaker = None
-                current_text = []
-                current_start = 0.0
-                current_end = 0.0
+                logger.info("AssemblyAI: Words'de speaker bilgisi bulundu, gruplandırılıyor")
+                word_fields = _fields_getter(first_word)
+                word_count = len(words_list)
+                texts, raw_starts, raw_ends, raw_speakers = zip(*map(word_fields, words_list))
+                
+                # Zaman damgalarını tek geçişte saniyeye çevir (100000'den büyükse milisaniye)
+                starts = np.fromiter(raw_starts, dtype=np.float64, count=word_count)
+                ends = np.fromiter(raw_ends, dtype=np.float64, count=word_count)
+                starts = np.where(starts > 100000, starts / 1000.0, starts).tolist()
+                ends = np.where(ends > 100000, ends / 1000.0, ends).tolist()
                 
-                for word in words_list:
-                    # Word'dan bilgileri al
-                    if isinstance(word, dict):
-                        word_text = word.get('text', '')
-                        word_start = word.get('start', 0)
-                        word_end = word.get('end', 0)
-                        word_speaker = word.get('speaker') or word.get('speaker_label')
-                    else:
-                        word_text = getattr(word, 'text', '')
-                        word_start = getattr(word, 'start', 0)
-                        word_end = getattr(word, 'end', 0)
-                        word_speaker = getattr(word, 'speaker', None) or getattr(word, 'speaker_label', None)
-                    
-                    # Zaman damgalarını saniyeye çevir (gerekirse)
-                    if word_start > 100000:
-                        word_start = word_start / 1000.0
-                    if word_end > 100000:
-                        word_end = word_end / 1000.0
-                    
-                    # Speaker ID'yi düzenle
-                    if word_speaker is not None:
-                        speaker_str = str(word_speaker)
-                        if len(speaker_str) == 1 and speaker_str.isalpha():
-                            speaker_id = f"speaker_{ord(speaker_str) - ord('A')}"
-                        elif speaker_str.startswith('SPEAKER_'):
-                            speaker_num = speaker_str.replace('SPEAKER_', '').strip()
-                            speaker_id = f"speaker_{speaker_num}"
-                        elif speaker_str.startswith('speaker_'):
-                            speaker_id = speaker_str
-                        else:
-                            speaker_id = f"speaker_{speaker_str}"
-                    else:
-                        speaker_id = None
-                    
-                    # Speaker değişti mi?
-                    if speaker_id != current_speaker:
-                        # Önceki speaker'ın segmentini kaydet
-                        if current_text:
-                            segments.append({
-                                'text': ' '.join(current_text),
-                                'start': current_start,
-                                'end': current_end,
-                                'speaker_id': current_speaker,
-                                'speaker_label': self._get_speaker_label(current_speaker) if current_speaker else None
-                            })
-                        # Yeni speaker başlat
-                        current_speaker = speaker_id
-                        current_text = [word_text] if word_text else []
-                        current_start = word_start
-                        current_end = word_end
-                    else:
-                        # Aynı speaker devam ediyor
-                        if word_text:
-                            current_text.append(word_text)
-                        current_end = word_end
+                # Speaker ID'leri tam sayı kodlara çevir; konuşmacı değişimleri bu kodlardan bulunur
+                speaker_ids = [self._normalize_speaker_id(raw) for raw in raw_speakers]
+                speaker_codes: Dict[Optional[str], int] = {}
+                codes = np.fromiter(
+                    (speaker_codes.setdefault(speaker_id, len(speaker_codes)) for speaker_id in speaker_ids),
+                    dtype=np.int64,
+                    count=word_count
+                )
+                boundaries = [0, *(np.flatnonzero(codes[1:] != codes[:-1]) + 1).tolist(), word_count]
                 
-                # Son segmenti ekle
-                if current_text:
+                # Yalnızca konuşmacı değişim noktaları üzerinde dön
+                for run_start, run_end in zip(boundaries, boundaries[1:]):
+                    run_text = [text for text in texts[run_start:run_end] if text]
+                    if not run_text:
+                        continue
+                    speaker_id = speaker_ids[run_start]
                     segments.append({
-                        'text': ' '.join(current_text),
-                        'start': current_start,
-                        'end': current_end,
-                        'speaker_id': current_speaker,
-                        'speaker_label': self._get_speaker_label(current_speaker) if current_speaker else None
+                        'text': ' '.join(run_text),
+                        'start': starts[run_start],
+                        'end': ends[run_end - 1],
+                        'speaker_id': speaker_id,
+                        'speaker_label': self._get_speaker_label(speaker_id) if speaker_id else None
                     })
             else:
                 # Speaker bilgisi yok, tüm kelimeleri birleştir
@@ -330,23 +637,16 @@ class AssemblyAIService:
                 last_word = words_list[-1]
                 
                 # Zaman damgalarını al
-                if isinstance(first_word, dict):
-                    first_start = first_word.get('start', 0)
-                    last_end = last_word.get('end', 0)
-                else:
-                    first_start = getattr(first_word, 'start', 0)
-                    last_end = getattr(last_word, 'end', 0)
+                word_fields = _fields_getter(first_word)
+                first_start = word_fields(first_word)[1]
+                last_end = word_fields(last_word)[2]
                 
                 # Milisaniye ise saniyeye çevir
                 start_time = first_start / 1000.0 if first_start > 100000 else first_start
                 end_time = last_end / 1000.0 if last_end > 100000 else (last_end if last_end > 0 else start_time + 1.0)
                 
                 # Tüm kelimeleri birleştir
-                text_parts = []
-                for word in words_list:
-                    word_text = word.get('text', '') if isinstance(word, dict) else getattr(word, 'text', '')
-                    if word_text:
-                        text_parts.append(word_text)
+                text_parts = [text for text, _, _, _ in map(word_fields, words_list) if text]
                 
                 transcript_text = transcript.text if hasattr(transcript, 'text') else ""
                 full_text = ' '.join(text_parts) if text_parts else transcript_text
@@ -360,7 +660,7 @@ class AssemblyAIService:
                 })
         # Hiçbiri yoksa ama text varsa
         elif hasattr(transcript, 'text') and transcript.text:
-            print(f"📄 AssemblyAI: Tek metin segmenti oluşturuluyor")
+            logger.info("AssemblyAI: Tek metin segmenti oluşturuluyor")
             segments.append({
                 'text': transcript.text,
                 'start': 0.0,
@@ -369,19 +669,13 @@ class AssemblyAIService:
                 'speaker_label': None
             })
         else:
-            print("⚠️  AssemblyAI: Hiç transkript verisi bulunamadı")
+            logger.warning("AssemblyAI: Hiç transkript verisi bulunamadı")
             return []
         
         # Eğer speaker_segments varsa ve API'den speaker bilgisi gelmemişse, eşleştir
         if enable_speaker_diarization and speaker_segments and not any(seg.get("speaker_id") for seg in segments):
-            print("🔄 AssemblyAI: Harici speaker diarization sonuçları ile eşleştiriliyor...")
-            for segment in segments:
-                for speaker_seg in speaker_segments:
-                    if (segment["start"] >= speaker_seg["start"] and 
-                        segment["end"] <= speaker_seg["end"]):
-                        segment["speaker_id"] = speaker_seg.get("speaker_id")
-                        segment["speaker_label"] = speaker_seg.get("speaker_label")
-                        break
+            logger.info("AssemblyAI: Harici speaker diarization sonuçları ile eşleştiriliyor")
+            _assign_speakers_from_segments(segments, speaker_segments)
         
         # Speaker bilgisi yoksa ve diarization aktifse, label'ları oluştur
         if enable_speaker_diarization:
@@ -389,10 +683,33 @@ class AssemblyAIService:
                 if segment.get("speaker_id") and not segment.get("speaker_label"):
                     segment["speaker_label"] = self._get_speaker_label(segment["speaker_id"])
         
-        print(f"✅ AssemblyAI: {len(segments)} transkript segmenti oluşturuldu")
+        logger.info("AssemblyAI: %d transkript segmenti oluşturuldu", len(segments))
         return segments
     
-    def _get_speaker_label(self, speaker_id: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _normalize_speaker_id(raw_speaker) -> Optional[str]:
+        """AssemblyAI speaker değerini "speaker_N" formatına çevir
+        
+        Bir transkriptte yalnızca birkaç farklı değer olduğundan sonuçlar cache'lenir.
+        """
+        if raw_speaker is None:
+            return None
+        
+        speaker_str = str(raw_speaker)
+        # "SPEAKER_00" veya zaten "speaker_0" formatındaysa numara tek eşleşmeyle alınır
+        match = _SPEAKER_PREFIX_RE.match(speaker_str)
+        if match:
+            return f"speaker_{match.group(1).strip()}"
+        # Eğer "A", "B" gibi harf formatındaysa
+        if len(speaker_str) == 1 and speaker_str.isalpha():
+            return f"speaker_{ord(speaker_str.upper()) - ord('A')}"
+        # Diğer durumlar
+        return f"speaker_{speaker_str}"
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _get_speaker_label(speaker_id: str) -> str:
         """Speaker ID'yi okunabilir etikete çevir"""
         if not speaker_id or speaker_id == 'speaker_unknown':
             return None
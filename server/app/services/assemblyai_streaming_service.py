@@ -12,19 +12,39 @@ KULLANIM:
 - Konuşmacı ayrımı desteği (format_turns=True)
 - Otomatik WAV dosyası kaydetme
 """
+import atexit
 import os
 import json
+import ssl
 import threading
 import time
 import wave
 from typing import Optional, Callable, List
 from urllib.parse import urlencode
 from datetime import datetime
+import orjson
 import pyaudio
 import websocket
 
 from ..config import settings
 
+# Streaming oturumları arasında paylaşılan TLS context: CA sertifikaları her oturumda yeniden yüklenmez
+_SSL_CONTEXT = ssl.create_default_context()
+
+# PortAudio başlatma/kapatma (cihaz taraması) yavaştır; süreç boyunca tek PyAudio örneği kullanılır,
+# oturumlar yalnızca kendi stream'lerini açıp kapatır
+_pyaudio: Optional[pyaudio.PyAudio] = None
+_pyaudio_lock = threading.Lock()
+
+
+def _get_pyaudio() -> pyaudio.PyAudio:
+    global _pyaudio
+    with _pyaudio_lock:
+        if _pyaudio is None:
+            _pyaudio = pyaudio.PyAudio()
+            atexit.register(_pyaudio.terminate)
+        return _pyaudio
+
 
 class AssemblyAIStreamingService:
     """AssemblyAI Streaming Audio servisi - Gerçek zamanlı transkripsiyon"""
@@ -34,8 +54,25 @@ class AssemblyAIStreamingService:
     SAMPLE_RATE = 16000
     CHANNELS = 1
     FORMAT = pyaudio.paInt16
+    SAMPLE_WIDTH = 2  # 16-bit = 2 bytes
+    
+    # Bu kadar frame (4 x 50ms = 200ms) tek WebSocket mesajında gönderilir; her 50ms'de
+    # ayrı TLS kaydı + frame başlığı oluşmaz, eklenen gecikme konuşma takibi için fark edilmez
+    SEND_BATCH_FRAMES = 4
+    
+    # WebSocket keepalive ping aralığı ve yanıt bekleme süresi (saniye)
+    WS_PING_INTERVAL = 30
+    WS_PING_TIMEOUT = 10
     
-    def __init__(self):
+    # Mikrofon thread'i ile gönderici thread arasındaki ring buffer (~32 sn ses)
+    RING_BUFFER_SIZE = 1 << 20
+    # Ring boşken gönderici thread'in bekleme aralığı
+    SENDER_POLL_INTERVAL = 0.02
+    
+    # WAV yazımında kullanılan dosya buffer'ı: 50ms'lik frame'ler tek tek syscall'a dönüşmez
+    WAV_WRITE_BUFFER_SIZE = 1024 * 1024
+    
+    def __init__(self, auto_save_wav: bool = True):
         # AssemblyAI API key
         self.api_key = settings.assemblyai_api_key or os.getenv("ASSEMBLYAI_API_KEY", "")
         
@@ -56,12 +93,22 @@ class AssemblyAIStreamingService:
         self.audio = None
         self.stream = None
         self.ws_app = None
-        self.audio_thread = None
+        self.sender_thread = None
         self.stop_event = threading.Event()
+        # Mikrofon callback'i artık ring'e yazmayacak (stream durduruldu)
+        self.capture_stopped = threading.Event()
+        
+        # Tek üretici (mikrofon) / tek tüketici (gönderici) ring buffer'ı. head/tail toplam okunan/yazılan
+        # byte sayısıdır; her biri yalnızca bir thread tarafından yazıldığından kilit gerekmez
+        self._ring = bytearray(self.RING_BUFFER_SIZE)
+        self._ring_head = 0
+        self._ring_tail = 0
         
-        # WAV recording
-        self.recorded_frames = []
+        # WAV recording: ham PCM tek bir büyüyen buffer'da tutulur (frame başına bytes nesnesi yok)
+        self.recorded_buf = bytearray()
         self.recording_lock = threading.Lock()
+        # Bağlantı kapanınca otomatik WAV kaydı (çağıran kendi yoluna kaydedecekse kapatılır)
+        self.auto_save_wav = auto_save_wav
         
         # Callbacks
         self.on_transcript_callback: Optional[Callable] = None
@@ -99,43 +146,78 @@ class AssemblyAIStreamingService:
         print("WebSocket connection opened.")
         print(f"Connected to: {self.api_endpoint}")
         
-        # Audio streaming thread'i başlat
-        def stream_audio():
-            print("Starting audio streaming...")
-            while not self.stop_event.is_set():
-                try:
-                    audio_data = self.stream.read(self.FRAMES_PER_BUFFER, exception_on_overflow=False)
-                    
-                    # Audio data'yı kaydet
-                    with self.recording_lock:
-                        self.recorded_frames.append(audio_data)
-                    
-                    # WebSocket üzerinden gönder
-                    ws.send(audio_data, websocket.ABNF.OPCODE_BINARY)
-                except Exception as e:
-                    print(f"Error streaming audio: {e}")
+        # Mikrofonu PortAudio callback'i okur; WebSocket gönderimi ayrı thread'de: gönderim takılırsa
+        # mikrofon beklemez
+        self.sender_thread = threading.Thread(target=self._sender_loop, args=(ws,), daemon=True)
+        self.sender_thread.start()
+        print("Starting audio streaming...")
+        self.stream.start_stream()
+    
+    def _pa_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio her FRAMES_PER_BUFFER'da çağırır; ses ring buffer'a yazılır (kilit yok)"""
+        if self.stop_event.is_set():
+            return (None, pyaudio.paComplete)
+        self._ring_write(in_data)
+        return (None, pyaudio.paContinue)
+    
+    def _sender_loop(self, ws):
+        """Ring buffer'daki sesi batch halinde WebSocket'e gönder ve kayda ekle"""
+        send_batch_bytes = self.FRAMES_PER_BUFFER * self.SAMPLE_WIDTH * self.CHANNELS * self.SEND_BATCH_FRAMES
+        # Alttaki bağlantının binary gönderimi doğrudan kullanılır (WebSocketApp.send'in her çağrıdaki
+        # kontrol/attribute zinciri atlanır); TCP_NODELAY websocket-client tarafından zaten açık
+        send_binary = ws.sock.send_binary
+        while True:
+            # Mikrofon durduğunda ring'de kalan ses de (Terminate'ten önce) gönderilir
+            capture_done = self.capture_stopped.is_set()
+            available = self._ring_tail - self._ring_head
+            if available < send_batch_bytes and not (capture_done and available):
+                if capture_done:
                     break
-            print("Audio streaming stopped.")
-        
-        self.audio_thread = threading.Thread(target=stream_audio)
-        self.audio_thread.daemon = True
-        self.audio_thread.start()
+                time.sleep(self.SENDER_POLL_INTERVAL)
+                continue
+            
+            audio_data = self._ring_read(available)
+            with self.recording_lock:
+                self.recorded_buf += audio_data
+            try:
+                send_binary(audio_data)
+            except Exception as e:
+                print(f"Error streaming audio: {e}")
+                self.stop_event.set()
+                break
+    
+    def _ring_write(self, data: bytes):
+        """Ring buffer'a yaz (yalnızca mikrofon thread'i çağırır)"""
+        size = len(data)
+        if self._ring_tail - self._ring_head + size > self.RING_BUFFER_SIZE:
+            print("Audio ring buffer full, dropping frame.")
+            return
+        position = self._ring_tail % self.RING_BUFFER_SIZE
+        first = min(size, self.RING_BUFFER_SIZE - position)
+        self._ring[position:position + first] = data[:first]
+        if first < size:
+            self._ring[:size - first] = data[first:]
+        # Veri yazıldıktan sonra yayınlanır; gönderici yarım yazılmış veriyi görmez
+        self._ring_tail += size
+    
+    def _ring_read(self, size: int) -> bytes:
+        """Ring buffer'dan size byte oku (yalnızca gönderici thread çağırır)"""
+        position = self._ring_head % self.RING_BUFFER_SIZE
+        first = min(size, self.RING_BUFFER_SIZE - position)
+        data = bytes(self._ring[position:position + first])
+        if first < size:
+            data += self._ring[:size - first]
+        self._ring_head += size
+        return data
     
     def _on_message(self, ws, message):
         """WebSocket mesajı alındığında"""
         try:
-            data = json.loads(message)
+            # skip_utf8_validation açıkken mesaj bytes olarak gelir; orjson str ve bytes'ı doğrudan çözer
+            data = orjson.loads(message)
             msg_type = data.get('type')
             
-            if msg_type == "Begin":
-                session_id = data.get('id')
-                expires_at = data.get('expires_at')
-                print(f"\nSession began: ID={session_id}, ExpiresAt={datetime.fromtimestamp(expires_at)}")
-                
-                if self.on_session_begin_callback:
-                    self.on_session_begin_callback(session_id, expires_at)
-                    
-            elif msg_type == "Turn":
+            if msg_type == "Turn":
                 transcript = data.get('transcript', '')
                 formatted = data.get('turn_is_formatted', False)
                 
@@ -150,6 +232,14 @@ class AssemblyAIStreamingService:
                 else:
                     print(f"{transcript}", end='', flush=True)
                     
+            elif msg_type == "Begin":
+                session_id = data.get('id')
+                expires_at = data.get('expires_at')
+                print(f"\nSession began: ID={session_id}, ExpiresAt={datetime.fromtimestamp(expires_at)}")
+                
+                if self.on_session_begin_callback:
+                    self.on_session_begin_callback(session_id, expires_at)
+                    
             elif msg_type == "Termination":
                 audio_duration = data.get('audio_duration_seconds', 0)
                 session_duration = data.get('session_duration_seconds', 0)
@@ -158,7 +248,7 @@ class AssemblyAIStreamingService:
                 if self.on_session_end_callback:
                     self.on_session_end_callback(audio_duration, session_duration)
                     
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Error decoding message: {e}")
         except Exception as e:
             print(f"Error handling message: {e}")
@@ -172,24 +262,32 @@ class AssemblyAIStreamingService:
         """WebSocket bağlantısı kapandığında"""
         print(f"\nWebSocket Disconnected: Status={close_status_code}, Msg={close_msg}")
         
+        # Mikrofonu durdur; gönderici ring'de kalan sesi kayda ekledikten sonra çıkar
+        self.stop_event.set()
+        self._stop_audio()
+        
         # WAV dosyasını kaydet
-        self.save_wav_file()
+        if self.auto_save_wav:
+            self.save_wav_file()
         
         # Cleanup
-        self.stop_event.set()
         
         if self.stream:
-            if self.stream.is_active():
-                self.stream.stop_stream()
             self.stream.close()
             self.stream = None
             
-        if self.audio:
-            self.audio.terminate()
-            self.audio = None
-            
-        if self.audio_thread and self.audio_thread.is_alive():
-            self.audio_thread.join(timeout=1.0)
+        # PyAudio paylaşılır; terminate edilmez
+        self.audio = None
+    
+    def _stop_audio(self):
+        """Mikrofon stream'ini durdur (çalışan callback'in bitmesini bekler), ardından göndericiyi bekle"""
+        if self.stream and self.stream.is_active():
+            self.stream.stop_stream()
+        self.capture_stopped.set()
+        
+        thread = self.sender_thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
     
     def save_wav_file(self, output_path: Optional[str] = None) -> Optional[str]:
         """
@@ -201,7 +299,7 @@ class AssemblyAIStreamingService:
         Returns:
             Kaydedilen dosya yolu veya None
         """
-        if not self.recorded_frames:
+        if not self.recorded_buf:
             print("No audio data recorded.")
             return None
         
@@ -210,17 +308,22 @@ class AssemblyAIStreamingService:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"recorded_audio_{timestamp}.wav"
         
+        # Buffer'ın anlık kopyası alınır; yazım sırasında kayıt thread'i kilitte beklemez
+        with self.recording_lock:
+            pcm_data = bytes(self.recorded_buf)
+        frame_count = len(pcm_data) // (self.SAMPLE_WIDTH * self.CHANNELS)
+        
         try:
-            with wave.open(output_path, 'wb') as wf:
-                wf.setnchannels(self.CHANNELS)
-                wf.setsampwidth(2)  # 16-bit = 2 bytes
-                wf.setframerate(self.SAMPLE_RATE)
-                
-                # Tüm frame'leri yaz
-                with self.recording_lock:
-                    wf.writeframes(b''.join(self.recorded_frames))
+            with open(output_path, 'wb', buffering=self.WAV_WRITE_BUFFER_SIZE) as f:
+                with wave.open(f, 'wb') as wf:
+                    wf.setnchannels(self.CHANNELS)
+                    wf.setsampwidth(self.SAMPLE_WIDTH)
+                    wf.setframerate(self.SAMPLE_RATE)
+                    # Frame sayısı baştan verilir: header sonradan seek ile düzeltilmez
+                    wf.setnframes(frame_count)
+                    wf.writeframesraw(pcm_data)
             
-            duration = len(self.recorded_frames) * self.FRAMES_PER_BUFFER / self.SAMPLE_RATE
+            duration = frame_count / self.SAMPLE_RATE
             print(f"Audio saved to: {output_path}")
             print(f"Duration: {duration:.2f} seconds")
             
@@ -237,8 +340,8 @@ class AssemblyAIStreamingService:
         Args:
             duration_seconds: Maksimum süre (saniye), None ise sonsuz
         """
-        # PyAudio'yu başlat
-        self.audio = pyaudio.PyAudio()
+        # Paylaşılan PyAudio örneğini al
+        self.audio = _get_pyaudio()
         
         # Mikrofon stream'ini aç
         try:
@@ -248,14 +351,14 @@ class AssemblyAIStreamingService:
                 channels=self.CHANNELS,
                 format=self.FORMAT,
                 rate=self.SAMPLE_RATE,
+                stream_callback=self._pa_callback,
+                start=False,  # WebSocket açılınca başlatılır
             )
             print("Microphone stream opened successfully.")
             print("Speak into your microphone. Press Ctrl+C to stop.")
             print("Audio will be saved to a WAV file when the session ends.")
         except Exception as e:
             print(f"Error opening microphone stream: {e}")
-            if self.audio:
-                self.audio.terminate()
             raise
         
         # WebSocketApp oluştur
@@ -269,7 +372,17 @@ class AssemblyAIStreamingService:
         )
         
         # WebSocket'i ayrı thread'de çalıştır
-        ws_thread = threading.Thread(target=self.ws_app.run_forever)
+        ws_thread = threading.Thread(
+            target=self.ws_app.run_forever,
+            kwargs={
+                "sslopt": {"context": _SSL_CONTEXT},
+                # Sessiz dönemlerde kopan bağlantı ping ile fark edilir
+                "ping_interval": self.WS_PING_INTERVAL,
+                "ping_timeout": self.WS_PING_TIMEOUT,
+                # Sunucudan gelen JSON mesajları için saf Python UTF-8 doğrulaması atlanır
+                "skip_utf8_validation": True,
+            }
+        )
         ws_thread.daemon = True
         ws_thread.start()
         
@@ -294,6 +407,9 @@ class AssemblyAIStreamingService:
         print("\nStopping streaming...")
         self.stop_event.set()
         
+        # Mikrofonu durdur ve göndericiyi bekle: ring'de kalan ses Terminate'ten önce gönderilmiş olsun
+        self._stop_audio()
+        
         # Termination mesajı gönder
         if self.ws_app and self.ws_app.sock and self.ws_app.sock.connected:
             try:
@@ -311,14 +427,14 @@ class AssemblyAIStreamingService:
         print("Streaming stopped.")
     
     def get_recorded_frames(self) -> List[bytes]:
-        """Kaydedilen audio frame'lerini al"""
+        """Kaydedilen audio'yu al (geriye uyumluluk için tek elemanlı liste)"""
         with self.recording_lock:
-            return self.recorded_frames.copy()
+            return [bytes(self.recorded_buf)] if self.recorded_buf else []
     
     def clear_recorded_frames(self):
         """Kaydedilen audio frame'lerini temizle"""
         with self.recording_lock:
-            self.recorded_frames.clear()
+            self.recorded_buf.clear()
 
 
 # Test için standalone kullanım
@@ -5,8 +5,52 @@ import soundfile as sf
 import noisereduce as nr
 from typing import Optional, Tuple
 import subprocess
-import tempfile
-import shutil
+
+# Peak normalizasyonunda hedeflenen en yüksek genlik
+PEAK_NORMALIZE_TARGET = 0.999
+
+# Gürültü engellemede paralel işlenen parça uzunluğu ve parçalar arası örtüşme (saniye)
+NOISE_REDUCE_CHUNK_SECONDS = 60
+NOISE_REDUCE_PADDING_SECONDS = 2
+
+# Preprocessing sonunda kesilen kuyruk sessizliği eşiği (en yüksek çerçevenin bu kadar dB altı).
+# Otomatik bitişte kaydın sonunda dakikalarca sessizlik kalır; yalnızca sondan kesildiği için
+# transkript zaman damgaları kaymaz
+TRAILING_SILENCE_TOP_DB = 40
+
+
+def _frame_rms(samples: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """Çerçeve başına RMS (frame_length, hop_length'in katı olmalı)
+
+    Kareler önce hop_length'lik bloklarda toplanır (int16/float32 girişte tam boy geçici dizi
+    oluşmaz); çerçeve enerjisi ardışık blok toplamlarının kümülatif farkından bulunur.
+    """
+    blocks_per_frame = frame_length // hop_length
+    block_count = len(samples) // hop_length
+    blocks = samples[:block_count * hop_length].reshape(block_count, -1)
+    block_energy = np.einsum('ij,ij->i', blocks, blocks, dtype=np.float64)
+    cumulative = np.concatenate(([0.0], np.cumsum(block_energy)))
+    energies = cumulative[blocks_per_frame:] - cumulative[:-blocks_per_frame]
+    return np.sqrt(energies / frame_length)
+
+
+def _trim_silence(
+    samples: np.ndarray,
+    top_db: float,
+    frame_length: int,
+    hop_length: int,
+    trim_leading: bool = True
+) -> np.ndarray:
+    """Baştaki (trim_leading) ve sondaki, en yüksek çerçeve seviyesinin top_db altında kalan sessizliği kes"""
+    if len(samples) < frame_length:
+        return samples
+    rms = _frame_rms(samples, frame_length, hop_length)
+    loud = np.flatnonzero(rms >= rms.max() * 10 ** (-top_db / 20))
+    if loud.size == 0:
+        return samples[:0]
+    start = loud[0] * hop_length if trim_leading else 0
+    end = min(len(samples), loud[-1] * hop_length + frame_length)
+    return samples[start:end]
 
 
 class AudioPreprocessingService:
@@ -47,6 +91,70 @@ class AudioPreprocessingService:
         subprocess.run(cmd, capture_output=True, check=True)
         return output_path
     
+    def _reduce_noise_array(self, audio: np.ndarray, sr: int) -> np.ndarray:
+        """Bellekteki ses dizisine iki aşamalı gürültü engelleme uygula"""
+        # Uzun kayıtlar NOISE_REDUCE_CHUNK_SECONDS'lik parçalar halinde tüm çekirdeklerde işlenir;
+        # padding non-stationary modun 2 sn'lik zaman sabitini kapsar, parça sınırlarında iz kalmaz
+        chunk_params = {
+            "chunk_size": NOISE_REDUCE_CHUNK_SECONDS * sr,
+            "padding": NOISE_REDUCE_PADDING_SECONDS * sr,
+            "n_jobs": -1,
+        }
+        
+        # Stationary noise reduction (arka plan gürültüsü)
+        reduced_noise = nr.reduce_noise(
+            y=audio,
+            sr=sr,
+            stationary=True,
+            prop_decrease=0.8,  # Gürültüyü %80 azalt
+            **chunk_params
+        )
+        
+        # Non-stationary noise reduction (geçici gürültüler)
+        return nr.reduce_noise(
+            y=reduced_noise,
+            sr=sr,
+            stationary=False,
+            prop_decrease=0.6,
+            **chunk_params
+        )
+    
+    def _normalize_array(self, audio: np.ndarray) -> np.ndarray:
+        """Peak normalization (yerinde); 16-bit'e yazarken taşma olmasın diye hedef 0.999"""
+        peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+        if peak > 0:
+            audio *= PEAK_NORMALIZE_TARGET / peak
+        return audio
+    
+    def _preprocess_array(self, audio: np.ndarray, sr: int) -> np.ndarray:
+        """Normalizasyon ve gürültü engellemeyi diske yazmadan aynı dizi üzerinde uygula"""
+        audio = self._normalize_array(audio)
+        try:
+            return self._reduce_noise_array(audio, sr)
+        except Exception as e:
+            print(f"Gürültü engelleme hatası: {e}")
+            # Hata durumunda yalnızca normalize edilmiş ses kullanılır
+            return audio
+    
+    def decode_to_array(self, input_path: str) -> Tuple[np.ndarray, int]:
+        """FFmpeg ile sesi mono 16 kHz PCM olarak pipe'tan doğrudan float32 diziye çöz (ara WAV dosyası yok)"""
+        if not self.check_ffmpeg():
+            raise RuntimeError("FFmpeg kurulu değil. Lütfen FFmpeg'i kurun.")
+        
+        cmd = [
+            'ffmpeg',
+            '-i', input_path,
+            '-f', 's16le',  # Header'sız ham 16-bit PCM
+            '-ar', str(self.sample_rate),
+            '-ac', '1',
+            '-'
+        ]
+        
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+        audio = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32)
+        audio *= 1.0 / 32768.0
+        return audio, self.sample_rate
+    
     def reduce_noise(self, audio_path: str, output_path: Optional[str] = None) -> str:
         """Gürültü engelleme (noise reduction)"""
         try:
@@ -54,21 +162,7 @@ class AudioPreprocessingService:
             audio, sr = librosa.load(audio_path, sr=self.sample_rate)
             
             # Gürültü engelleme uygula
-            # Stationary noise reduction (arka plan gürültüsü)
-            reduced_noise = nr.reduce_noise(
-                y=audio,
-                sr=sr,
-                stationary=True,
-                prop_decrease=0.8  # Gürültüyü %80 azalt
-            )
-            
-            # Non-stationary noise reduction (geçici gürültüler)
-            reduced_noise = nr.reduce_noise(
-                y=reduced_noise,
-                sr=sr,
-                stationary=False,
-                prop_decrease=0.6
-            )
+            reduced_noise = self._reduce_noise_array(audio, sr)
             
             # Çıktı dosyasını kaydet
             if output_path is None:
@@ -85,17 +179,18 @@ class AudioPreprocessingService:
     def normalize_audio(self, audio_path: str, output_path: Optional[str] = None) -> str:
         """Ses normalizasyonu - ses seviyesini optimize et"""
         try:
-            # Ses dosyasını yükle
-            audio, sr = librosa.load(audio_path, sr=self.sample_rate)
+            # Ses dosyasını doğrudan float32 olarak oku (librosa'nın resample/dönüşüm yolu atlanır;
+            # sample rate preprocess_audio'da convert_to_wav ile zaten ayarlanır)
+            audio, sr = sf.read(audio_path, dtype='float32', always_2d=False)
             
-            # Normalize et (peak normalization)
-            audio_normalized = librosa.util.normalize(audio)
+            # Normalize et (peak normalization, yerinde)
+            audio = self._normalize_array(audio)
             
             # Çıktı dosyasını kaydet
             if output_path is None:
                 output_path = audio_path.rsplit('.', 1)[0] + '_normalized.wav'
             
-            sf.write(output_path, audio_normalized, sr)
+            sf.write(output_path, audio, sr, subtype='PCM_16')
             return output_path
             
         except Exception as e:
@@ -105,13 +200,13 @@ class AudioPreprocessingService:
     def remove_silence(self, audio_path: str, output_path: Optional[str] = None) -> str:
         """Sessizlik bölümlerini kaldır"""
         try:
-            # Ses dosyasını yükle
-            audio, sr = librosa.load(audio_path, sr=self.sample_rate)
+            # Ses dosyasını int16 olarak yükle (float dönüşümü ve resample gerekmez)
+            audio, sr = sf.read(audio_path, dtype='int16', always_2d=False)
             
             # Trim silence (başındaki ve sonundaki sessizliği kaldır)
-            audio_trimmed, _ = librosa.effects.trim(
+            audio_trimmed = _trim_silence(
                 audio,
-                top_db=20,  # 20 dB altındaki sesleri sessizlik kabul et
+                top_db=20,  # En yüksek seviyenin 20 dB altındaki çerçeveler sessizlik kabul edilir
                 frame_length=2048,
                 hop_length=512
             )
@@ -128,39 +223,39 @@ class AudioPreprocessingService:
             return audio_path
     
     def preprocess_audio(self, audio_path: str, output_path: Optional[str] = None) -> str:
-        """Tüm preprocessing işlemlerini uygula"""
+        """Tüm preprocessing işlemlerini uygula
+        
+        Ses bir kez okunur, tüm adımlar bellekte aynı dizi üzerinde yapılır ve sonuç bir kez yazılır.
+        """
         try:
-            # Geçici dosya için tempfile kullan
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-                temp_path = tmp_file.name
-            
-            # 1. Format dönüşümü (FFmpeg ile)
-            if not audio_path.endswith('.wav'):
-                temp_path = self.convert_to_wav(audio_path, temp_path)
+            # 1. Format dönüşümü - yalnızca format, sample rate veya kanal sayısı uymuyorsa;
+            # FFmpeg çıktısı diske yazılmadan pipe'tan okunur
+            needs_conversion = not audio_path.endswith('.wav')
+            if not needs_conversion:
+                info = sf.info(audio_path)
+                needs_conversion = info.samplerate != self.sample_rate or info.channels != 1
+            if needs_conversion:
+                audio, sr = self.decode_to_array(audio_path)
             else:
-                # Eğer zaten WAV ise, sample rate'i kontrol et ve gerekirse dönüştür
-                audio, sr = librosa.load(audio_path, sr=None)
-                if sr != self.sample_rate:
-                    temp_path = self.convert_to_wav(audio_path, temp_path)
-                else:
-                    import shutil
-                    shutil.copy(audio_path, temp_path)
-            
-            # 2. Ses normalizasyonu
-            temp_path = self.normalize_audio(temp_path, temp_path)
+                audio, sr = sf.read(audio_path, dtype='float32', always_2d=False)
             
-            # 3. Gürültü engelleme
-            temp_path = self.reduce_noise(temp_path, temp_path)
+            # 2. Ses normalizasyonu + 3. Gürültü engelleme
+            audio = self._preprocess_array(audio, sr)
             
-            # 4. Sessizlik kaldırma (opsiyonel - çok agresif olabilir)
-            # temp_path = self.remove_silence(temp_path, temp_path)
+            # 4. Sondaki sessizliği kaldır; baştaki kesilmez (zaman damgaları orijinal kayıtla eşleşsin)
+            audio = _trim_silence(
+                audio,
+                top_db=TRAILING_SILENCE_TOP_DB,
+                frame_length=2048,
+                hop_length=512,
+                trim_leading=False
+            )
             
             # Final çıktı dosyası
             if output_path is None:
                 output_path = audio_path.rsplit('.', 1)[0] + '_processed.wav'
             
-            import shutil
-            shutil.move(temp_path, output_path)
+            sf.write(output_path, audio, sr, subtype='PCM_16')
             
             return output_path
             
@@ -168,4 +263,3 @@ class AudioPreprocessingService:
             print(f"Audio preprocessing hatası: {e}")
             # Hata durumunda orijinal dosyayı döndür
             return audio_path
-
@@ -1,24 +1,82 @@
-import os
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+import logging
+import subprocess
+from datetime import datetime, timezone
+from typing import Optional
+import numpy as np
 from ..models import Meeting
 
+logger = logging.getLogger(__name__)
+
+# MediaRecorder WebM akışındaki EBML başlığı ve Cluster element ID'leri
+WEBM_EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+
+
+def webm_init_segment(data: bytes) -> Optional[bytes]:
+    """Akışın ilk chunk'ından başlık bölümünü (ilk Cluster'a kadar) döndür; başlık yoksa None
+    
+    MediaRecorder'ın sonraki chunk'ları yalnızca Cluster içerir; tek başına çözülebilmeleri için
+    bu başlık önlerine eklenir.
+    """
+    if not data.startswith(WEBM_EBML_MAGIC):
+        return None
+    cluster_index = data.find(WEBM_CLUSTER_ID)
+    return bytes(data[:cluster_index]) if cluster_index > 0 else None
+
 
 class AudioService:
-    SILENCE_THRESHOLD = 500  # Ses seviyesi eşiği
+    SILENCE_THRESHOLD = 500  # Ses seviyesi eşiği (16-bit RMS)
     SILENCE_DURATION_SECONDS = 15 * 60  # 15 dakika (saniye)
     PAUSE_DURATION_SECONDS = 15 * 60  # 15 dakika pause sonrası
+    VAD_SAMPLE_RATE = 16000
     
-    def check_silence(self, audio_path: str, meeting: Meeting):
-        """Ses dosyasında sessizlik kontrolü yap"""
+    def check_silence_chunk(self, chunk: bytes, init_segment: Optional[bytes], meeting: Meeting):
+        """Yeni yüklenen chunk'ı bellekten çözüp ses enerjisine göre sessizlik kontrolü yap
+        
+        Büyüyen ana dosya yeniden okunmaz; yalnızca chunk (gerekirse WebM başlığı eklenerek) FFmpeg'e
+        pipe ile verilir. Sessizlik süresine chunk'ın çözülen ses süresi eklenir.
+        """
+        if not chunk.startswith(WEBM_EBML_MAGIC):
+            if init_segment is None:
+                logger.debug("Sessizlik kontrolü atlandı: WebM başlığı bilinmiyor (meeting %s)", meeting.id)
+                return
+            chunk = init_segment + chunk
+        
         try:
-            # WebM dosyasını işle (basit bir kontrol)
-            # Gerçek uygulamada daha gelişmiş VAD kullanılabilir
-            file_size = os.path.getsize(audio_path)
+            # Chunk'ı FFmpeg ile mono 16-bit PCM'e çöz
+            audio_data = subprocess.run(
+                [
+                    'ffmpeg', '-v', 'error',
+                    '-i', 'pipe:0',
+                    '-f', 's16le',
+                    '-ac', '1',
+                    '-ar', str(self.VAD_SAMPLE_RATE),
+                    '-'
+                ],
+                input=chunk,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=True
+            ).stdout
+        except Exception as e:
+            # Hata durumunda sessizlik kontrolünü atla
+            logger.warning("Sessizlik kontrolü hatası: %s", e)
+            return
+        
+        # silence_duration tam saniye saklanır
+        seconds = round(len(audio_data) / (2 * self.VAD_SAMPLE_RATE))
+        if seconds <= 0:
+            return
+        self._update_silence_state(meeting, not self.detect_voice_activity(audio_data), seconds)
+    
+    def _update_silence_state(self, meeting: Meeting, is_silent: bool, seconds: int):
+        """Sessizlik süresini güncelle, gerekirse toplantıyı duraklat veya bitir"""
+        try:
+            # Zaman kolonları naive UTC saklanır
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
             
-            # Eğer dosya çok küçükse sessizlik olabilir
-            if file_size < 1000:  # 1KB altı
-                meeting.silence_duration += 20  # Örnek: 20 saniye ekle
+            if is_silent:
+                meeting.silence_duration += seconds
             else:
                 meeting.silence_duration = 0  # Ses varsa sıfırla
             
@@ -26,25 +84,27 @@ class AudioService:
             if meeting.silence_duration >= self.SILENCE_DURATION_SECONDS:
                 if meeting.status == "recording":
                     meeting.status = "paused"
-                    meeting.pause_time = datetime.utcnow()
+                    meeting.pause_time = now
             
             # Eğer pause'dan sonra 15 dakika geçtiyse bitir
             if meeting.status == "paused" and meeting.pause_time:
-                pause_duration = (datetime.utcnow() - meeting.pause_time).total_seconds()
+                pause_duration = (now - meeting.pause_time).total_seconds()
                 if pause_duration >= self.PAUSE_DURATION_SECONDS:
                     meeting.status = "processing"
-                    meeting.end_time = datetime.utcnow()
+                    meeting.end_time = now
         
         except Exception as e:
             # Hata durumunda sessizlik kontrolünü atla
-            print(f"Sessizlik kontrolü hatası: {e}")
+            logger.warning("Sessizlik kontrolü hatası: %s", e)
     
     def detect_voice_activity(self, audio_data: bytes) -> bool:
-        """Ses aktivitesi tespiti (VAD)"""
+        """Ses aktivitesi tespiti (VAD) - 16-bit PCM'in RMS enerjisi eşikle karşılaştırılır"""
         try:
-            # Basit bir RMS (Root Mean Square) hesaplama
-            rms = audioop.rms(audio_data, 2)  # 16-bit sample
+            # Tek byte artık varsa at; int16 görünümü kopyasız oluşturulur
+            samples = np.frombuffer(audio_data, dtype=np.int16, count=len(audio_data) // 2)
+            if samples.size == 0:
+                return False
+            rms = np.sqrt(np.mean(np.square(samples, dtype=np.float32)))
             return rms > self.SILENCE_THRESHOLD
-        except:
+        except Exception:
             return False
-
@@ -0,0 +1,139 @@
+"""
+Uzun ses dosyalarını sessizlik noktalarından parçalara bölme (FFmpeg)
+
+Kesim noktaları hedef parça süresine en yakın sessizliğin ortasına denk getirilir, böylece
+kelimeler ve konuşmacı cümleleri ikiye bölünmez. Parçalar yeniden kodlanmadan (-c copy) yazılır.
+"""
+import os
+import re
+import subprocess
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+_SILENCE_RE = re.compile(r"silence_(start|end): (-?\d+(?:\.\d+)?)")
+
+
+def probe_duration(audio_path: str) -> float:
+    """Ses dosyasının süresini (saniye) ffprobe ile al"""
+    result = subprocess.run(
+        [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            audio_path
+        ],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(result.stdout.strip())
+
+
+def detect_silences(audio_path: str, noise_db: int = -40, min_silence_seconds: float = 0.5) -> List[float]:
+    """Sessiz aralıkların orta noktalarını (saniye, artan sırada) döndür"""
+    result = subprocess.run(
+        [
+            'ffmpeg', '-hide_banner', '-nostats',
+            '-i', audio_path,
+            '-af', f'silencedetect=noise={noise_db}dB:d={min_silence_seconds}',
+            '-f', 'null', '-'
+        ],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    midpoints = []
+    silence_start = None
+    for kind, value in _SILENCE_RE.findall(result.stderr):
+        if kind == 'start':
+            silence_start = float(value)
+        elif silence_start is not None:
+            midpoints.append((silence_start + float(value)) / 2)
+            silence_start = None
+    return midpoints
+
+
+def plan_split_points(
+    duration: float,
+    silences: List[float],
+    chunk_seconds: float,
+    search_seconds: float
+) -> List[float]:
+    """Her hedef sınıra ±search_seconds içindeki en yakın sessizliği seç, yoksa hedefte kes"""
+    points = []
+    last = 0.0
+    while duration - last > chunk_seconds:
+        target = last + chunk_seconds
+        index = bisect_left(silences, target)
+        candidates = [
+            s for s in silences[max(index - 1, 0):index + 1]
+            if s > last and abs(s - target) <= search_seconds
+        ]
+        point = min(candidates, key=lambda s: abs(s - target)) if candidates else target
+        points.append(point)
+        last = point
+    return points
+
+
+def split_audio(
+    audio_path: str,
+    output_dir: str,
+    chunk_seconds: float = 30 * 60,
+    search_seconds: float = 2 * 60
+) -> List[Tuple[str, float]]:
+    """
+    Ses dosyasını parçalara böl
+
+    Returns:
+        (parça dosya yolu, parçanın orijinal dosyadaki başlangıç saniyesi) listesi;
+        dosya chunk_seconds'tan kısaysa yalnızca orijinal dosya döner
+    """
+    duration = probe_duration(audio_path)
+    if duration <= chunk_seconds:
+        return [(audio_path, 0.0)]
+
+    points = plan_split_points(duration, detect_silences(audio_path), chunk_seconds, search_seconds)
+    bounds = [0.0, *points, duration]
+    extension = os.path.splitext(audio_path)[1]
+
+    chunks = []
+    for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        chunk_path = os.path.join(output_dir, f"chunk_{index:03d}{extension}")
+        subprocess.run(
+            [
+                'ffmpeg', '-v', 'error',
+                '-ss', f'{start:.3f}',
+                '-i', audio_path,
+                '-t', f'{end - start:.3f}',
+                '-c', 'copy',
+                '-y', chunk_path
+            ],
+            capture_output=True,
+            check=True
+        )
+        chunks.append((chunk_path, start))
+    return chunks
+
+
+def merge_chunk_segments(chunk_results: List[List[Dict]], offsets: List[float]) -> List[Dict]:
+    """
+    Parça transkriptlerini orijinal dosyanın zaman eksenine kaydırıp birleştir
+
+    Konuşmacı etiketleri her parçada yeniden başladığından ("A" bir parçada başka, diğerinde
+    başka kişi olabilir) birden fazla parça varsa konuşmacılar parça numarasıyla ayrıştırılır;
+    farklı parçalardaki konuşmacılar sessizce aynı kişi sayılmaz.
+    """
+    qualify_speakers = len(chunk_results) > 1
+    merged = []
+    for index, (segments, offset) in enumerate(zip(chunk_results, offsets)):
+        for segment in segments:
+            segment = dict(segment)
+            segment['start'] += offset
+            segment['end'] += offset
+            if qualify_speakers and segment.get('speaker_id'):
+                segment['speaker_id'] = f"{segment['speaker_id']}@part{index + 1}"
+                if segment.get('speaker_label'):
+                    segment['speaker_label'] = f"{segment['speaker_label']} (Parça {index + 1})"
+            merged.append(segment)
+    return merged
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from ..models import Meeting
 
 
@@ -8,7 +8,7 @@ class MeetingService:
     
     def get_active_meeting(self, user_id: int) -> Meeting:
         """Kullanıcının aktif toplantısını getir"""
-        return self.db.query(Meeting).filter(
+        return self.db.query(Meeting).options(raiseload("*")).filter(
             Meeting.user_id == user_id,
             Meeting.status.in_(["recording", "paused"])
         ).first()
@@ -1,4 +1,5 @@
 import json
+import asyncio
 from typing import Dict
 from openai import OpenAI
 from ..config import settings
@@ -24,7 +25,9 @@ Lütfen şu formatta JSON yanıt ver:
 }}"""
         
         try:
-            response = self.client.chat.completions.create(
+            # Senkron SDK çağrısı paylaşılan event loop'u bloklamasın
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": f"You are a helpful assistant that summarizes meeting transcripts in {lang_prompt}."},
@@ -48,7 +51,7 @@ Lütfen şu formatta JSON yanıt ver:
             
             return {
                 "summary": result.get("summary", content),
-                "key_points": json.dumps(result.get("key_points", []), ensure_ascii=False)
+                "key_points": result.get("key_points", [])
             }
         
         except Exception as e:
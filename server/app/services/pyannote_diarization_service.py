@@ -1,15 +1,15 @@
 import os
 import torch
+import torchaudio
 import soundfile as sf
 import noisereduce as nr
 from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor
 from pyannote.audio import Pipeline
 import numpy as np
 import psutil
-from scipy import signal
 import warnings
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 from ..config import settings
 
 warnings.filterwarnings("ignore")
@@ -36,6 +36,8 @@ class PyannoteDiarizationService:
         # Whisper chunk parametreleri
         self.chunk_length_s = 20
         self.stride_length_s = 4
+        # Aynı generate çağrısında işlenen chunk sayısı
+        self.whisper_batch_size = settings.pyannote_whisper_batch_size
         
         print(f"Pyannote Diarization Service - Device: {self.device}")
         
@@ -90,6 +92,7 @@ class PyannoteDiarizationService:
         self.whisper_model = None
         self.whisper_processor = None
         self.diarization_pipeline = None
+        self.diarization_autocast = False
         
         if torch.cuda.is_available():
             gpu_name = torch.cuda.get_device_name(0)
@@ -128,12 +131,38 @@ class PyannoteDiarizationService:
             print(f"⚠️ Noise reduction warning: {e}")
             return audio_array  # Return original audio if error occurs
     
-    def analyze_audio_quality(self, audio_path):
-        """Ses kalitesini analiz et ve uygun profil öner"""
-        audio_array, sample_rate = sf.read(audio_path, dtype='float32')
-        
+    def _as_audio_dict(self, audio: Union[str, Dict]) -> Dict:
+        """Dosya yolunu bir kez okuyup bellekteki ses dict'ine çevir (dict ise olduğu gibi döndür)"""
+        if isinstance(audio, dict):
+            return audio
+        audio_array, sample_rate = sf.read(audio, dtype='float32')
         if len(audio_array.shape) > 1:
             audio_array = np.mean(audio_array, axis=1)
+        return {"waveform": audio_array, "sample_rate": sample_rate}
+    
+    def _read_mono(self, audio: Union[str, Dict]) -> Tuple[np.ndarray, int]:
+        """Ses verisini mono float32 numpy dizisi olarak al"""
+        audio = self._as_audio_dict(audio)
+        waveform = audio["waveform"]
+        if isinstance(waveform, torch.Tensor):
+            waveform = waveform.detach().cpu().numpy()
+        waveform = np.asarray(waveform, dtype=np.float32)
+        if waveform.ndim > 1:
+            # torchaudio (channel, time) düzeninde döndürür
+            waveform = np.mean(waveform, axis=0)
+        return waveform, audio["sample_rate"]
+    
+    def _resample(self, audio_array: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+        """Sample rate dönüşümü (CUDA varsa GPU'da; CPU çekirdeğini darboğaz yapmaz)"""
+        if orig_sr == target_sr:
+            return audio_array
+        waveform = torch.from_numpy(np.ascontiguousarray(audio_array, dtype=np.float32)).to(self.device)
+        resampled = torchaudio.functional.resample(waveform, orig_sr, target_sr)
+        return resampled.cpu().numpy()
+    
+    def analyze_audio_quality(self, audio):
+        """Ses kalitesini analiz et ve uygun profil öner (audio: dosya yolu veya waveform dict)"""
+        audio_array, sample_rate = self._read_mono(audio)
         
         window_size = int(0.1 * sample_rate)
         energy = np.array([
@@ -190,24 +219,32 @@ class PyannoteDiarizationService:
                     "pyannote/speaker-diarization-3.1",
                     token=self.hf_token
                 )
+                # Batch boyutları: büyük batch'ler VRAM'i şişirip küçük GPU'larda sayfalamaya neden olur
+                if hasattr(self.diarization_pipeline, "embedding_batch_size"):
+                    self.diarization_pipeline.embedding_batch_size = settings.pyannote_embedding_batch_size
+                if hasattr(self.diarization_pipeline, "segmentation_batch_size"):
+                    self.diarization_pipeline.segmentation_batch_size = settings.pyannote_segmentation_batch_size
                 if torch.cuda.is_available():
                     self.diarization_pipeline.to(torch.device("cuda"))
+                    if settings.pyannote_fp16:
+                        if hasattr(self.diarization_pipeline, "_embedding_precision"):
+                            # Embedding backbone'u fp16 autocast ile çalışır, pooling/clustering fp32 kalır
+                            self.diarization_pipeline._embedding_precision = torch.float16
+                        else:
+                            # Bu pyannote sürümünde ayar yok; pipeline çağrısı autocast ile sarılır
+                            self.diarization_autocast = True
                 print("✓ Pyannote model loaded")
             except Exception as e:
                 print(f"❌ Pyannote model loading error: {e}")
                 raise e
     
-    def _load_audio(self, audio_path, target_sr=16000):
-        """Ses dosyasını yükle ve normalize et"""
+    def _load_audio(self, audio, target_sr=16000):
+        """Ses verisini yükle ve normalize et (audio: dosya yolu veya waveform dict)"""
         try:
-            audio_array, sample_rate = sf.read(audio_path, dtype='float32')
-            
-            if len(audio_array.shape) > 1:
-                audio_array = np.mean(audio_array, axis=1)
+            audio_array, sample_rate = self._read_mono(audio)
             
             if sample_rate != target_sr:
-                num_samples = int(len(audio_array) * target_sr / sample_rate)
-                audio_array = signal.resample(audio_array, num_samples)
+                audio_array = self._resample(audio_array, sample_rate, target_sr)
                 sample_rate = target_sr
             
             if np.abs(audio_array).max() > 0:
@@ -219,12 +256,12 @@ class PyannoteDiarizationService:
             print(f"❌ Audio loading error: {e}")
             raise
     
-    def diarize_audio(self, audio_path, min_speakers=None, max_speakers=None, profile='auto'):
-        """Konuşmacı ayrımı"""
+    def diarize_audio(self, audio, min_speakers=None, max_speakers=None, profile='auto'):
+        """Konuşmacı ayrımı (audio: dosya yolu veya waveform dict)"""
         print("\n🔍 Starting speaker diarization...")
         
         if profile == 'auto':
-            profile, snr, speech_ratio = self.analyze_audio_quality(audio_path)
+            profile, snr, speech_ratio = self.analyze_audio_quality(audio)
         
         params = self.diarization_profiles.get(profile, self.diarization_profiles['high_quality'])
         
@@ -233,10 +270,12 @@ class PyannoteDiarizationService:
         print(f"  Clustering: {params['clustering']}")
         
         try:
-            audio_array, sample_rate = sf.read(audio_path, dtype='float32')
+            audio_array, sample_rate = self._read_mono(audio)
             
-            if len(audio_array.shape) > 1:
-                audio_array = np.mean(audio_array, axis=1)
+            # Pipeline 16 kHz bekler; resample pyannote içinde CPU'da yapılmasın
+            if sample_rate != 16000:
+                audio_array = self._resample(audio_array, sample_rate, 16000)
+                sample_rate = 16000
             
             print("🔊 Cleaning audio (AI Noise Reduction)...")
             audio_array = self._apply_ai_noise_reduction(audio_array, sample_rate)
@@ -250,15 +289,16 @@ class PyannoteDiarizationService:
                 "sample_rate": sample_rate
             }
             
-            if min_speakers and max_speakers:
-                diarization = self.diarization_pipeline(
-                    audio_dict, 
-                    min_speakers=min_speakers, 
-                    max_speakers=max_speakers,
-                    **params
-                )
-            else:
-                diarization = self.diarization_pipeline(audio_dict, **params)
+            with torch.autocast("cuda", dtype=torch.float16, enabled=self.diarization_autocast):
+                if min_speakers and max_speakers:
+                    diarization = self.diarization_pipeline(
+                        audio_dict, 
+                        min_speakers=min_speakers, 
+                        max_speakers=max_speakers,
+                        **params
+                    )
+                else:
+                    diarization = self.diarization_pipeline(audio_dict, **params)
             
             if torch.cuda.is_available():
                 gpu_after = torch.cuda.memory_allocated(0) / 1024**3
@@ -272,12 +312,12 @@ class PyannoteDiarizationService:
             print(f"❌ Diarization error: {e}")
             raise
     
-    def transcribe_audio_chunked(self, audio_path):
-        """Uzun ses dosyalarını chunk'lara bölerek transkript et"""
+    def transcribe_audio_chunked(self, audio):
+        """Uzun ses dosyalarını chunk'lara bölerek transkript et (audio: dosya yolu veya waveform dict)"""
         print("\n📝 Creating transcript (chunk-based)...")
         
         try:
-            audio_array, sample_rate = self._load_audio(audio_path, target_sr=16000)
+            audio_array, sample_rate = self._load_audio(audio, target_sr=16000)
             total_duration = len(audio_array) / sample_rate
             
             print(f"Total duration: {total_duration:.2f} seconds ({total_duration/60:.2f} minutes)")
@@ -285,41 +325,50 @@ class PyannoteDiarizationService:
             chunk_samples = int(self.chunk_length_s * sample_rate)
             stride_samples = int(self.stride_length_s * sample_rate)
             
-            all_chunks = []
+            # Chunk başlangıçlarını önceden hesapla (1 saniyeden kısa son parça atlanır)
+            chunk_offsets = []
             offset = 0
-            chunk_idx = 0
-            
             while offset < len(audio_array):
                 end = min(offset + chunk_samples, len(audio_array))
-                chunk = audio_array[offset:end]
-                
-                if len(chunk) < sample_rate:
+                if end - offset < sample_rate:
                     break
+                chunk_offsets.append(offset)
+                offset += chunk_samples - stride_samples
+            
+            all_chunks = []
+            
+            # Chunk'lar GPU'ya tek tek değil batch halinde verilir
+            for batch_start in range(0, len(chunk_offsets), self.whisper_batch_size):
+                batch_offsets = chunk_offsets[batch_start:batch_start + self.whisper_batch_size]
+                batch_audio = [audio_array[o:o + chunk_samples] for o in batch_offsets]
                 
-                chunk_idx += 1
-                chunk_start_time = offset / sample_rate
-                
+                first_start = batch_offsets[0] / sample_rate
+                last_end = (batch_offsets[-1] + len(batch_audio[-1])) / sample_rate
+                batch_label = f"{batch_start + 1}-{batch_start + len(batch_offsets)}"
                 if torch.cuda.is_available():
                     gpu_used = torch.cuda.memory_allocated(0) / 1024**3
-                    print(f"  Chunk {chunk_idx}: {chunk_start_time:.1f}s - {chunk_start_time + len(chunk)/sample_rate:.1f}s | GPU: {gpu_used:.2f}GB")
+                    print(f"  Chunks {batch_label}: {first_start:.1f}s - {last_end:.1f}s | GPU: {gpu_used:.2f}GB")
                 else:
                     cpu_percent = psutil.cpu_percent(interval=0.1)
                     ram_used = psutil.virtual_memory().used / 1024**3
-                    print(f"  Chunk {chunk_idx}: {chunk_start_time:.1f}s | CPU: {cpu_percent}% | RAM: {ram_used:.2f}GB")
+                    print(f"  Chunks {batch_label}: {first_start:.1f}s - {last_end:.1f}s | CPU: {cpu_percent}% | RAM: {ram_used:.2f}GB")
                 
-                input_features = self.whisper_processor(
-                    chunk,
+                inputs = self.whisper_processor(
+                    batch_audio,
                     sampling_rate=16000,
                     return_tensors="pt",
                     return_attention_mask=True
-                ).input_features
+                )
                 
-                input_features = input_features.to(self.device, dtype=self.dtype)
+                input_features = inputs.input_features.to(self.device, dtype=self.dtype)
+                # Batch'teki kısa segmentlerin dolgu (padding) kısmı maske ile işaretlenir
+                attention_mask = inputs.attention_mask.to(self.device)
                 
                 with torch.no_grad():
                     # 🔥 FIXED: condition_on_previous_text removed to prevent context bleeding
                     predicted_ids = self.whisper_model.generate(
                         input_features,
+                        attention_mask=attention_mask,
                         language="tr",
                         task="transcribe",
                         return_timestamps=True,
@@ -335,25 +384,25 @@ class PyannoteDiarizationService:
                         logprob_threshold=-1.0,           # Stop at low log probabilities
                     )
                 
-                transcription = self.whisper_processor.batch_decode(
+                transcriptions = self.whisper_processor.batch_decode(
                     predicted_ids,
                     skip_special_tokens=False,
                     decode_with_timestamps=True
                 )
                 
-                chunk_result = self._parse_whisper_output(transcription[0])
-                
-                for sub_chunk in chunk_result['chunks']:
-                    if sub_chunk['timestamp'][0] is not None:
-                        adjusted_start = chunk_start_time + sub_chunk['timestamp'][0]
-                        adjusted_end = chunk_start_time + sub_chunk['timestamp'][1]
-                        
-                        all_chunks.append({
-                            'timestamp': (adjusted_start, adjusted_end),
-                            'text': sub_chunk['text']
-                        })
-                
-                offset += chunk_samples - stride_samples
+                for chunk_offset, transcription in zip(batch_offsets, transcriptions):
+                    chunk_start_time = chunk_offset / sample_rate
+                    chunk_result = self._parse_whisper_output(transcription)
+                    
+                    for sub_chunk in chunk_result['chunks']:
+                        if sub_chunk['timestamp'][0] is not None:
+                            adjusted_start = chunk_start_time + sub_chunk['timestamp'][0]
+                            adjusted_end = chunk_start_time + sub_chunk['timestamp'][1]
+                            
+                            all_chunks.append({
+                                'timestamp': (adjusted_start, adjusted_end),
+                                'text': sub_chunk['text']
+                            })
             
             print(f"✓ Total {len(all_chunks)} segments transcribed")
             
@@ -731,20 +780,24 @@ class PyannoteDiarizationService:
     
     def process_with_speakers(
         self, 
-        audio_path, 
+        audio: Union[str, Dict], 
         min_speakers=None, 
         max_speakers=None, 
         profile='auto'
     ) -> List[Dict]:
         """
         Pyannote ile konuşmacı ayrımı ve transkript oluştur
+        audio: dosya yolu veya {"waveform": ..., "sample_rate": ...} dict'i
         Returns: List of transcript segments with speaker info
         """
         # Modelleri yükle
         self._load_models()
         
+        # Ses bir kez belleğe alınır; kalite analizi, diarization ve transkript aynı veriyi kullanır
+        audio = self._as_audio_dict(audio)
+        
         # 1. Diarization İşlemi
-        diarization_output = self.diarize_audio(audio_path, min_speakers, max_speakers, profile)
+        diarization_output = self.diarize_audio(audio, min_speakers, max_speakers, profile)
         
         # Diarization output'u düzelt
         if hasattr(diarization_output, 'speaker_diarization'):
@@ -762,7 +815,7 @@ class PyannoteDiarizationService:
         speaker_stats = self.calculate_speaker_statistics(clean_diarization)
         
         # 5. Transkript
-        transcription = self.transcribe_audio_chunked(audio_path)
+        transcription = self.transcribe_audio_chunked(audio)
         
         # Diarization segmentlerini listeye çevir
         speaker_segments = []
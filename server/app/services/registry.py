@@ -0,0 +1,62 @@
+"""
+Süreç boyunca paylaşılan servis örnekleri
+
+Whisper/Pyannote gibi servisler model yükler; her toplantıda yeniden oluşturulmaları modelin
+tekrar belleğe alınmasına yol açar. Servisler ilk kullanımda oluşturulur (ağır bağımlılıklar
+yalnızca gerektiğinde import edilir) ve sonraki çağrılarda aynı örnek döndürülür.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_transcript_cache_service():
+    from .transcript_cache_service import TranscriptCacheService
+    return TranscriptCacheService()
+
+
+@lru_cache(maxsize=None)
+def get_audio_preprocessing_service():
+    from .audio_preprocessing_service import AudioPreprocessingService
+    return AudioPreprocessingService()
+
+
+@lru_cache(maxsize=None)
+def get_whisper_service():
+    from .whisper_service import WhisperService
+    return WhisperService()
+
+
+@lru_cache(maxsize=None)
+def get_speaker_diarization_service():
+    from .speaker_diarization_service import SpeakerDiarizationService
+    return SpeakerDiarizationService()
+
+
+@lru_cache(maxsize=None)
+def get_pyannote_service():
+    from .pyannote_diarization_service import PyannoteDiarizationService
+    return PyannoteDiarizationService()
+
+
+@lru_cache(maxsize=None)
+def get_elevenlabs_service():
+    from .elevenlabs_service import ElevenLabsService
+    return ElevenLabsService()
+
+
+@lru_cache(maxsize=None)
+def get_assemblyai_service():
+    from .assemblyai_service import AssemblyAIService
+    return AssemblyAIService()
+
+
+@lru_cache(maxsize=None)
+def get_speechrecognition_service():
+    from .speechrecognition_service import SpeechRecognitionService
+    return SpeechRecognitionService()
+
+
+@lru_cache(maxsize=None)
+def get_openai_service():
+    from .openai_service import OpenAIService
+    return OpenAIService()
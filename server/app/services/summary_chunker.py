@@ -0,0 +1,40 @@
+from typing import List, Optional
+
+
+class SummaryChunker:
+    """Canlı transkript segmentlerini özetlenecek parçalara böler
+
+    Streaming segmentlerinde zaman damgası olmadığından pencere karakter sayısıyla ölçülür.
+    Bir parça kapandığında son `overlap_segments` segment bir sonraki parçanın başına taşınır,
+    böylece parça sınırında kalan cümlenin bağlamı kaybolmaz.
+    """
+
+    def __init__(self, window_chars: int = 4000, overlap_segments: int = 2):
+        self.window_chars = window_chars
+        self.overlap_segments = overlap_segments
+        self._segments: List[str] = []
+        self._chars = 0
+        self._new_segments = 0
+
+    def add(self, text: str) -> Optional[str]:
+        """Segment ekle; pencere dolduysa özetlenecek parça metnini döndür"""
+        self._segments.append(text)
+        self._chars += len(text)
+        self._new_segments += 1
+        if self._chars < self.window_chars:
+            return None
+        return self._emit()
+
+    def flush(self) -> Optional[str]:
+        """Henüz özetlenmemiş segment kaldıysa son parçayı döndür"""
+        if not self._new_segments:
+            return None
+        return self._emit()
+
+    def _emit(self) -> str:
+        chunk = "\n".join(self._segments)
+        overlap = self._segments[-self.overlap_segments:] if self.overlap_segments else []
+        self._segments = list(overlap)
+        self._chars = sum(len(s) for s in overlap)
+        self._new_segments = 0
+        return chunk
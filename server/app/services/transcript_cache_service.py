@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Dosya hash'i için okuma bloğu
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Bellekte tutulan (yol, boyut, mtime) -> sha256 eşlemesi sayısı
+DIGEST_MEMO_SIZE = 256
+
+
+class TranscriptCacheService:
+    """Ses içeriği + model parametrelerine göre transkript sonuçlarını diskte saklar"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or settings.transcript_cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Dosya değişmediyse (boyut + mtime aynı) sha256 tekrar hesaplanmaz
+        self._digest_memo: Dict[Tuple[str, int, int], str] = {}
+        self._digest_memo_lock = threading.Lock()
+
+    def file_digest(self, audio_path: str) -> str:
+        """Ses dosyasının sha256 özetini hesapla"""
+        digest = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _memoized_digest(self, audio_path: str, file_stat: Optional[os.stat_result] = None) -> str:
+        """Dosya kimliği (yol, boyut, mtime) değişmediyse önceki sha256 özetini kullan"""
+        if file_stat is None:
+            file_stat = os.stat(audio_path)
+        identity = (os.path.abspath(audio_path), file_stat.st_size, file_stat.st_mtime_ns)
+        
+        with self._digest_memo_lock:
+            digest = self._digest_memo.get(identity)
+        if digest is not None:
+            return digest
+        
+        digest = self.file_digest(audio_path)
+        with self._digest_memo_lock:
+            if len(self._digest_memo) >= DIGEST_MEMO_SIZE:
+                self._digest_memo.pop(next(iter(self._digest_memo)))
+            self._digest_memo[identity] = digest
+        return digest
+
+    def make_key(self, audio_path: str, model_name: str, file_stat: Optional[os.stat_result] = None, **params) -> str:
+        """Ses içeriği, model ve işleme parametrelerinden cache anahtarı üret
+        
+        file_stat verilirse dosya tekrar stat edilmez.
+        """
+        param_str = json.dumps(params, sort_keys=True, default=str)
+        raw = f"{self._memoized_digest(audio_path, file_stat)}|{model_name}|{param_str}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Cache'teki transkript segmentlerini döndür (yoksa None)"""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Transkript cache okunamadı (%s): %s", key, e)
+            return None
+
+    def set(self, key: str, transcripts: List[Dict]):
+        """Transkript segmentlerini cache'e yaz (yarım dosya kalmaması için önce geçici dosyaya)"""
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(transcripts, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Transkript cache yazılamadı (%s): %s", key, e)
@@ -1,5 +1,6 @@
 import whisper
 import os
+import asyncio
 import torch
 import numpy as np
 from typing import List, Dict, Optional
@@ -39,6 +40,24 @@ class WhisperService:
         language: str = "tr",
         enable_speaker_diarization: bool = False,
         speaker_segments: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """Ses dosyasını transkript et (CPU/GPU-yoğun iş thread'de çalışır, event loop bloklanmaz)"""
+        return await asyncio.to_thread(
+            self.transcribe_sync,
+            audio_path,
+            model_name,
+            language,
+            enable_speaker_diarization,
+            speaker_segments
+        )
+    
+    def transcribe_sync(
+        self,
+        audio_path: str,
+        model_name: str = "small",
+        language: str = "tr",
+        enable_speaker_diarization: bool = False,
+        speaker_segments: Optional[List[Dict]] = None
     ) -> List[Dict]:
         """Ses dosyasını transkript et - Optimize edilmiş parametrelerle"""
         if not os.path.exists(audio_path):
@@ -76,16 +95,23 @@ class WhisperService:
                 "speaker_label": None
             }
             
-            # Speaker diarization varsa eşleştir
-            if enable_speaker_diarization and speaker_segments:
-                # Bu segmentin hangi konuşmacıya ait olduğunu bul
-                for speaker_seg in speaker_segments:
-                    if (segment["start"] >= speaker_seg["start"] and 
-                        segment["end"] <= speaker_seg["end"]):
-                        segment_data["speaker_id"] = speaker_seg.get("speaker_id")
-                        segment_data["speaker_label"] = speaker_seg.get("speaker_label")
-                        break
-            
             segments.append(segment_data)
         
+        # Speaker diarization varsa eşleştir
+        if enable_speaker_diarization and speaker_segments:
+            self.assign_speakers(segments, speaker_segments)
+        
+        return segments
+    
+    @staticmethod
+    def assign_speakers(segments: List[Dict], speaker_segments: List[Dict]) -> List[Dict]:
+        """Transkript segmentlerine, tamamen içinde kaldıkları konuşmacı segmentinin bilgisini ekle"""
+        for segment_data in segments:
+            # Bu segmentin hangi konuşmacıya ait olduğunu bul
+            for speaker_seg in speaker_segments:
+                if (segment_data["start"] >= speaker_seg["start"] and 
+                    segment_data["end"] <= speaker_seg["end"]):
+                    segment_data["speaker_id"] = speaker_seg.get("speaker_id")
+                    segment_data["speaker_label"] = speaker_seg.get("speaker_label")
+                    break
         return segments
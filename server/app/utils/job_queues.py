@@ -0,0 +1,43 @@
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Yerel Whisper/Pyannote işleri tek worker'da sırayla çalışır: GPU belleği işler arasında
+# paylaşılmaz ve uzun süren işler FastAPI'nin threadpool'unu meşgul etmez
+_gpu_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gpu-job")
+
+# API tabanlı transkripsiyon ve OpenAI özet işleri GPU kuyruğunu beklemez
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="io-job")
+
+# Canlı streaming oturumları süre boyunca thread'i bloklar; istek ve diğer iş kuyruklarından ayrı tutulur
+_stream_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="stream-job")
+
+
+def _log_failure(future: Future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Background job başarısız: %s", exc, exc_info=exc)
+
+
+def submit_gpu_job(fn: Callable, *args, **kwargs) -> Future:
+    """İşi GPU kuyruğuna ekle"""
+    future = _gpu_executor.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def submit_io_job(fn: Callable, *args, **kwargs) -> Future:
+    """İşi API/IO kuyruğuna ekle"""
+    future = _io_executor.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def submit_stream_job(fn: Callable, *args, **kwargs) -> Future:
+    """Streaming oturumunu ayrı streaming kuyruğuna ekle"""
+    future = _stream_executor.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
@@ -1,9 +1,12 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
+import logging
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Şifreyi doğrula"""
@@ -24,8 +27,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         # Bcrypt ile doğrula
         return bcrypt.checkpw(password_bytes, hashed_bytes)
     except Exception as e:
-        # Hata durumunda log'la (production'da logger kullanılabilir)
-        print(f"Şifre doğrulama hatası: {e}")
+        # Hata durumunda log'la
+        logger.warning("Şifre doğrulama hatası: %s", e)
         return False
 
 
@@ -45,9 +48,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """JWT token oluştur"""
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
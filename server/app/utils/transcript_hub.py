@@ -0,0 +1,40 @@
+import asyncio
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# meeting_id -> (abonenin event loop'u, kuyruğu) listesi
+_subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_subscribers_lock = threading.Lock()
+
+
+def subscribe(meeting_id: int) -> asyncio.Queue:
+    """Toplantının yeni transkript segmentleri için kuyruk aç (event loop içinden çağrılır)"""
+    queue: asyncio.Queue = asyncio.Queue()
+    with _subscribers_lock:
+        _subscribers.setdefault(meeting_id, []).append((asyncio.get_running_loop(), queue))
+    return queue
+
+
+def unsubscribe(meeting_id: int, queue: asyncio.Queue):
+    """Aboneliği kaldır"""
+    with _subscribers_lock:
+        subscribers = [s for s in _subscribers.get(meeting_id, []) if s[1] is not queue]
+        if subscribers:
+            _subscribers[meeting_id] = subscribers
+        else:
+            _subscribers.pop(meeting_id, None)
+
+
+def has_subscribers(meeting_id: int) -> bool:
+    """Toplantıyı izleyen abone var mı (yoksa yayın için satır hazırlanmaz)"""
+    with _subscribers_lock:
+        return meeting_id in _subscribers
+
+
+def publish(meeting_id: int, segments: List[Optional[dict]]):
+    """Segmentleri abonelere ilet (herhangi bir thread'den çağrılabilir; None akışın bittiğini bildirir)"""
+    with _subscribers_lock:
+        subscribers = list(_subscribers.get(meeting_id, ()))
+    for loop, queue in subscribers:
+        for segment in segments:
+            loop.call_soon_threadsafe(queue.put_nowait, segment)
@@ -0,0 +1,26 @@
+import asyncio
+import threading
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Background task'ların async servis çağrıları için süreç boyunca açık kalan tek event loop
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_loop_lock = threading.Lock()
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Paylaşılan worker loop'u döndür, ilk çağrıda daemon thread içinde başlat"""
+    global _worker_loop
+    with _worker_loop_lock:
+        if _worker_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="worker-loop", daemon=True)
+            thread.start()
+            _worker_loop = loop
+        return _worker_loop
+
+
+def run_in_worker_loop(coro: Awaitable[T]) -> T:
+    """Coroutine'i paylaşılan loop'ta çalıştır ve sonucunu bekle (senkron background task'lardan çağrılır)"""
+    return asyncio.run_coroutine_threadsafe(coro, get_worker_loop()).result()
@@ -0,0 +1,65 @@
+"""
+Database migration script to add a filtered unique index on the meetings table
+
+Ensures a user can have at most one active (recording/paused) meeting, even when
+concurrent /start requests pass the application-level check at the same time
+"""
+
+from sqlalchemy import create_engine, text
+from app.config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_add_active_meeting_index():
+    """Add ix_meetings_one_active_per_user filtered unique index to Meeting table"""
+    
+    try:
+        # Create database engine
+        engine = create_engine(settings.database_url)
+        
+        with engine.connect() as connection:
+            # Check if index already exists
+            check_query = text("""
+                SELECT COUNT(*) as count
+                FROM sys.indexes
+                WHERE name = 'ix_meetings_one_active_per_user'
+                AND object_id = OBJECT_ID('meetings')
+            """)
+            
+            result = connection.execute(check_query)
+            row = result.fetchone()
+            
+            if row[0] > 0:
+                logger.info("✅ Index 'ix_meetings_one_active_per_user' already exists on 'meetings' table")
+                return True
+            
+            # Add the filtered unique index
+            create_query = text("""
+                CREATE UNIQUE NONCLUSTERED INDEX ix_meetings_one_active_per_user
+                ON meetings (user_id)
+                WHERE status IN ('recording', 'paused')
+            """)
+            
+            connection.execute(create_query)
+            connection.commit()
+            
+            logger.info("✅ Successfully added 'ix_meetings_one_active_per_user' index to 'meetings' table")
+            return True
+            
+    except Exception as e:
+        logger.error(f"❌ Error adding ix_meetings_one_active_per_user index: {e}")
+        logger.error("If users already have more than one active meeting, end or cancel the extra meetings first")
+        return False
+
+
+if __name__ == "__main__":
+    logger.info("Starting database migration: Add active meeting unique index")
+    success = migrate_add_active_meeting_index()
+    
+    if success:
+        logger.info("✅ Migration completed successfully")
+    else:
+        logger.error("❌ Migration failed")
@@ -0,0 +1,62 @@
+"""
+Database migration script to add a (user_id, created_at DESC) index on the meetings table
+
+Supports the meeting list endpoint, which filters by user and pages by created_at
+"""
+
+from sqlalchemy import create_engine, text
+from app.config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_add_meeting_list_index():
+    """Add ix_meetings_user_id_created_at index to Meeting table"""
+    
+    try:
+        # Create database engine
+        engine = create_engine(settings.database_url)
+        
+        with engine.connect() as connection:
+            # Check if index already exists
+            check_query = text("""
+                SELECT COUNT(*) as count
+                FROM sys.indexes
+                WHERE name = 'ix_meetings_user_id_created_at'
+                AND object_id = OBJECT_ID('meetings')
+            """)
+            
+            result = connection.execute(check_query)
+            row = result.fetchone()
+            
+            if row[0] > 0:
+                logger.info("✅ Index 'ix_meetings_user_id_created_at' already exists on 'meetings' table")
+                return True
+            
+            # Add the index
+            create_query = text("""
+                CREATE NONCLUSTERED INDEX ix_meetings_user_id_created_at
+                ON meetings (user_id, created_at DESC)
+            """)
+            
+            connection.execute(create_query)
+            connection.commit()
+            
+            logger.info("✅ Successfully added 'ix_meetings_user_id_created_at' index to 'meetings' table")
+            return True
+            
+    except Exception as e:
+        logger.error(f"❌ Error adding ix_meetings_user_id_created_at index: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    logger.info("Starting database migration: Add meeting list index")
+    success = migrate_add_meeting_list_index()
+    
+    if success:
+        logger.info("✅ Migration completed successfully")
+    else:
+        logger.error("❌ Migration failed")
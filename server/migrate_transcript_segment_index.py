@@ -0,0 +1,62 @@
+"""
+Database migration script to add a (meeting_id, segment_number) index on the transcripts table
+
+Supports the transcript endpoint, which filters by meeting and orders by segment_number
+"""
+
+from sqlalchemy import create_engine, text
+from app.config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_add_transcript_segment_index():
+    """Add ix_transcripts_meeting_seg index to Transcript table"""
+    
+    try:
+        # Create database engine
+        engine = create_engine(settings.database_url)
+        
+        with engine.connect() as connection:
+            # Check if index already exists
+            check_query = text("""
+                SELECT COUNT(*) as count
+                FROM sys.indexes
+                WHERE name = 'ix_transcripts_meeting_seg'
+                AND object_id = OBJECT_ID('transcripts')
+            """)
+            
+            result = connection.execute(check_query)
+            row = result.fetchone()
+            
+            if row[0] > 0:
+                logger.info("✅ Index 'ix_transcripts_meeting_seg' already exists on 'transcripts' table")
+                return True
+            
+            # Add the index
+            create_query = text("""
+                CREATE NONCLUSTERED INDEX ix_transcripts_meeting_seg
+                ON transcripts (meeting_id, segment_number)
+            """)
+            
+            connection.execute(create_query)
+            connection.commit()
+            
+            logger.info("✅ Successfully added 'ix_transcripts_meeting_seg' index to 'transcripts' table")
+            return True
+            
+    except Exception as e:
+        logger.error(f"❌ Error adding ix_transcripts_meeting_seg index: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    logger.info("Starting database migration: Add transcript segment index")
+    success = migrate_add_transcript_segment_index()
+    
+    if success:
+        logger.info("✅ Migration completed successfully")
+    else:
+        logger.error("❌ Migration failed")
@@ -0,0 +1,72 @@
+"""
+Database migration script to convert meetings.use_pyannote from NVARCHAR to BIT
+
+Existing "true"/"false" values are carried over as 1/0, NULL stays NULL
+"""
+
+from sqlalchemy import create_engine, text
+from app.config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_use_pyannote_to_bit():
+    """Convert use_pyannote column on Meeting table to BIT"""
+
+    try:
+        # Create database engine
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as connection:
+            # Check current column type
+            check_query = text("""
+                SELECT DATA_TYPE
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_NAME = 'meetings'
+                AND COLUMN_NAME = 'use_pyannote'
+            """)
+
+            row = connection.execute(check_query).fetchone()
+
+            if row is None:
+                connection.execute(text("ALTER TABLE meetings ADD use_pyannote BIT NULL"))
+                connection.commit()
+                logger.info("✅ Added 'use_pyannote' BIT column to 'meetings' table")
+                return True
+
+            if row[0].lower() == "bit":
+                logger.info("✅ Column 'use_pyannote' is already BIT in 'meetings' table")
+                return True
+
+            # Add the new column, copy values, swap names
+            connection.execute(text("ALTER TABLE meetings ADD use_pyannote_bit BIT NULL"))
+            connection.execute(text("""
+                UPDATE meetings
+                SET use_pyannote_bit = CASE
+                    WHEN use_pyannote = 'true' THEN 1
+                    WHEN use_pyannote = 'false' THEN 0
+                    ELSE NULL
+                END
+            """))
+            connection.execute(text("ALTER TABLE meetings DROP COLUMN use_pyannote"))
+            connection.execute(text("EXEC sp_rename 'meetings.use_pyannote_bit', 'use_pyannote', 'COLUMN'"))
+            connection.commit()
+
+            logger.info("✅ Successfully converted 'use_pyannote' column to BIT in 'meetings' table")
+            return True
+
+    except Exception as e:
+        logger.error(f"❌ Error converting use_pyannote column: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    logger.info("Starting database migration: Convert use_pyannote to BIT")
+    success = migrate_use_pyannote_to_bit()
+
+    if success:
+        logger.info("✅ Migration completed successfully")
+    else:
+        logger.error("❌ Migration failed")
@@ -0,0 +1,76 @@
+"""
+Database migration script to add SYSUTCDATETIME() defaults to timestamp columns
+
+The models no longer send start_time/created_at from Python; the database fills them in
+"""
+
+from sqlalchemy import create_engine, text
+from app.config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (table, column) pairs that get a UTC default
+UTC_DEFAULT_COLUMNS = [
+    ("meetings", "start_time"),
+    ("meetings", "created_at"),
+    ("transcripts", "created_at"),
+    ("summaries", "created_at"),
+    ("summary_cache", "created_at"),
+    ("users", "created_at"),
+]
+
+
+def migrate_add_utc_defaults():
+    """Add DEFAULT SYSUTCDATETIME() constraints where missing"""
+
+    try:
+        # Create database engine
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as connection:
+            for table_name, column_name in UTC_DEFAULT_COLUMNS:
+                # Check if column exists and already has a default
+                check_query = text("""
+                    SELECT COLUMN_DEFAULT
+                    FROM INFORMATION_SCHEMA.COLUMNS
+                    WHERE TABLE_NAME = :table_name
+                    AND COLUMN_NAME = :column_name
+                """)
+
+                row = connection.execute(
+                    check_query, {"table_name": table_name, "column_name": column_name}
+                ).fetchone()
+
+                if row is None:
+                    logger.info(f"⚠️  Column '{table_name}.{column_name}' not found, skipping")
+                    continue
+
+                if row[0] is not None:
+                    logger.info(f"✅ Column '{table_name}.{column_name}' already has a default")
+                    continue
+
+                # Add the default constraint
+                connection.execute(text(f"""
+                    ALTER TABLE {table_name}
+                    ADD CONSTRAINT df_{table_name}_{column_name} DEFAULT SYSUTCDATETIME() FOR {column_name}
+                """))
+                logger.info(f"✅ Added UTC default to '{table_name}.{column_name}'")
+
+            connection.commit()
+            return True
+
+    except Exception as e:
+        logger.error(f"❌ Error adding UTC defaults: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    logger.info("Starting database migration: Add UTC timestamp defaults")
+    success = migrate_add_utc_defaults()
+
+    if success:
+        logger.info("✅ Migration completed successfully")
+    else:
+        logger.error("❌ Migration failed")
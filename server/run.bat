@@ -1,5 +1,7 @@
 # Server run script
 @echo off
 cd server
+REM Eksik tablolari olustur (app.main bunu yalnizca AUTO_CREATE_TABLES=true ise yapar)
+python start_server.py --create-tables || exit /b 1
 python -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
 
@@ -1,5 +1,7 @@
 #!/bin/bash
 # Server run script
 cd server
-python -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
+# Eksik tabloları oluştur (app.main bunu yalnızca AUTO_CREATE_TABLES=true ise yapar)
+python start_server.py --create-tables || exit 1
+python -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
 
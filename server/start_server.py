@@ -48,7 +48,25 @@ def check_models():
     return True
 
 
+def create_tables():
+    """Eksik tabloları oluştur (uvicorn worker'larından önce bir kez)"""
+    try:
+        from app.database import engine, Base
+        import app.models  # noqa: F401 - modellerin metadata'ya kaydı için
+        
+        Base.metadata.create_all(bind=engine)
+        print("✓ Veritabanı tabloları hazır")
+        return True
+    except Exception as e:
+        print(f"\n❌ Veritabanı tabloları oluşturulamadı: {e}")
+        return False
+
+
 def main():
+    # Yalnızca tablo oluşturma (uvicorn'u doğrudan başlatan run.sh/run.bat ve manuel kurulum için)
+    if "--create-tables" in sys.argv[1:]:
+        sys.exit(0 if create_tables() else 1)
+    
     print("="*60)
     print("  MEETING TRANSCRIPT APP - BACKEND BAŞLATILIYOR")
     print("="*60)
@@ -68,17 +86,26 @@ def main():
         print("\nKomutlarından birini çalıştırın.\n")
         #sys.exit(1)
     
+    # Veritabanı tabloları
+    if not create_tables():
+        sys.exit(1)
+    
     # Backend'i başlat
     print("\n🚀 Backend başlatılıyor...\n")
     print("="*60)
     
+    # uvloop + httptools (uvicorn[standard] ile gelir); uvloop Windows'ta yok, orada asyncio kullanılır
+    event_loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    
     try:
         subprocess.run([
             sys.executable, "-m", "uvicorn",
             "app.main:app",
             "--reload",
             "--host", "0.0.0.0",
-            "--port", "8000"
+            "--port", "8000",
+            "--loop", event_loop,
+            "--http", "httptools"
         ])
     except KeyboardInterrupt:
         print("\n\n✓ Backend durduruldu.")
@@ -0,0 +1,53 @@
+import numpy as np
+
+from app.services.audio_preprocessing_service import _frame_rms, _trim_silence
+
+SAMPLE_RATE = 16000
+
+
+def _padded_tone(lead_seconds, tone_seconds, tail_seconds, dtype=np.float32):
+    t = np.arange(int(tone_seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+    if np.issubdtype(dtype, np.integer):
+        tone = tone * 32767
+    return np.concatenate([
+        np.zeros(int(lead_seconds * SAMPLE_RATE)),
+        tone,
+        np.zeros(int(tail_seconds * SAMPLE_RATE)),
+    ]).astype(dtype)
+
+
+def test_frame_rms_matches_direct_computation():
+    rng = np.random.default_rng(0)
+    samples = rng.integers(-32768, 32767, size=10_000, dtype=np.int16)
+
+    rms = _frame_rms(samples, frame_length=2048, hop_length=512)
+
+    starts = range(0, len(samples) - 2048 + 1, 512)
+    expected = [np.sqrt(np.mean(samples[s:s + 2048].astype(np.float64) ** 2)) for s in starts]
+    np.testing.assert_allclose(rms, expected)
+
+
+def test_trim_silence_removes_leading_and_trailing_silence():
+    samples = _padded_tone(1.0, 2.0, 3.0, dtype=np.int16)
+
+    trimmed = _trim_silence(samples, top_db=20, frame_length=2048, hop_length=512)
+
+    # Çerçeve çözünürlüğü kadar pay bırakılır; ton bölümünün tamamı korunur
+    assert abs(len(trimmed) - 2 * SAMPLE_RATE) <= 2 * 2048
+    assert np.count_nonzero(trimmed) == np.count_nonzero(samples)
+
+
+def test_trim_silence_can_keep_leading_silence():
+    samples = _padded_tone(1.0, 2.0, 3.0)
+
+    trimmed = _trim_silence(samples, top_db=40, frame_length=2048, hop_length=512, trim_leading=False)
+
+    assert abs(len(trimmed) - 3 * SAMPLE_RATE) <= 2 * 2048
+    np.testing.assert_array_equal(trimmed, samples[:len(trimmed)])
+
+
+def test_trim_silence_keeps_short_input():
+    samples = np.zeros(1000, dtype=np.float32)
+
+    assert len(_trim_silence(samples, top_db=20, frame_length=2048, hop_length=512)) == 1000
@@ -0,0 +1,73 @@
+from app.services.audio_splitter import merge_chunk_segments, plan_split_points
+
+
+def _segment(text, start, end, speaker_id=None, speaker_label=None):
+    return {
+        "text": text,
+        "start": start,
+        "end": end,
+        "speaker_id": speaker_id,
+        "speaker_label": speaker_label,
+    }
+
+
+def test_merge_shifts_timestamps_by_chunk_offset():
+    merged = merge_chunk_segments(
+        [
+            [_segment("merhaba", 0.5, 2.0)],
+            [_segment("dünya", 1.0, 3.5)],
+        ],
+        [0.0, 1795.0],
+    )
+
+    assert [(s["text"], s["start"], s["end"]) for s in merged] == [
+        ("merhaba", 0.5, 2.0),
+        ("dünya", 1796.0, 1798.5),
+    ]
+
+
+def test_merge_keeps_same_letter_speakers_in_different_chunks_apart():
+    merged = merge_chunk_segments(
+        [
+            [_segment("a", 0.0, 1.0, "speaker_0", "Konuşmacı 1")],
+            [_segment("b", 0.0, 1.0, "speaker_0", "Konuşmacı 1")],
+        ],
+        [0.0, 1800.0],
+    )
+
+    assert merged[0]["speaker_id"] != merged[1]["speaker_id"]
+    assert merged[0]["speaker_label"] == "Konuşmacı 1 (Parça 1)"
+    assert merged[1]["speaker_label"] == "Konuşmacı 1 (Parça 2)"
+
+
+def test_merge_single_chunk_leaves_speakers_untouched():
+    merged = merge_chunk_segments([[_segment("a", 0.0, 1.0, "speaker_1", "Konuşmacı 2")]], [0.0])
+
+    assert merged[0]["speaker_id"] == "speaker_1"
+    assert merged[0]["speaker_label"] == "Konuşmacı 2"
+
+
+def test_merge_does_not_mutate_chunk_results():
+    chunk = [_segment("a", 1.0, 2.0, "speaker_0", "Konuşmacı 1")]
+
+    merge_chunk_segments([[], chunk], [0.0, 60.0])
+
+    assert chunk[0]["start"] == 1.0
+    assert chunk[0]["speaker_id"] == "speaker_0"
+
+
+def test_plan_split_points_prefers_nearest_silence():
+    points = plan_split_points(
+        duration=4000.0,
+        silences=[1700.0, 1790.0, 3650.0],
+        chunk_seconds=1800.0,
+        search_seconds=120.0,
+    )
+
+    assert points == [1790.0, 3650.0]
+
+
+def test_plan_split_points_falls_back_to_target_without_silence():
+    points = plan_split_points(duration=4000.0, silences=[], chunk_seconds=1800.0, search_seconds=120.0)
+
+    assert points == [1800.0, 3600.0]